@@ -1,34 +1,31 @@
 import re
-import time
 import json
 
 import requests
 import country_converter
 
+import http_client
+
+# the country keys are on one line of a script
+COUNTRY_KEYS_END = re.compile(r"var\scountryKeys\s*=.*\n")
+
 
 class AlienwareArena:
 
     def __init__(self, url, source):
         self.url = url
-        while True:
-            session = requests.Session()
-            try:
-                self.giveawayPage = session.get(
-                    self.url,
-                    timeout=10).text
-            except requests.exceptions.RequestException:
-                print("Alienware timeout: sleep for 10 seconds before second try")
-                time.sleep(10)
-            try:
-                # for non-global giveaways it will go to login page
-                # first time, so request twice to get giveaway page
-                self.giveawayPage = session.get(
-                    self.url,
-                    timeout=10).text
-                break
-            except requests.exceptions.RequestException:
-                print("Alienware timeout: sleep for 10 seconds and try again")
-                time.sleep(10)
+        self.giveawayPage = ""
+        try:
+            # for non-global giveaways it will go to login page
+            # first time, so request twice to get giveaway page
+            http_client.get(self.url, timeout=10, stream=True).close()
+            self.giveawayPage = http_client.get_text(
+                self.url,
+                COUNTRY_KEYS_END,
+                timeout=10)
+        except requests.exceptions.RequestException:
+            # no country keys found, try again on the next update
+            print("Alienware unavailable: skipping key details")
 
         self.countrykeys = self.countrykeys()
         if self.countrykeys is None:
@@ -1,8 +1,12 @@
-import time
 import re
 
 import requests
-from bs4 import BeautifulSoup
+
+import html_parser
+import http_client
+
+# the Steam level is near the start of the giveaway page
+LEVEL_END = re.compile(r'friendPlayerLevelNum[^>]*>[^<]*<')
 
 
 class Keyhub:
@@ -13,40 +17,41 @@ class Keyhub:
         if self.g_id:
             # Get key amount
             self.key_amount = self.key_info()
-            if self.key_amount != "0" and source == "new":
+            if self.key_amount is not None and self.key_amount != "0" and source == "new":
                 # request page to get steam level requirement
                 self.level = self.level_info()
+                if self.level is None:
+                    # level unknown, skip the giveaway details
+                    self.key_amount = None
         else:
             return None
 
     def key_info(self):
         self.giveawaycount_url = "https://api.key-hub.eu/?type=giveawaycount&data=" + self.g_id[0]
-        while True:
-            try:
-                headers = {"Origin": "https://key-hub.eu"}
-                self.giveawaycount = requests.get(
-                    self.giveawaycount_url,
-                    headers=headers,
-                    timeout=10).text
-                break
-            except requests.exceptions.RequestException:
-                print("Keyhub timeout: sleep for 10 seconds and try again")
-                time.sleep(10)
+        try:
+            headers = {"Origin": "https://key-hub.eu"}
+            self.giveawaycount = http_client.get(
+                self.giveawaycount_url,
+                headers=headers,
+                timeout=10).text
+        except requests.exceptions.RequestException:
+            print("Keyhub unavailable: skipping key details")
+            return None
         return self.giveawaycount.replace("\"", "")
 
     def level_info(self):
         level = 0
-        while True:
-            try:
-                self.giveawayPage = BeautifulSoup(requests.get(
-                    self.url,
-                    timeout=10).text,
-                    "html.parser")
-                break
-            except requests.exceptions.RequestException:
-                print("Keyhub timeout: sleep for 10 seconds and try again")
-                time.sleep(10)
-        level_span = self.giveawayPage.find("span", class_="friendPlayerLevelNum")
+        try:
+            giveawayPage = html_parser.parse(http_client.get_text(
+                self.url,
+                LEVEL_END,
+                timeout=10),
+                "keyhub")
+        except requests.exceptions.RequestException:
+            print("Keyhub unavailable: skipping Steam level")
+            return None
+        level_span = giveawayPage.find("span", class_="friendPlayerLevelNum")
         if level_span is not None:
             level = level_span.text
+        html_parser.free(giveawayPage)
         return str(level)
@@ -1,12 +1,40 @@
 import re
 import json
+import os
 import time
 
 import requests
 import dateutil.parser
 import dateutil.tz
 from dateutil.parser import ParserError
-from bs4 import BeautifulSoup
+
+import budget
+import game_cache
+import html_parser
+import http_client
+import metrics
+import parse_pool
+import retry
+from fetch_planner import FetchPlanner
+from game_info import BaseGame, Cards, GameInfo
+from page_index import PageIndex
+
+
+# fields read from the store page, it is not downloaded when all of them are cached
+PAGE_FIELDS = ["achievements", "unreleased", "isearlyaccess", "unreleasedtext", "reviewsummary", "reviewdetails", "usertags", "nsfw", "islearning"]
+# fields that need more than the appdetails, left out of a preview
+PREVIEW_LEFT_OUT = ["achievements", "reviewdetails", "usertags", "basegame", "nsfw", "plusone", "cards", "pcgamingwiki"]
+
+# read the fields from the appdetails and appreviews json where possible,
+# the store page is then only downloaded for tags, bundles, discount end times and unreleased text
+# the tags are only on the store page, so a cold lookup still downloads it and is not lighter,
+# the page is left out of warm lookups once the hourly fields like reviews and early access have expired
+JSON_FIRST = os.getenv("RSGIB_JSON_FIRST", "0") == "1"
+JSON_PAGE_FIELDS = ["usertags"]
+# appdetails genre id
+EARLY_ACCESS_GENRE = "70"
+# everything read from the store page comes before the reviews area
+STORE_PAGE_END = re.compile(r'id="app_reviews_hash"')
 
 
 class SteamGame:
@@ -14,79 +42,306 @@ class SteamGame:
     def __init__(self, appid):
         self.appID = appid
         self.url = 'https://store.steampowered.com/app/' + appid + "?cc=us"
-        while True:
-            try:
-                self.gamePage = BeautifulSoup(
-                    requests.get(
-                        self.url,
-                        cookies={
-                            "birthtime": "640584001",
-                            "lastagecheckage": "20-April-1990",
-                            "mature_content": "1",
-                        },
-                        timeout=30).text,
-                    "html.parser",
-                )
-                break
-            except requests.exceptions.RequestException:
-                print("Steam store timeout: sleep for 30 seconds and try again")
-                time.sleep(30)
-        if self.gamePage.title is not None and self.gamePage.title.string == "Welcome to Steam":
+        self.planner = FetchPlanner()
+        self.degraded = []
+        # hosts that could not be reached, what the fields read from them is a fallback
+        self.unreachable = []
+        if game_cache.invalid_cache.get(appid, False):
+            # appid was invalid a short while ago
+            return None
+        page_cached = self.hascached(JSON_PAGE_FIELDS if JSON_FIRST else PAGE_FIELDS)
+        if not page_cached:
+            self.planner.submit("storepage", SteamGame.fetchstorepage, self.url)
+        self.json = SteamGame.fetchappdetails(appid)
+        if self.json is not None and self.json[appid]["success"] is True:
+            # start the requests that only depend on the appdetails
+            self.prefetch(self.json[appid]["data"])
+        if not page_cached and self.gamePage.title is not None and self.gamePage.title.string == "Welcome to Steam":
             # redirected to Steam homepage
+            game_cache.invalid_cache.set(appid, True)
+            self.release()
             return None
-        while True:
-            try:
-                steam_json = requests.get(
-                    "https://store.steampowered.com/api/appdetails/?appids=" + appid + "&cc=us",
-                    timeout=30)
-                break
-            except requests.exceptions.RequestException:
-                print("Steam api timeout: sleep for 30 seconds and try again")
-                time.sleep(30)
-
-        if 'json' in steam_json.headers.get('Content-Type'):
-            self.json = json.loads(steam_json.content.decode('utf-8-sig'))
-        else:
-            # try once more
-            try:
-                steam_json = requests.get(
-                    "https://store.steampowered.com/api/appdetails/?appids=" + appid + "&cc=us",
-                    timeout=30)
-            except requests.exceptions.RequestException:
-                return None
-            if 'json' in steam_json.headers.get('Content-Type'):
-                self.json = json.loads(steam_json.content.decode('utf-8-sig'))
-            else:
-                return None
 
         if self.json is None or self.json[appid]["success"] is not True:
             # appid invalid
+            if self.json is not None:
+                game_cache.invalid_cache.set(appid, True)
+            self.release()
             return None
         self.json = self.json[appid]["data"]
 
-        self.title = self.title()
-        self.gettype = self.gettype()
-        self.discountamount = self.discountamount()
-        self.price = self.getprice()
-        self.asf = self.getasf()
-        self.achievements = self.getachev()
-        self.unreleased = self.isunreleased()
-        self.isearlyaccess = self.isearlyaccess()
-        self.unreleasedtext = self.getunreleasedtext()
-        self.blurb = self.getDescriptionSnippet()
-        self.reviewsummary = self.reviewsummary()
-        self.reviewdetails, self.lowreviews = self.reviewdetails()
-        self.genres = self.genres()
-        self.usertags = self.usertags()
+        self.title = self.cached("title", self.title)
+        self.gettype = self.cached("gettype", self.gettype)
+        self.discountamount = self.cached("discountamount", self.discountamount)
+        self.price = self.cached("price", self.getprice)
+        self.asf = self.cached("asf", self.getasf)
+        if JSON_FIRST:
+            self.achievements = self.cached("achievements", self.getachevjson)
+            self.unreleased = self.cached("unreleased", self.isunreleasedjson)
+            self.isearlyaccess = self.cached("isearlyaccess", self.isearlyaccessjson)
+            self.unreleasedtext = self.cached("unreleasedtext", self.getunreleasedtextjson)
+        else:
+            self.achievements = self.cached("achievements", self.getachev)
+            self.unreleased = self.cached("unreleased", self.isunreleased)
+            self.isearlyaccess = self.cached("isearlyaccess", self.isearlyaccess)
+            self.unreleasedtext = self.cached("unreleasedtext", self.getunreleasedtext)
+        self.blurb = self.cached("blurb", self.getDescriptionSnippet)
+        self.releasedate = self.cached("releasedate", self.releasedate)
+        if JSON_FIRST:
+            self.reviewsummary = self.cached("reviewsummary", self.reviewsummaryjson)
+            self.reviewdetails, self.lowreviews = self.cached("reviewdetails", self.reviewdetailsjson, ("", False))
+        else:
+            self.reviewsummary = self.cached("reviewsummary", self.reviewsummary)
+            self.reviewdetails, self.lowreviews = self.cached("reviewdetails", self.reviewdetails, ("", False))
+        self.genres = self.cached("genres", self.genres)
+        self.usertags = self.cached("usertags", self.usertags)
         if self.gettype != "game":
-            self.basegame = self.basegame()
-        self.releasedate = self.releasedate()
-        self.nsfw = self.nsfw()
+            self.basegame = self.cached("basegame", self.basegame)
+        self.nsfw = self.cached("nsfw", self.nsfwjson if JSON_FIRST else self.nsfw)
         self.plusone = self.plusone()
-        self.developers, self.developers_num = self.developers()
+        self.developers, self.developers_num = self.cached("developers", self.developers)
         if self.gettype == "game":
-            self.cards = self.getcards()
-            self.pcgamingwiki = self.pcgamingwiki(self.appID)
+            self.cards = self.cached("cards", self.getcards, None)
+            self.pcgamingwiki = self.cached("pcgamingwiki", lambda: self.pcgamingwiki(self.appID), False)
+        self.release()
+
+    @classmethod
+    def preview(cls, appid):
+        # only what the appdetails give, for a first comment that is completed later
+        game = cls.__new__(cls)
+        game.appID = appid
+        game.url = 'https://store.steampowered.com/app/' + appid + "?cc=us"
+        game.planner = FetchPlanner()
+        game.degraded = list(PREVIEW_LEFT_OUT)
+        game.unreachable = []
+        game.json = SteamGame.fetchappdetails(appid)
+        if game.json is None or game.json[appid]["success"] is not True:
+            return GameInfo.fromgame(game)
+        game.json = game.json[appid]["data"]
+        # page details like discount end times are filled in by the full lookup
+        game.gamePage = html_parser.empty()
+        game.title = game.title()
+        game.gettype = game.gettype()
+        game.discountamount = game.discountamount()
+        game.price = game.getprice()
+        game.asf = game.getasf()
+        game.achievements = 0
+        game.unreleased = "release_date" in game.json and game.json["release_date"]["coming_soon"] is True
+        game.isearlyaccess = False
+        game.unreleasedtext = None
+        game.blurb = game.getDescriptionSnippet()
+        game.reviewsummary = ""
+        game.reviewdetails, game.lowreviews = "", False
+        game.genres = game.genres()
+        game.usertags = False
+        game.basegame = None
+        game.releasedate = game.releasedate()
+        game.nsfw = False
+        game.plusone = None
+        game.developers, game.developers_num = game.developers()
+        game.cards = None
+        game.pcgamingwiki = False
+        return GameInfo.fromgame(game)
+
+    def __getattr__(self, name):
+        if name == "gamePage":
+            # the store page is only read when a field needs it
+            page = self.planner.result("storepage", SteamGame.fetchstorepage, self.url)
+            if page is None:
+                # continue with the appdetails only
+                self.unavailable("storepage")
+                page = html_parser.empty()
+            self.gamePage = page
+            return self.gamePage
+        raise AttributeError(name)
+
+    def page(self):
+        # the store page nodes read by the fields, collected in one walk on first use
+        if "pageIndex" not in self.__dict__:
+            self.pageIndex = PageIndex(self.gamePage)
+        return self.pageIndex
+
+    def release(self):
+        # the fields are extracted, free the page tree right away
+        self.planner.cancel()
+        page = self.__dict__.pop("gamePage", None)
+        self.__dict__.pop("pageIndex", None)
+        if page is not None:
+            html_parser.free(page)
+
+    def hascached(self, fields):
+        return all(game_cache.field_cache.has((self.appID, field)) for field in fields)
+
+    def cached(self, field, fn, fallback=game_cache.MISSING):
+        value = game_cache.field_cache.get((self.appID, field))
+        if value is game_cache.MISSING:
+            degraded = len(self.degraded)
+            if fallback is game_cache.MISSING:
+                value = fn()
+            else:
+                value = self.optional(field, fn, fallback)
+            if len(self.degraded) == degraded and not self.unreachable:
+                # incomplete fields are fetched again next time, and every field read after a host was unreachable
+                game_cache.field_cache.set((self.appID, field), value, game_cache.FIELD_TTL[field])
+        return value
+
+    def optional(self, field, fn, fallback):
+        try:
+            return fn()
+        except budget.DeadlineExceeded:
+            # not finished within the latency budget, left out of the comment
+            print("Latency budget exceeded: leaving out " + field + " for app " + self.appID)
+            self.degraded.append(field)
+            metrics.increment("degraded." + field)
+            return fallback
+
+    def unavailable(self, source):
+        # like a missed deadline, the game is neither cached nor stored
+        self.unreachable.append(source)
+        self.degraded.append(source)
+        metrics.increment("unavailable." + source)
+
+    def prefetch(self, data):
+        if JSON_FIRST and not self.hascached(["reviewsummary", "reviewdetails"]):
+            self.planner.submit("appreviewssummary", SteamGame.fetchappreviews, self.reviewssummaryurl(self.appID))
+        if not self.hascached(["reviewdetails"]):
+            self.planner.submit("appreviews", SteamGame.fetchappreviews, self.reviewsurl(self.appID))
+        if data["type"] == "game" and not self.hascached(["cards"]):
+            self.planner.submit("market", SteamGame.fetchmarket, self)
+        if data["type"] == "game" and not self.hascached(["pcgamingwiki"]):
+            self.planner.submit("pcgamingwiki" + self.appID, SteamGame.fetchpcgamingwiki, self.appID)
+        if len(data["package_groups"]) == 0 and data["is_free"] and not self.hascached(["asf"]):
+            self.planner.submit("capinfo", SteamGame.fetchcapinfo, self.appID)
+        if "fullgame" in data and not self.hascached(["basegame"]):
+            basegame_appid = data["fullgame"]["appid"]
+            self.planner.submit("appdetails" + basegame_appid, SteamGame.fetchappdetails, basegame_appid)
+            self.planner.submit("pcgamingwiki" + basegame_appid, SteamGame.fetchpcgamingwiki, basegame_appid)
+
+    @classmethod
+    def fetchstorepage(cls, url):
+        # None when the store is unavailable
+        text = cls.fetchstoretext(url)
+        if text is None:
+            return None
+        if not parse_pool.enabled():
+            return html_parser.parse(text)
+        # parsed in a worker process, only the part the fields read is parsed here
+        return html_parser.parse(parse_pool.run(SteamGame.compactstorepage, text))
+
+    @classmethod
+    def fetchstoretext(cls, url):
+        try:
+            return http_client.get_text(url, STORE_PAGE_END, timeout=30)
+        except requests.exceptions.RequestException:
+            print("Steam store unavailable: leaving out store page details")
+            return None
+
+    @classmethod
+    def compactstorepage(cls, text):
+        # the title and the nodes in the page index, as html
+        page = html_parser.parse(text)
+        compact = "".join(str(node) for node in PageIndex(page).outermost())
+        if page.title is not None:
+            compact = str(page.title) + compact
+        html_parser.free(page)
+        return compact
+
+    @classmethod
+    def fetchappdetails(cls, appid):
+        appdetails = game_cache.appdetails_cache.get(appid)
+        if appdetails is game_cache.MISSING:
+            appdetails = cls.fetchappdetailsuncached(appid)
+            if appdetails is not None:
+                game_cache.appdetails_cache.set(appid, appdetails)
+        return appdetails
+
+    @classmethod
+    def fetchappdetailsuncached(cls, appid):
+        appdetails_url = "https://store.steampowered.com/api/appdetails/?appids=" + appid + "&cc=us"
+        try:
+            steam_json = http_client.get(appdetails_url, timeout=30)
+        except requests.exceptions.RequestException:
+            print("Steam api unavailable: skipping app " + appid)
+            return None
+
+        if 'json' in steam_json.headers.get('Content-Type'):
+            return json.loads(steam_json.content.decode('utf-8-sig'))
+        # try once more
+        try:
+            steam_json = http_client.get(appdetails_url, timeout=30)
+        except requests.exceptions.RequestException:
+            return None
+        if 'json' in steam_json.headers.get('Content-Type'):
+            return json.loads(steam_json.content.decode('utf-8-sig'))
+        return None
+
+    @classmethod
+    def fetchappreviews(cls, url):
+        try:
+            appreviews = http_client.get(url, timeout=30, policy=retry.QUICK_POLICY)
+        except requests.exceptions.RequestException:
+            print("Steam reviews unavailable: leaving out review details")
+            return None
+        if 'json' in appreviews.headers.get('Content-Type'):
+            return json.loads(appreviews.content.decode('utf-8-sig'))
+        return None
+
+    @classmethod
+    def fetchmarketpage(cls, url):
+        try:
+            return html_parser.parse(http_client.get(url, timeout=30, policy=retry.QUICK_POLICY).text)
+        except requests.exceptions.RequestException:
+            print("Steam market unavailable: using store page for trading cards")
+            return None
+
+    def fetchmarket(self):
+        # the marketable page is only read when the market lists cards, it starts as soon as that is known
+        marketpage = SteamGame.fetchmarketpage(SteamGame.marketurl(self.appID))
+        total = marketpage.find("span", id="searchResults_total") if marketpage is not None else None
+        if total is not None and total.string.strip() != "0":
+            self.planner.submit("marketable", SteamGame.fetchmarketpage, SteamGame.marketableurl(self.appID))
+        return marketpage
+
+    @classmethod
+    def fetchcapinfo(cls, appid):
+        try:
+            return http_client.get(
+                "https://store.steampowered.com/broadcast/ajaxgetappinfoforcap?appid=" + appid,
+                timeout=30).json()
+        except requests.exceptions.RequestException:
+            print("Steam store unavailable: using appid for ASF")
+            return None
+
+    @classmethod
+    def fetchpcgamingwiki(cls, appid):
+        api_url_appid = "https://www.pcgamingwiki.com/api/appid.php?appid=" + appid
+        try:
+            appid_json = http_client.get(api_url_appid, allow_redirects=False, timeout=10, policy=retry.QUICK_POLICY)
+        except requests.exceptions.RequestException:
+            print("PCGamingWiki API unavailable: leaving out PCGamingWiki link")
+            return None
+        if appid_json.text == "":
+            # page available
+            return True
+        else:
+            return False
+
+    @classmethod
+    def reviewsurl(cls, appid):
+        return 'https://store.steampowered.com/appreviews/' + appid + '?json=1&filter=summary&review_type=all&purchase_type=all&language=all'
+
+    @classmethod
+    def reviewssummaryurl(cls, appid):
+        # only the totals shown on the store page, which counts Steam purchases
+        return 'https://store.steampowered.com/appreviews/' + appid + '?json=1&num_per_page=0&purchase_type=steam&language=all'
+
+    @classmethod
+    def marketurl(cls, appid):
+        return 'https://steamcommunity.com/market/search?q=&category_753_Game%5B0%5D=tag_app_' + appid + '&category_753_cardborder%5B0%5D=tag_cardborder_0&category_753_item_class%5B0%5D=tag_item_class_2'
+
+    @classmethod
+    def marketableurl(cls, appid):
+        return 'https://steamcommunity.com/market/search?q=This+item+can+no+longer+be+bought+or+sold+on+the+Community+Market&category_753_Game%5B0%5D=tag_app_' + appid + '&descriptions=1&category_753_cardborder%5B0%5D=tag_cardborder_0&category_753_item_class%5B0%5D=tag_item_class_2'
 
     def title(self):
         return self.json["name"]
@@ -98,8 +353,8 @@ class SteamGame:
         if "price_overview" in self.json and self.json["price_overview"] is not None:
             amount = self.json["price_overview"]["discount_percent"]
             if amount != 0:
-                discount_end_time = self.gamePage.find("p", {"class": "game_purchase_discount_quantity"})
-                discount_countdown = self.gamePage.find("p", {"class": "game_purchase_discount_countdown"})
+                discount_end_time = SteamGame.page(self).find("discount_quantity")
+                discount_countdown = SteamGame.page(self).find("discount_countdown")
                 amount = "-" + str(amount) + "%"
                 if discount_end_time is not None:
                     discount_end_time = discount_end_time.text.strip()
@@ -128,7 +383,7 @@ class SteamGame:
                 if discount_countdown is not None:
                     discount_countdown = discount_countdown.text.strip()
                     if "ends in" in discount_countdown:
-                        game_area_purchase = self.gamePage.find("div", {"class": "game_area_purchase_game"})
+                        game_area_purchase = SteamGame.page(self).find("purchase_game")
                         daily_deal_timer = game_area_purchase.find('script').string
                         daily_deal_timer_unix = [int(s) for s in daily_deal_timer.split() if s.isdigit()]
                         if len(daily_deal_timer_unix) == 1:
@@ -153,7 +408,7 @@ class SteamGame:
                 return amount
         elif len(self.json["package_groups"]) == 0 and not self.isfree():
             # check bundles
-            bundles = self.gamePage.find_all("div", {"class": "game_area_purchase_game"})
+            bundles = SteamGame.page(self).find_all("purchase_game")
             for bundle in bundles:
                 title = bundle.find("h1").next_element
                 title = title.text.replace("Buy", "").strip()
@@ -171,7 +426,7 @@ class SteamGame:
             return finalprice, fullprice
         if len(self.json["package_groups"]) == 0 and not self.isfree():
             # check bundles
-            bundles = self.gamePage.find_all("div", {"class": "game_area_purchase_game"})
+            bundles = SteamGame.page(self).find_all("purchase_game")
             for bundle in bundles:
                 title = bundle.find("h1").next_element
                 title = title.text.replace("Buy", "").strip()
@@ -201,16 +456,10 @@ class SteamGame:
             if sub_id != 0:
                 return "s/" + str(sub_id), "sub"
         elif self.isfree():
-            while True:
-                try:
-                    get_subid = requests.get(
-                        "https://store.steampowered.com/broadcast/ajaxgetappinfoforcap?appid=" + self.appID,
-                        timeout=30)
-                    break
-                except requests.exceptions.RequestException:
-                    print("Steam store timeout: sleep for 30 seconds and try again")
-                    time.sleep(30)
-            subid_json = get_subid.json()
+            subid_json = self.planner.result("capinfo", SteamGame.fetchcapinfo, self.appID)
+            if subid_json is None:
+                self.unavailable("capinfo")
+                subid_json = {}
             if "is_free" in subid_json and subid_json["is_free"]:
                 sub_id = subid_json["subid"]
                 if sub_id != 0:
@@ -218,7 +467,7 @@ class SteamGame:
         return "a/" + str(app_id), "app"
 
     def getachev(self):
-        achblock = self.gamePage.find("div", id="achievement_block")
+        achblock = SteamGame.page(self).find("achievement_block")
 
         if achblock is not None:
             ach_number = re.sub(r"\D", "", achblock.contents[1].string).strip()  # Remove all non numbers
@@ -227,68 +476,88 @@ class SteamGame:
             return ach_number
         return 0
 
+    def getachevjson(self):
+        if "achievements" in self.json and self.json["achievements"]["total"] > 0:
+            return str(self.json["achievements"]["total"])
+        return 0
+
     def getcards(self):
-        marketurl = 'https://steamcommunity.com/market/search?q=&category_753_Game%5B0%5D=tag_app_' + self.appID + '&category_753_cardborder%5B0%5D=tag_cardborder_0&category_753_item_class%5B0%5D=tag_item_class_2'
-        marketable_url = 'https://steamcommunity.com/market/search?q=This+item+can+no+longer+be+bought+or+sold+on+the+Community+Market&category_753_Game%5B0%5D=tag_app_' + self.appID + '&descriptions=1&category_753_cardborder%5B0%5D=tag_cardborder_0&category_753_item_class%5B0%5D=tag_item_class_2'
-        while True:
-            try:
-                marketpage = BeautifulSoup(requests.get(marketurl, timeout=30).text, "html.parser")
-                break
-            except requests.exceptions.RequestException:
-                print("Steam market timeout: sleep for 30 seconds and try again")
-                time.sleep(30)
-        total = marketpage.find("span", id="searchResults_total")
-        error_message = marketpage.find("div", class_="market_listing_table_message")
-        if error_message is not None and "There was an error performing your search" in error_message.text:
-            # market error, use steam tag backup
-            category_block = self.gamePage.find("div", id="category_block")
-
-            if category_block is None:
-                return 0, 0
-            if "Steam Trading Cards" in category_block.text:
-                return 999, 0, marketurl
+        marketurl = SteamGame.marketurl(self.appID)
+        marketable_url = SteamGame.marketableurl(self.appID)
+        marketpage = self.planner.optional("market", SteamGame.fetchmarket, self)
+        total = error_message = None
+        if marketpage is not None:
+            total = marketpage.find("span", id="searchResults_total")
+            error_message = marketpage.find("div", class_="market_listing_table_message")
+        if marketpage is None:
+            SteamGame.unavailable(self, "market")
+        if marketpage is None or (error_message is not None and "There was an error performing your search" in error_message.text):
+            # market error or unavailable, use steam tag backup
+            if "cards_tag" in self.__dict__:
+                # read with the archived page of a removed game
+                cards_tag = self.cards_tag
+            else:
+                cards_tag = SteamGame.cardstag(self)
+            if cards_tag is None:
+                return Cards(0, 0)
+            if cards_tag:
+                return Cards(999, 0, marketurl)
         if total is not None:
-            while True:
-                try:
-                    marketable_check = BeautifulSoup(requests.get(marketable_url, timeout=30).text, "html.parser")
-                    break
-                except requests.exceptions.RequestException:
-                    print("Steam market timeout: sleep for 30 seconds and try again")
-                    time.sleep(30)
-            nonmarketable = marketable_check.find("span", id="searchResults_total")
-            marketable = True
-            if nonmarketable is not None:
-                if int(nonmarketable.string.strip()) != 0:
-                    marketable = False
             total = int(total.string.strip())
             if total == 0:
                 # Get the page again, something might have parsed wrong
-                while True:
-                    try:
-                        marketpage = BeautifulSoup(requests.get(marketurl, timeout=30).text, "html.parser")
-                        break
-                    except requests.exceptions.RequestException:
-                        print("Steam market timeout: sleep for 30 seconds and try again")
-                        time.sleep(30)
-                total = marketpage.find("span", id="searchResults_total")
+                marketpage = self.planner.optional("market", SteamGame.fetchmarket, self)
+                total = None
+                if marketpage is not None:
+                    total = marketpage.find("span", id="searchResults_total")
                 if total is not None:
                     total = int(total.string.strip())
                 else:
                     total = 0
+            marketable = True
+            if total != 0:
+                # prefetched by fetchmarket
+                marketable_check = self.planner.optional("marketable", SteamGame.fetchmarketpage, marketable_url)
+                nonmarketable = None
+                if marketable_check is None:
+                    SteamGame.unavailable(self, "marketable")
+                else:
+                    nonmarketable = marketable_check.find("span", id="searchResults_total")
+                if nonmarketable is not None:
+                    if int(nonmarketable.string.strip()) != 0:
+                        marketable = False
             drops = total//2 + (total % 2 > 0)
-            return total, drops, marketurl, marketable
-        return 0, 0
+            return Cards(total, drops, marketurl, marketable)
+        return Cards(0, 0)
+
+    def cardstag(self):
+        # whether the categories list trading cards, None without categories
+        category_block = SteamGame.page(self).find("category_block")
+        if category_block is None:
+            return None
+        return "Steam Trading Cards" in category_block.text
 
     def isunreleased(self):
-        unreleased = self.gamePage.find("div", class_="game_area_comingsoon")
+        unreleased = SteamGame.page(self).find("comingsoon")
 
         return unreleased is not None
 
     def isearlyaccess(self):
-        return self.gamePage.find("div", class_="early_access_header") is not None
+        return SteamGame.page(self).find("early_access_header") is not None
+
+    def isunreleasedjson(self):
+        return "release_date" in self.json and self.json["release_date"]["coming_soon"] is True
+
+    def isearlyaccessjson(self):
+        return any(genre.get("id") == EARLY_ACCESS_GENRE for genre in self.json.get("genres", []))
+
+    def getunreleasedtextjson(self):
+        if not self.unreleased:
+            return None
+        return self.getunreleasedtext()
 
     def getunreleasedtext(self):
-        unreleasedMajor = self.gamePage.find("div", class_="game_area_comingsoon")
+        unreleasedMajor = SteamGame.page(self).find("comingsoon")
 
         if unreleasedMajor is not None:
             return unreleasedMajor.find("h1").text.strip()
@@ -303,18 +572,36 @@ class SteamGame:
         return snippet.strip().replace("*", r"\*")
 
     def islearning(self):
-        return self.gamePage.find("div", class_="learning_about") is not None
+        return SteamGame.page(self).find("learning_about") is not None
 
     def reviewsummary(self):
-        review_div = self.gamePage.find("div", {"class": "user_reviews"})
+        review_div = SteamGame.page(self).find("user_reviews")
         if review_div is None:
-            review_div = self.gamePage.find("div", {"id": "userReviews"})
+            review_div = SteamGame.page(self).find("userReviews")
         if review_div is not None:
             review_div_agg = review_div.find("div", {"itemprop": "aggregateRating"})
             summary = review_div_agg.find("span", {"class": "game_review_summary"})
             if summary is not None:
                 return summary.string
-        releasedate = self.releasedate()
+        return SteamGame.noreviewstext(self)
+
+    def appreviewssummary(self):
+        # read by both review fields
+        if "appreviews_summary" not in self.__dict__:
+            self.appreviews_summary = self.planner.result("appreviewssummary", SteamGame.fetchappreviews, self.reviewssummaryurl(self.appID))
+        return self.appreviews_summary
+
+    def reviewsummaryjson(self):
+        appreviews_json = self.appreviewssummary()
+        if appreviews_json is None or appreviews_json["success"] != 1:
+            # read it from the store page instead
+            return SteamGame.reviewsummary(self)
+        if appreviews_json["query_summary"]["total_reviews"] > 0:
+            return appreviews_json["query_summary"]["review_score_desc"]
+        return self.noreviewstext()
+
+    def noreviewstext(self):
+        releasedate = self.releasedate
         if (
             releasedate == time.strftime("%B %e, %Y", time.localtime())
             or releasedate == time.strftime("%b %e, %Y", time.localtime())
@@ -326,28 +613,13 @@ class SteamGame:
 
     def lowreviews(self):
         # gives better review text when at low review amounts
-        reviews_url = 'https://store.steampowered.com/appreviews/' + self.appID + '?json=1&filter=summary&review_type=all&purchase_type=all&language=all'
+        reviews_url = SteamGame.reviewsurl(self.appID)
         lowreviews = ""
         total = 0
-        while True:
-            try:
-                appreviews = requests.get(reviews_url, timeout=30)
-                break
-            except requests.exceptions.RequestException:
-                print("Steam store timeout: sleep for 30 seconds and try again")
-                time.sleep(30)
-        if 'json' in appreviews.headers.get('Content-Type'):
-            appreviews_json = json.loads(appreviews.content.decode('utf-8-sig'))
-        else:
+        appreviews_json = self.planner.optional("appreviews", SteamGame.fetchappreviews, reviews_url)
+        if appreviews_json is None:
             # try once more
-            try:
-                appreviews = requests.get(reviews_url, timeout=30)
-            except requests.exceptions.RequestException:
-                return lowreviews, total
-            if 'json' in appreviews.headers.get('Content-Type'):
-                appreviews_json = json.loads(appreviews.content.decode('utf-8-sig'))
-            else:
-                return lowreviews, total
+            appreviews_json = self.planner.optional("appreviews", SteamGame.fetchappreviews, reviews_url)
         if appreviews_json is None or appreviews_json["success"] != 1:
             return lowreviews, total
         positive = appreviews_json["query_summary"]["total_positive"]
@@ -355,16 +627,8 @@ class SteamGame:
         total = positive + negative
         if total == 0:
             backup_reviews_url = 'https://store.steampowered.com/appreviews/' + self.appID + '?json=1'
-            while True:
-                try:
-                    appreviews = requests.get(backup_reviews_url, timeout=30)
-                    break
-                except requests.exceptions.RequestException:
-                    print("Steam store timeout: sleep for 30 seconds and try again")
-                    time.sleep(30)
-            if 'json' in appreviews.headers.get('Content-Type'):
-                appreviews_json = json.loads(appreviews.content.decode('utf-8-sig'))
-            else:
+            appreviews_json = self.planner.optional("appreviews", SteamGame.fetchappreviews, backup_reviews_url)
+            if appreviews_json is None:
                 return lowreviews, total
             positive = appreviews_json["query_summary"]["total_positive"]
             negative = appreviews_json["query_summary"]["total_negative"]
@@ -403,29 +667,59 @@ class SteamGame:
         return lowreviews, total
 
     def reviewdetails(self):
-        review_div = self.gamePage.find("div", {"class": "user_reviews"})
-        details = lowreviews = ""
-        total = 0
+        page_details = SteamGame.reviewdetailspage(self)
+        if page_details is None:
+            return "", False
+        return SteamGame.withlowreviews(self, *page_details)
+
+    def reviewdetailspage(self):
+        # the review text and amount of Steam purchase reviews, None without reviews
+        review_div = SteamGame.page(self).find("user_reviews")
+        details = ""
         if review_div is None:
-            review_div = self.gamePage.find("div", {"id": "userReviews"})
-        if review_div is not None:
-            review_div_agg = review_div.find("div", {"itemprop": "aggregateRating"})
-            review_div_count = review_div.find("meta", {"itemprop": "reviewCount"})
-            if review_div_count is None or (review_div_count["content"] is not None and int(review_div_count["content"]) < 100):
-                lowreviews, total = SteamGame.lowreviews(self)
-                if total == 0:
-                    return details, False
-            details_span = review_div_agg.select('span[class*="responsive_reviewdesc"]')
-            details = next(iter(details_span), None)
-            if details is not None:
-                details_strip = details.contents[0].strip()
-                if details_strip != "- Need more user reviews to generate a score":
-                    details = details_strip.replace("for this game ", "")
-                    details = details.replace("- ", " (")
-                    details = details.replace("positive.", "positive)")
-                    details = details.replace(",", "")
+            review_div = SteamGame.page(self).find("userReviews")
+        if review_div is None:
+            return None
+        review_div_agg = review_div.find("div", {"itemprop": "aggregateRating"})
+        review_div_count = review_div.find("meta", {"itemprop": "reviewCount"})
+        count = None
+        if review_div_count is not None and review_div_count["content"] is not None:
+            count = int(review_div_count["content"])
+        details_span = review_div_agg.select('span[class*="responsive_reviewdesc"]')
+        details = next(iter(details_span), None)
+        if details is not None:
+            details_strip = details.contents[0].strip()
+            if details_strip == "- Need more user reviews to generate a score":
+                details = ""
+            else:
+                details = details_strip.replace("for this game ", "")
+                details = details.replace("- ", " (")
+                details = details.replace("positive.", "positive)")
+                details = details.replace(",", "")
+        return details, count
+
+    def reviewdetailsjson(self):
+        appreviews_json = self.appreviewssummary()
+        if appreviews_json is None or appreviews_json["success"] != 1:
+            # read it from the store page instead
+            return SteamGame.reviewdetails(self)
+        count = appreviews_json["query_summary"]["total_reviews"]
+        positive = appreviews_json["query_summary"]["total_positive"]
+        details = ""
+        if count >= 10:
+            details = " (" + str(int(positive / count * 100)) + "% of the " + str(count) + " user reviews are positive)"
+        return self.withlowreviews(details, count)
+
+    def withlowreviews(self, details, count):
+        # count is the amount of reviews from Steam purchases, None when unknown
+        lowreviews = ""
+        total = 0
+        if count is None or count < 100:
+            lowreviews, total = SteamGame.lowreviews(self)
+            if total == 0:
+                return "", False
         lowreviews_details = lowreviews[lowreviews.find("(")-1:lowreviews.find(")")+1]
-        if lowreviews != "" and details != lowreviews_details and review_div_count is not None and total > 0 and review_div_count["content"] is not None and review_div_count["content"] == str(total):
+        if lowreviews != "" and details != lowreviews_details and total > 0 and count == total:
             # low reviews but all are direct purchases
             return lowreviews, False
         elif lowreviews != "" and details != lowreviews_details and total > 0:
@@ -448,7 +742,7 @@ class SteamGame:
         return False
 
     def usertags(self):
-        usertags = self.gamePage.find("div", class_="popular_tags")
+        usertags = SteamGame.page(self).find("popular_tags")
         if usertags is not None:
             usertags_a = usertags.find_all("a", {"class": "app_tag"})
             if len(usertags_a) != 0:
@@ -517,20 +811,12 @@ class SteamGame:
             appid = basegame["appid"]
             name = basegame["name"]
             basegameurl = 'https://store.steampowered.com/app/' + appid + "?cc=us"
-            while True:
-                try:
-                    basegame_json = requests.get(
-                        "https://store.steampowered.com/api/appdetails/?appids=" + appid + "&cc=us",
-                        timeout=30)
-                    break
-                except requests.exceptions.RequestException:
-                    print("Steam api timeout: sleep for 30 seconds and try again")
-                    time.sleep(30)
-
-            if 'json' in basegame_json.headers.get('Content-Type'):
-                basegame_data = json.loads(basegame_json.content.decode('utf-8-sig'))[appid]["data"]
+            basegame_json = self.planner.result("appdetails" + appid, SteamGame.fetchappdetails, appid)
+            if basegame_json is not None:
+                basegame_data = basegame_json[appid]["data"]
             else:
-                return appid, name
+                self.unavailable("basegame")
+                return BaseGame(appid, name)
 
             def basegameisfree():
                 return basegame_data["is_free"]
@@ -571,42 +857,35 @@ class SteamGame:
                     return finalprice, "", False
                 if len(basegame_data["package_groups"]) == 0 and not basegameisfree():
                     # check bundles
-                    while True:
-                        try:
-                            basegamePage = BeautifulSoup(
-                                requests.get(
-                                    basegameurl,
-                                    cookies={
-                                        "birthtime": "640584001",
-                                        "lastagecheckage": "20-April-1990",
-                                        "mature_content": "1",
-                                    },
-                                    timeout=30).text,
-                                "html.parser",
-                            )
-                            break
-                        except requests.exceptions.RequestException:
-                            print("Steam store timeout: sleep for 30 seconds and try again")
-                            time.sleep(30)
-                    bundles = basegamePage.find_all("div", {"class": "game_area_purchase_game"})
-                    for bundle in bundles:
-                        title = bundle.find("h1").next_element
-                        title = title.text.replace("Buy", "").strip()
-                        if title == name:
-                            price = bundle.find("div", {"class": "game_purchase_price"})
-                            if price is None:
-                                finalprice = basegamePage.find("div", {"class": "discount_final_price"})
-                                fullprice = basegamePage.find("div", {"class": "discount_original_price"})
-                            if finalprice is not None:
-                                if fullprice is None:
-                                    return finalprice.string.strip(), "", discountamount()
-                                return finalprice.string.strip(), fullprice.string.strip(), discountamount()
+                    # prices are also read outside the purchase blocks, parsed whole
+                    basegametext = SteamGame.fetchstoretext(basegameurl)
+                    if basegametext is None:
+                        self.unavailable("basegame")
+                        return "No price found", "", False
+                    basegamePage = html_parser.parse(basegametext)
+                    try:
+                        bundles = basegamePage.find_all("div", {"class": "game_area_purchase_game"})
+                        for bundle in bundles:
+                            title = bundle.find("h1").next_element
+                            title = title.text.replace("Buy", "").strip()
+                            if title == name:
+                                price = bundle.find("div", {"class": "game_purchase_price"})
+                                if price is None:
+                                    finalprice = basegamePage.find("div", {"class": "discount_final_price"})
+                                    fullprice = basegamePage.find("div", {"class": "discount_original_price"})
+                                if finalprice is not None:
+                                    if fullprice is None:
+                                        return finalprice.string.strip(), "", discountamount()
+                                    return finalprice.string.strip(), fullprice.string.strip(), discountamount()
+                    finally:
+                        # only the prices are kept
+                        html_parser.free(basegamePage)
                 return "No price found", "", False
 
             finalprice, fullprice, discount = basegameprice()
             free = basegameisfree()
-            pcgamingwiki = basegamepcgamingwiki(appid)
-            return appid, name, finalprice, fullprice, free, discount, pcgamingwiki
+            pcgamingwiki = SteamGame.optional(self, "basegamepcgamingwiki", lambda: basegamepcgamingwiki(appid), False)
+            return BaseGame(appid, name, finalprice, fullprice, free, discount, pcgamingwiki)
 
     def releasedate(self):
         if "release_date" in self.json:
@@ -626,11 +905,16 @@ class SteamGame:
         return False
 
     def nsfw(self):
-        nsfw = self.gamePage.find("div", class_="mature_content_notice")
+        nsfw = SteamGame.page(self).find("mature_content_notice")
         if nsfw is not None:
             return True
         return False
 
+    def nsfwjson(self):
+        # the store page shows a mature content notice for these
+        content_descriptors = self.json.get("content_descriptors") or {}
+        return bool(content_descriptors.get("ids"))
+
     def plusone(self):
         exceptions_txt = 'plusone_exceptions.txt'
         with open(exceptions_txt) as exceptions:
@@ -640,8 +924,8 @@ class SteamGame:
                         # some apps marked as free still give +1
                         return True
         if (
-            not self.islearning()
-            and (self.price[1] != "" or not self.isfree())
+            (self.price[1] != "" or not self.isfree())
+            and not self.cached("islearning", self.islearning)
         ):
             if self.unreleased:
                 return True
@@ -650,19 +934,11 @@ class SteamGame:
         return False
 
     def pcgamingwiki(self, appid):
-        api_url_appid = "https://www.pcgamingwiki.com/api/appid.php?appid=" + appid
-        while True:
-            try:
-                appid_json = requests.get(api_url_appid, allow_redirects=False, timeout=10)
-                break
-            except requests.exceptions.RequestException:
-                print("PCGamingWiki API timeout: sleep for 10 seconds and try again")
-                time.sleep(10)
-        if appid_json.text == "":
-            # page available
-            return True
-        else:
+        available = self.planner.optional("pcgamingwiki" + appid, SteamGame.fetchpcgamingwiki, appid)
+        if available is None:
+            SteamGame.unavailable(self, "pcgamingwiki")
             return False
+        return available
 
     def developers(self):
         if "developers" in self.json:
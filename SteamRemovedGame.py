@@ -6,23 +6,28 @@ import time
 import requests
 import dateutil.parser
 from dateutil.parser import ParserError
-from bs4 import BeautifulSoup
+import html_parser
+import http_client
+import parse_pool
 from SteamGame import SteamGame
+from fetch_planner import FetchPlanner
+from game_info import BaseGame, plain
 
 
 class SteamRemovedGame:
 
     def __init__(self, appid):
         self.appID = appid
-        while True:
-            try:
-                archive_json = requests.get(
-                    "https://web.archive.org/cdx/search/cdx?url=store.steampowered.com/app/" + appid + "/*&fl=original,timestamp&filter=statuscode:200&output=json",
-                    timeout=15)
-                break
-            except requests.exceptions.RequestException:
-                print("Archive.org request timeout: sleep for 15 seconds and try again")
-                time.sleep(15)
+        self.planner = FetchPlanner()
+        self.degraded = []
+        self.unreachable = []
+        try:
+            archive_json = http_client.get(
+                "https://web.archive.org/cdx/search/cdx?url=store.steampowered.com/app/" + appid + "/*&fl=original,timestamp&filter=statuscode:200&output=json",
+                timeout=15)
+        except requests.exceptions.RequestException:
+            print("Archive.org unavailable: skipping removed game " + appid)
+            return None
         if 'json' in archive_json.headers.get('Content-Type'):
             self.json = self.filterjson(archive_json)
         else:
@@ -30,15 +35,13 @@ class SteamRemovedGame:
 
         if not self.json:
             # invalid, try for old Steam layout
-            while True:
-                try:
-                    archive_json = requests.get(
-                        "https://web.archive.org/cdx/search/cdx?url=store.steampowered.com/app/" + appid + "/&fl=original,timestamp&filter=statuscode:200&output=json",
-                        timeout=15)
-                    break
-                except requests.exceptions.RequestException:
-                    print("Archive.org request timeout: sleep for 15 seconds and try again")
-                    time.sleep(15)
+            try:
+                archive_json = http_client.get(
+                    "https://web.archive.org/cdx/search/cdx?url=store.steampowered.com/app/" + appid + "/&fl=original,timestamp&filter=statuscode:200&output=json",
+                    timeout=15)
+            except requests.exceptions.RequestException:
+                print("Archive.org unavailable: skipping removed game " + appid)
+                return None
             if 'json' in archive_json.headers.get('Content-Type'):
                 self.json = self.filterjson(archive_json)
             else:
@@ -46,46 +49,59 @@ class SteamRemovedGame:
             if not self.json:
                 return None
         self.url, self.date = self.urldate()
-        while True:
-            try:
-                self.gamePage = BeautifulSoup(
-                    requests.get(
-                        self.url,
-                        cookies={
-                            "birthtime": "640584001",
-                            "lastagecheckage": "20-April-1990",
-                            "mature_content": "1",
-                        },
-                        timeout=15).text,
-                    "html.parser",
-                )
-                break
-            except requests.exceptions.RequestException:
-                print("Archive.org request timeout: sleep for 15 seconds and try again")
-                time.sleep(15)
+        try:
+            archived_page = http_client.get(
+                self.url,
+                cookies=http_client.AGE_CHECK_COOKIES,
+                timeout=15).text
+        except requests.exceptions.RequestException:
+            print("Archive.org unavailable: skipping removed game " + appid)
+            return None
 
-        self.title = self.title()
-        self.gettype = self.gettype()
-        self.price = self.getprice()
-        self.asf = self.getasf()
-        self.achievements = SteamGame.getachev(self)
-        self.unreleased = SteamGame.isunreleased(self)
-        self.isearlyaccess = SteamGame.isearlyaccess(self)
-        self.unreleasedtext = SteamGame.getunreleasedtext(self)
-        self.blurb = self.getDescriptionSnippet()
-        self.reviewsummary = SteamGame.reviewsummary(self)
-        self.reviewdetails, self.lowreviews = SteamGame.reviewdetails(self)
-        self.genres = self.genres()
-        self.usertags = SteamGame.usertags(self)
+        # everything read from the archived page, in a worker process when enabled
+        for field, value in parse_pool.run(SteamRemovedGame.extract, appid, archived_page).items():
+            setattr(self, field, value)
+        if self.gettype == "game":
+            self.planner.submit("market", SteamGame.fetchmarket, self)
+            self.planner.submit("pcgamingwiki" + appid, SteamGame.fetchpcgamingwiki, appid)
+        self.reviewdetails, self.lowreviews = SteamGame.optional(self, "reviewdetails", self.reviewdetails, ("", False))
         if self.gettype != "game":
-            self.basegame = self.basegame()
-        self.releasedate = self.releasedate()
-        self.nsfw = SteamGame.nsfw(self)
+            self.basegame = SteamGame.optional(self, "basegame", lambda: self.planner.optional("basegame", self.basegame), None)
         self.plusone = False
-        self.developers, self.developers_num = self.developers()
         if self.gettype == "game":
-            self.cards = SteamGame.getcards(self)
-            self.pcgamingwiki = SteamGame.pcgamingwiki(self, self.appID)
+            self.cards = SteamGame.optional(self, "cards", lambda: SteamGame.getcards(self), None)
+            self.pcgamingwiki = SteamGame.optional(self, "pcgamingwiki", lambda: SteamGame.pcgamingwiki(self, self.appID), False)
+        SteamGame.release(self)
+
+    @classmethod
+    def extract(cls, appid, text):
+        game = cls.__new__(cls)
+        game.appID = appid
+        game.gamePage = html_parser.parse(text)
+        game.title = game.title()
+        game.gettype = game.gettype()
+        game.price = game.getprice()
+        game.asf = game.getasf()
+        game.achievements = SteamGame.getachev(game)
+        game.unreleased = SteamGame.isunreleased(game)
+        game.isearlyaccess = SteamGame.isearlyaccess(game)
+        game.unreleasedtext = SteamGame.getunreleasedtext(game)
+        game.blurb = game.getDescriptionSnippet()
+        game.releasedate = game.releasedate()
+        game.reviewsummary = SteamGame.reviewsummary(game)
+        # the Steam requests for these are made after the page is read
+        game.review_details = SteamGame.reviewdetailspage(game)
+        game.genres = game.genres()
+        game.usertags = SteamGame.usertags(game)
+        game.nsfw = SteamGame.nsfw(game)
+        game.developers, game.developers_num = game.developers()
+        if game.gettype != "game":
+            game.basegame_appid = game.basegameappid()
+        else:
+            game.cards_tag = SteamGame.cardstag(game)
+        game.__dict__.pop("pageIndex", None)
+        html_parser.free(game.__dict__.pop("gamePage"))
+        return {field: plain(value) for field, value in game.__dict__.items()}
 
     @classmethod
     def filterjson(cls, archive_json):
@@ -169,24 +185,30 @@ class SteamRemovedGame:
                     return ", ".join(genres[:3])
         return False
 
+    def reviewdetails(self):
+        if self.review_details is None:
+            return "", False
+        return SteamGame.withlowreviews(self, *self.review_details)
+
+    def basegameappid(self):
+        description = self.gamePage.find("div", {"class": "glance_details"})
+        basegame_link = description.find("a")
+        basegame_href = basegame_link.get('href')
+        basegame_href = basegame_href.split("/")
+        app = basegame_href.index("app") + 1
+        return basegame_href[app]
+
     def basegame(self):
         if self.gettype != "game":
-            description = self.gamePage.find("div", {"class": "glance_details"})
-            basegame_link = description.find("a")
-            basegame_href = basegame_link.get('href')
-            basegame_href = basegame_href.split("/")
-            app = basegame_href.index("app") + 1
-            appid = basegame_href[app]
+            appid = self.basegame_appid
 
-            while True:
-                try:
-                    basegame_json = requests.get(
-                        "https://web.archive.org/cdx/search/cdx?url=store.steampowered.com/app/" + appid + "/*&fl=original,timestamp&filter=statuscode:200&output=json",
-                        timeout=15)
-                    break
-                except requests.exceptions.RequestException:
-                    print("Archive.org request timeout: sleep for 15 seconds and try again")
-                    time.sleep(15)
+            try:
+                basegame_json = http_client.get(
+                    "https://web.archive.org/cdx/search/cdx?url=store.steampowered.com/app/" + appid + "/*&fl=original,timestamp&filter=statuscode:200&output=json",
+                    timeout=15)
+            except requests.exceptions.RequestException:
+                print("Archive.org unavailable: leaving out base game")
+                return None
 
             if 'json' in basegame_json.headers.get('Content-Type'):
                 basegame_data = self.filterjson(basegame_json)
@@ -207,23 +229,16 @@ class SteamRemovedGame:
                 return archive_url
 
             url = basegameurl()
-            while True:
-                try:
-                    basegamePage = BeautifulSoup(
-                        requests.get(
-                            url,
-                            cookies={
-                                "birthtime": "640584001",
-                                "lastagecheckage": "20-April-1990",
-                                "mature_content": "1",
-                            },
-                            timeout=15).text,
-                        "html.parser",
-                    )
-                    break
-                except requests.exceptions.RequestException:
-                    print("Archive.org request timeout: sleep for 15 seconds and try again")
-                    time.sleep(15)
+            try:
+                basegamePage = html_parser.parse(
+                    http_client.get(
+                        url,
+                        cookies=http_client.AGE_CHECK_COOKIES,
+                        timeout=15).text,
+                )
+            except requests.exceptions.RequestException:
+                print("Archive.org unavailable: leaving out base game")
+                return None
 
             def basegameisfree():
                 price = basegamePage.find("div", {"class": "game_purchase_price"})
@@ -247,7 +262,9 @@ class SteamRemovedGame:
             free = basegameisfree()
             discount = False
             name = basegamename()
-            return appid, name, price, "", free, discount, url
+            # only the text is kept
+            html_parser.free(basegamePage)
+            return BaseGame(appid, name, price, "", free, discount, True, url)
 
     def releasedate(self):
         release_divs = self.gamePage.find_all("div", class_="release_date")
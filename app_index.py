@@ -0,0 +1,162 @@
+import argparse
+import os
+import sqlite3
+import threading
+import time
+
+import requests
+
+import game_names
+import http_client
+
+# empty to always use the store search
+INDEX_PATH = os.getenv("RSGIB_APP_INDEX", "steamapps.db")
+APP_LIST_URL = "https://api.steampowered.com/ISteamApps/GetAppList/v2/"
+# seconds between downloads of the app list
+REFRESH_INTERVAL = float(os.getenv("RSGIB_APP_INDEX_REFRESH", str(24 * 60 * 60)))
+RETRY_INTERVAL = 10 * 60
+# the index is read through mmap instead of copied into sqlite's page cache
+MMAP_SIZE = 256 * 1024 * 1024
+
+# key kinds, in the order the matcher tries them
+# no anagram keys, over every app an unrelated one can be the only match, the store search results are ranked
+EXACT, WORDS = range(2)
+
+
+class AppIndex:
+    # appids of all Steam apps by the keys of their normalized names
+
+    def __init__(self, path=INDEX_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = self.connect()
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS apps (kind INTEGER NOT NULL, key TEXT NOT NULL, appid TEXT NOT NULL, "
+            "PRIMARY KEY (kind, key, appid)) WITHOUT ROWID")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value REAL NOT NULL)")
+        self.connection.commit()
+
+    def connect(self):
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA mmap_size=" + str(MMAP_SIZE))
+        return connection
+
+    def built(self):
+        with self.lock:
+            row = self.connection.execute("SELECT value FROM meta WHERE key = 'built'").fetchone()
+        return row[0] if row is not None else None
+
+    def build(self, apps):
+        # apps are (appid, name), replaces the whole index in one transaction
+        rows = set()
+        for appid, name in apps:
+            # stripped, "Ghost Story: DLC" leaves a trailing space that would be a word of its own
+            name = game_names.normalize(name).strip()
+            if name == "":
+                continue
+            exact, words, _ = game_names.keys(name)
+            rows.add((EXACT, exact, str(appid)))
+            rows.add((WORDS, words, str(appid)))
+        # own connection, lookups keep reading the previous index until the commit
+        connection = self.connect()
+        try:
+            with connection:
+                connection.execute("DELETE FROM apps")
+                connection.executemany("INSERT INTO apps (kind, key, appid) VALUES (?, ?, ?)", rows)
+                connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('built', ?)", (time.time(),))
+        finally:
+            connection.close()
+        return len(rows)
+
+    def candidates(self, kind, key):
+        # two are enough to know the key is ambiguous
+        with self.lock:
+            return [row[0] for row in self.connection.execute(
+                "SELECT appid FROM apps WHERE kind = ? AND key = ? LIMIT 2", (kind, key))]
+
+    def lookup(self, game_name):
+        # appid when exactly one app matches, None leaves it to the store search
+        names = dict.fromkeys(game_names.variants(game_names.normalize(game_name).strip()))
+        for kind in (EXACT, WORDS):
+            for name in names:
+                appids = self.candidates(kind, game_names.keys(name)[kind])
+                if len(appids) == 1:
+                    return appids[0]
+                if len(appids) > 1:
+                    # the store search orders the matches by relevance
+                    return None
+        return None
+
+    def names(self):
+        # (normalized name, appid) of every app, the exact keys are the names
+        with self.lock:
+            return self.connection.execute("SELECT key, appid FROM apps WHERE kind = ?", (EXACT,)).fetchall()
+
+    def stats(self):
+        with self.lock:
+            return self.connection.execute("SELECT kind, COUNT(*) FROM apps GROUP BY kind").fetchall()
+
+
+def fetchapps():
+    apps = http_client.get(APP_LIST_URL, timeout=60).json()["applist"]["apps"]
+    return [(app["appid"], app["name"]) for app in apps]
+
+
+def refresh(app_index):
+    try:
+        count = app_index.build(fetchapps())
+    except (requests.exceptions.RequestException, ValueError, KeyError):
+        print("Steam app list unavailable: keeping the app index")
+        return False
+    print("Steam app index built with " + str(count) + " keys")
+    return True
+
+
+def refresher(app_index):
+    while True:
+        built = app_index.built()
+        if built is not None and built + REFRESH_INTERVAL > time.time():
+            time.sleep(built + REFRESH_INTERVAL - time.time())
+        elif not refresh(app_index):
+            time.sleep(RETRY_INTERVAL)
+
+
+index = None
+index_lock = threading.Lock()
+
+
+def shared():
+    global index
+    with index_lock:
+        if index is None:
+            index = AppIndex()
+            # the first build takes a while, the store search answers until then
+            threading.Thread(target=refresher, args=(index,), name="app-index", daemon=True).start()
+    return index
+
+
+def lookup(game_name):
+    if not INDEX_PATH:
+        return None
+    return shared().lookup(game_name)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or query the Steam app index")
+    parser.add_argument("--path", default=INDEX_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("build")
+    commands.add_parser("stats")
+    lookup_parser = commands.add_parser("lookup")
+    lookup_parser.add_argument("name")
+    args = parser.parse_args()
+
+    app_index = AppIndex(args.path)
+    if args.command == "build":
+        refresh(app_index)
+    elif args.command == "stats":
+        for kind, count in app_index.stats():
+            print(["exact", "words"][kind] + ": " + str(count) + " keys")
+    elif args.command == "lookup":
+        print(app_index.lookup(args.name))
@@ -0,0 +1,167 @@
+# Reddit FreeGameFindings Bot with Reddit on one asyncio event loop
+# Alternative to the watcher threads in main.py, with the same handlers, install with the async extra
+# Only Reddit is async: the streams, the bot's comment listings and every Reddit call of the handlers
+# share one asyncpraw client on the loop. The store and giveaway pages are still fetched with requests,
+# so each item in flight holds a handler thread below, and the resolve and fetch pools stay as they are
+
+import asyncio
+import itertools
+import os
+import traceback
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import asyncpraw
+import asyncprawcore
+import prawcore
+
+import async_reddit
+import main
+import metrics
+import work_pool
+from keep_alive import keep_alive
+
+# items each watcher handles at the same time, a handler can wait on the game pages for seconds
+SUBMISSION_CONCURRENCY = int(os.getenv("RSGIB_SUBMISSION_CONCURRENCY", "4"))
+COMMENT_CONCURRENCY = int(os.getenv("RSGIB_COMMENT_CONCURRENCY", "4"))
+REPOST_CONCURRENCY = int(os.getenv("RSGIB_REPOST_CONCURRENCY", "2"))
+
+# the handlers block on their pages, one thread for each item in flight and they reach Reddit through the loop
+# one thread more for each of the two giveaway refreshers
+handler_executor = ThreadPoolExecutor(
+    max_workers=SUBMISSION_CONCURRENCY + COMMENT_CONCURRENCY + REPOST_CONCURRENCY + 2,
+    thread_name_prefix="handler")
+
+REDDIT_ERRORS = (asyncprawcore.exceptions.AsyncPrawcoreException, prawcore.exceptions.PrawcoreException)
+
+
+async def handle(handler, *args):
+    try:
+        await asyncio.get_event_loop().run_in_executor(handler_executor, handler, *args)
+    except REDDIT_ERRORS:
+        print('Trying to reach Reddit')
+    except Exception:
+        # a watcher thread would have stopped, here only this item is lost
+        traceback.print_exc()
+
+
+class Limited:
+    # items handled at once up to a limit, in stream order
+
+    def __init__(self, handler, concurrency):
+        self.handler = handler
+        self.limit = asyncio.Semaphore(concurrency)
+
+    async def put(self, item):
+        # stop reading the stream while the handlers are busy
+        await self.limit.acquire()
+        task = asyncio.ensure_future(handle(self.handler, item))
+        task.add_done_callback(lambda _: self.limit.release())
+
+
+class Lanes:
+    # work_pool.WorkPool on the loop, waiting giveaway posts go before game posts
+
+    def __init__(self, handler, workers, maxsize, lane):
+        self.handler = handler
+        self.lane = lane
+        # full queue blocks put, the stream then waits for the workers
+        self.queue = asyncio.PriorityQueue(maxsize)
+        # same lane keeps stream order
+        self.order = itertools.count()
+        self.queued = Counter()
+        self.workers = [asyncio.ensure_future(self.work()) for _ in range(workers)]
+
+    async def put(self, item):
+        lane = self.lane(item)
+        await self.queue.put((lane, next(self.order), item))
+        self.queued[lane] += 1
+
+    def depth(self, lane=None):
+        # read by the metrics thread, only changed on the loop
+        if lane is None:
+            return sum(self.queued.values())
+        return self.queued[lane]
+
+    async def work(self):
+        while True:
+            lane, _, item = await self.queue.get()
+            self.queued[lane] -= 1
+            await handle(self.handler, item)
+
+
+async def watch(stream, consumers, bridge):
+    # the stream is read once for all its consumers
+    while True:
+        try:
+            async for item in stream():
+                item = bridge.wrap(item)
+                for consumer in consumers:
+                    await consumer.put(item)
+        except REDDIT_ERRORS:
+            print('Trying to reach Reddit')
+            await asyncio.sleep(30)
+
+
+async def refreshgiveaways(reddit, bridge, limit, longlasting, interval):
+    while True:
+        try:
+            redditor = await reddit.redditor(main.BOT_USERNAME)
+            comments = []
+            async for comment in redditor.comments.new(limit=limit):
+                if main.isgiveawaycomment(comment, longlasting):
+                    comments.append(comment)
+            for comment in comments:
+                refreshed = await asyncio.get_event_loop().run_in_executor(
+                    handler_executor, main.refreshgiveawaycomment, bridge.wrap(comment), interval)
+                if refreshed:
+                    await asyncio.sleep(main.giveawaysleeptime(len(comments), longlasting))
+        except REDDIT_ERRORS:
+            print('Trying to reach Reddit')
+            await asyncio.sleep(30)
+        except Exception:
+            traceback.print_exc()
+            await asyncio.sleep(30)
+
+
+async def run():
+    reddit = asyncpraw.Reddit(
+        user_agent='steamstorelinker',
+        client_id=os.getenv('RSGIB_CLIENT_ID'),
+        client_secret=os.getenv('RSGIB_CLIENT_SECRET'),
+        username=main.BOT_USERNAME,
+        password=os.getenv('RSGIB_PASSWORD')
+    )
+    reddit.validate_on_submit = True
+    bridge = async_reddit.Bridge(asyncio.get_event_loop())
+    # hasbotalreadyreplied looks up comments on the module's reddit
+    main.reddit = async_reddit.Reddit(reddit, bridge)
+    subreddit = await reddit.subreddit(main.SUBLIST)
+
+    print('Started watching subs: ' + main.SUBLIST)
+    print('Watching all comments on: ' + main.SUBLIST)
+    print('Watching bot comments')
+    print('Watching longlasting bot comments')
+    print('Started watching subs for reposts: ' + main.SUBLIST)
+    # giveaway posts are handled before the game posts that wait, like in the watcher threads
+    submissions = Lanes(main.handlesubmission, SUBMISSION_CONCURRENCY, main.SUBMISSION_QUEUE, main.submissionlane)
+    metrics.gauge("pool.submissions", submissions.depth)
+    metrics.gauge("pool.submissions.giveaway", lambda: submissions.depth(work_pool.LANE_GIVEAWAY))
+    try:
+        await asyncio.gather(
+            watch(
+                lambda: subreddit.stream.submissions(skip_existing=True),
+                [submissions, Limited(main.handlerepost, REPOST_CONCURRENCY)], bridge),
+            watch(lambda: subreddit.stream.comments(skip_existing=True), [Limited(main.handlecomment, COMMENT_CONCURRENCY)], bridge),
+            refreshgiveaways(reddit, bridge, 20, False, "minute"),
+            refreshgiveaways(reddit, bridge, 100, True, "30 minutes"),
+        )
+    finally:
+        await reddit.close()
+
+
+if __name__ == "__main__":
+
+    keep_alive()
+
+    asyncio.get_event_loop().run_until_complete(run())
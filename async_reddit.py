@@ -0,0 +1,101 @@
+import asyncio
+import inspect
+import threading
+
+import asyncpraw
+import asyncprawcore
+import praw
+import prawcore
+
+# praw shaped, blocking view of asyncpraw objects for the handlers in main
+# the handlers run on worker threads and every Reddit call is sent to the event loop,
+# so the one asyncpraw client is only ever used from the loop's thread
+
+
+class Bridge:
+
+    def __init__(self, loop):
+        self.loop = loop
+        # created on the loop's thread, waiting there for the loop would never return
+        self.loop_thread = threading.get_ident()
+
+    def call(self, coroutine):
+        if threading.get_ident() == self.loop_thread:
+            coroutine.close()
+            raise RuntimeError("Blocking Reddit call on the event loop thread")
+        try:
+            return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+        except asyncprawcore.exceptions.AsyncPrawcoreException as e:
+            # the handlers catch the praw exceptions
+            raise prawcore.exceptions.PrawcoreException(str(e)) from e
+        except asyncpraw.exceptions.ClientException as e:
+            raise praw.exceptions.ClientException(str(e)) from e
+
+    def collect(self, iterator):
+        # listings are read whole, like the handlers iterate them
+        async def items():
+            return [item async for item in iterator]
+        return [self.wrap(item) for item in self.call(items())]
+
+    def wrap(self, value):
+        if isinstance(value, asyncpraw.models.Submission):
+            return Submission(value, self)
+        if isinstance(value, asyncpraw.models.Comment):
+            return Comment(value, self)
+        if isinstance(value, asyncpraw.models.comment_forest.CommentForest):
+            return [self.wrap(item) for item in value]
+        if inspect.iscoroutinefunction(value):
+            def blocking(*args, **kwargs):
+                return self.wrap(self.call(value(*args, **kwargs)))
+            return blocking
+        if type(value).__module__.startswith("asyncpraw.") and not isinstance(value, asyncpraw.models.reddit.base.RedditBase):
+            # helpers like submission.mod
+            return Model(value, self)
+        # plain values, and redditors and subreddits that are only compared to names
+        return value
+
+
+class Model:
+
+    def __init__(self, item, bridge):
+        self._item = item
+        self._bridge = bridge
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self._bridge.wrap(getattr(self._item, name))
+        except AttributeError:
+            if getattr(self._item, "_fetched", True):
+                raise
+        # praw fetches a lazy object on first use, asyncpraw wants an explicit load
+        self._bridge.call(self._item.load())
+        return self._bridge.wrap(getattr(self._item, name))
+
+    def __str__(self):
+        return str(self._item)
+
+
+# named like the praw classes, fitscriteria tells them apart by type name
+class Submission(Model):
+
+    @property
+    def comments(self):
+        if not self._item._fetched:
+            self._bridge.call(self._item.load())
+        return self._bridge.wrap(self._item.comments)
+
+    def duplicates(self):
+        return self._bridge.collect(self._item.duplicates())
+
+
+class Comment(Model):
+    pass
+
+
+class Reddit(Model):
+
+    def comment(self, id):
+        # lazy like praw.Reddit.comment, hasbotalreadyreplied refreshes it
+        return self._bridge.wrap(self._bridge.call(self._item.comment(id, fetch=False)))
@@ -0,0 +1,68 @@
+# Compares parse time and peak memory of the html parser backends over saved pages
+# Usage: python benchmarks/html_parsers.py [--runs N] PAGE_TYPE=FILE ...
+# e.g. search=search.html store=skyrim.html, save pages with curl or the browser
+# Page types with a strainer in html_parser.STRAINERS are also parsed limited to that part
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import html_parser  # noqa: E402
+
+BACKENDS = ["html.parser", "lxml", "html5lib"]
+
+
+def installed(backend):
+    try:
+        BeautifulSoup("", backend)
+    except FeatureNotFound:
+        return False
+    return True
+
+
+def measure(markup, backend, strainer, runs):
+    start = time.perf_counter()
+    for _ in range(runs):
+        BeautifulSoup(markup, backend, parse_only=strainer)
+    seconds = (time.perf_counter() - start) / runs
+    tracemalloc.start()
+    BeautifulSoup(markup, backend, parse_only=strainer)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark html parser backends over saved pages")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("pages", nargs="+", metavar="PAGE_TYPE=FILE")
+    args = parser.parse_args()
+
+    backends = [backend for backend in BACKENDS if installed(backend)]
+    print("page           size KB  backend      strained  parse ms  peak MB")
+    for page in args.pages:
+        page_type, path = page.split("=", 1)
+        with open(path, encoding="utf-8") as page_file:
+            markup = page_file.read()
+        strainers = [None]
+        if page_type in html_parser.STRAINERS:
+            strainers.append(html_parser.STRAINERS[page_type])
+        for backend in backends:
+            for strainer in strainers:
+                # html5lib always builds the whole tree
+                if strainer is not None and backend == "html5lib":
+                    continue
+                seconds, peak = measure(markup, backend, strainer, args.runs)
+                print("{:<14} {:>7.0f}  {:<12} {:<8}  {:>8.1f}  {:>7.1f}".format(
+                    page_type, len(markup) / 1024, backend, "yes" if strainer is not None else "no",
+                    seconds * 1000, peak / 1024 / 1024))
+
+
+if __name__ == "__main__":
+    main()
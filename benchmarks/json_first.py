@@ -0,0 +1,98 @@
+# Compares bytes downloaded and CPU time of the store page and json first SteamGame modes
+# Usage: python benchmarks/json_first.py [appid ...]
+# Needs access to Steam, results depend on the games and the connection
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import game_cache  # noqa: E402
+import http_client  # noqa: E402
+import SteamGame  # noqa: E402
+
+# Skyrim, a free mod, a free game and a DLC
+DEFAULT_APPIDS = ["72850", "317400", "440", "1245620"]
+
+transferred = {"downloaded": 0, "decoded": 0, "requests": 0}
+session_get = http_client.session.get
+
+
+def counting_get(url, **kwargs):
+    response = session_get(url, **kwargs)
+    transferred["requests"] += 1
+    if kwargs.get("stream"):
+        # read_text stops early, only what it reads is counted, .content would read the rest
+        count_stream(response)
+        return response
+    transferred["decoded"] += len(response.content)
+    # bytes read from the connection, before decompression
+    transferred["downloaded"] += response.raw.tell() or len(response.content)
+    return response
+
+
+def count_stream(response):
+    iter_content = response.iter_content
+    close = response.close
+
+    def counting_iter_content(chunk_size=1, decode_unicode=False):
+        for chunk in iter_content(chunk_size, decode_unicode):
+            transferred["decoded"] += len(chunk)
+            yield chunk
+
+    def counting_close():
+        # read_text closes the response when it stops, the connection has read this much
+        transferred["downloaded"] += response.raw.tell()
+        close()
+
+    response.iter_content = counting_iter_content
+    response.close = counting_close
+
+
+def clear_caches():
+    game_cache.appdetails_cache.clear()
+    game_cache.field_cache.clear()
+    game_cache.invalid_cache.clear()
+
+
+def expire_fields(appid):
+    # the state after the medium ttl has passed, only slowly changing fields are left
+    game_cache.appdetails_cache.clear()
+    for field, ttl in game_cache.FIELD_TTL.items():
+        if ttl < game_cache.SLOW_TTL:
+            game_cache.field_cache.delete((appid, field))
+
+
+def measure(appids, json_first, warm):
+    SteamGame.JSON_FIRST = json_first
+    clear_caches()
+    if warm:
+        for appid in appids:
+            SteamGame.SteamGame(appid)
+            expire_fields(appid)
+    for key in transferred:
+        transferred[key] = 0
+    cpu = time.process_time()
+    wall = time.perf_counter()
+    for appid in appids:
+        SteamGame.SteamGame(appid)
+    return dict(transferred, cpu=time.process_time() - cpu, wall=time.perf_counter() - wall)
+
+
+def main():
+    appids = sys.argv[1:] or DEFAULT_APPIDS
+    http_client.session.get = counting_get
+    print("mode        lookups  requests  downloaded KB  decoded KB  cpu s   wall s")
+    for warm in (False, True):
+        for json_first in (False, True):
+            result = measure(appids, json_first, warm)
+            mode = "json" if json_first else "page"
+            lookups = "refresh" if warm else "cold"
+            print("{:<11} {:<8} {:>8}  {:>13.0f}  {:>10.0f}  {:>6.2f}  {:>6.2f}".format(
+                mode, lookups, result["requests"], result["downloaded"] / 1024, result["decoded"] / 1024,
+                result["cpu"], result["wall"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# Compares page parsing throughput on the watcher threads and in 1, 2 and 4 worker processes
+# Usage: python benchmarks/parse_pool.py [--pages N] [--threads N] PAGE_TYPE=FILE ...
+# Page types are store, archived and search, save pages with curl or the browser
+# e.g. store=skyrim.html archived=archived.html search=search.html
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import parse_pool  # noqa: E402
+from SteamGame import SteamGame  # noqa: E402
+from SteamRemovedGame import SteamRemovedGame  # noqa: E402
+from SteamSearchGame import SteamSearchGame  # noqa: E402
+
+WORKERS = [0, 1, 2, 4]
+# the extraction step each page type runs in a worker
+EXTRACT = {
+    "store": lambda text: parse_pool.run(SteamGame.compactstorepage, text),
+    "archived": lambda text: parse_pool.run(SteamRemovedGame.extract, "0", text),
+    "search": lambda text: parse_pool.run(SteamSearchGame.searchresults, text),
+}
+
+
+def measure(extract, text, workers, pages, threads):
+    parse_pool.PARSE_WORKERS = workers
+    try:
+        # start the worker processes before timing
+        extract(text)
+        cpu = time.process_time()
+        wall = time.perf_counter()
+        # the watcher threads submitting pages at the same time
+        with ThreadPoolExecutor(max_workers=threads) as submitters:
+            list(submitters.map(lambda _: extract(text), range(pages)))
+        return pages / (time.perf_counter() - wall), time.process_time() - cpu
+    finally:
+        parse_pool.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parsing pages in worker processes")
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--threads", type=int, default=5)
+    parser.add_argument("pages_files", nargs="+", metavar="PAGE_TYPE=FILE")
+    args = parser.parse_args()
+
+    print("cores: " + str(os.cpu_count()))
+    print("page       size KB  workers  pages/s  main cpu s")
+    for page in args.pages_files:
+        page_type, path = page.split("=", 1)
+        with open(path, encoding="utf-8") as page_file:
+            text = page_file.read()
+        for workers in WORKERS:
+            rate, cpu = measure(EXTRACT[page_type], text, workers, args.pages, args.threads)
+            print("{:<10} {:>7.0f}  {:>7}  {:>7.1f}  {:>10.2f}".format(
+                page_type, len(text) / 1024, workers or "threads", rate, cpu))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+# Compares the title matcher with the matching loop it replaced over FGF post titles
+# Usage: python benchmarks/title_matcher.py [--runs N] [--results N] [TITLES_FILE]
+# TITLES_FILE has one post title per line, e.g. exported from the subreddit, default is a built-in sample
+# Each title is matched against search results made from the other titles, with the game at a random place
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import game_names  # noqa: E402
+from main import STEAM_TITLE_REGEX  # noqa: E402
+from SteamSearchGame import SteamSearchGame  # noqa: E402
+
+SAMPLE_TITLES = [
+    "[Steam] (Game) Tomb Raider GOTY Edition",
+    "[Steam] (Game) Sid Meier's Civilization VI",
+    "[Steam] (Game) Borderlands 2",
+    "[Steam] (Game) Grand Theft Auto V",
+    "[Steam] (Game) Shadow Tactics: Blades of the Shogun",
+    "[Steam] (Game) Deus Ex: Human Revolution - Director's Cut",
+    "[Steam] (DLC) Euro Truck Simulator 2 - Halloween Paint Jobs Pack",
+    "[Steam] (Game) Alan Wake",
+    "[Steam] (Game) Into the Breach",
+    "[Steam] (Game) Dishonored 2",
+    "[Steam] (Game) Wolfenstein: The New Order",
+    "[Steam] (Game) Hitman: Absolution",
+    "[Steam] (Game) Pillars of Eternity",
+    "[Steam] (Game) The Witcher 2: Assassins of Kings Enhanced Edition",
+    "[Steam] (Game) Mafia II",
+    "[Steam] (Game) Final Fantasy 7",
+    "[Steam] (Game) Dragon Age: Origins",
+    "[Steam] (Game) Metro 2033 Redux",
+    "[Steam] (Game) Kerbal Space Program",
+    "[Steam] (Game) A Hat in Time",
+    "[Steam] (Game) Hollow Knight",
+    "[Steam] (Game) Subnautica",
+    "[Steam] (Game) Oxenfree",
+    "[Steam] (Game) Torchlight II",
+    "[Steam] (Game) Stellaris",
+    "[Steam] (Game) Darkest Dungeon",
+    "[Steam] (Game) The Outer Worlds",
+    "[Steam] (Game) Age of Wonders III",
+    "[Steam] (DLC) Stellaris: Humanoids Species Pack",
+    "[Steam] (Game) Prey",
+    "[Steam] (Game) Saints Row IV",
+    "[Steam] (Game) Ghostrunner",
+    "[Steam] (Game) Cities: Skylines",
+    "[Steam] (Game) Batman: Arkham Knight",
+    "[Steam] (Game) Surviving Mars",
+    "[Steam] (Game) Terraria",
+    "[Steam] (Game) F.E.A.R. 3",
+    "[Steam] (Game) The Elder Scrolls III: Morrowind",
+    "[Steam] (Game) Warhammer 40,000: Dawn of War II",
+    "[Steam] (Game) Total War: SHOGUN 2",
+    "[Steam] (Game) Sniper Elite 4",
+    "[Steam] (Game) Steamworld Dig 2",
+    "[Steam] (Game) Bioshock Infinite",
+    "[Steam] (Game) Crusader Kings 2",
+    "[Steam] (Game) Trials of the Illuminati",
+    "[Steam] (Game) Just Cause 3",
+    "[Steam] (Game) Dead Island Definitive Edition",
+    "[Steam] (Game) Rage 2",
+    "[Steam] (Game) The Stanley Parable",
+    "[Steam] (Game) Frostpunk",
+]
+
+
+def legacy_appid(target, games):
+    # SteamSearchGame.appid before the title matcher, for a store search with source Steam
+    appid = 0
+    game_name = ""
+
+    def repl_roman(match):
+        return game_names.write_roman(int(match.group(0)))
+
+    def repl_num(match):
+        return game_names.write_num(match.group(0))
+
+    for get_title, game_appid in games:
+        get_title = re.sub(r'[\W_]+', u' ', get_title.replace(",", ""), flags=re.UNICODE).lower()
+        game_name = re.sub(r'[\W_]+', u' ', target.replace(",", ""), flags=re.UNICODE).lower()
+        get_title = get_title.replace("dlc", "").replace("  ", " ")
+        game_name = game_name.replace("dlc", "").replace("  ", " ")
+        if (
+            get_title == game_name
+            or set(get_title.split(" ")) == set(game_name.split(" "))
+            or sorted(get_title.replace(" ", "")) == sorted(game_name.replace(" ", ""))
+        ):
+            appid = game_appid
+            break
+        game_name_roman = re.compile(r"\b\d+\b").sub(repl_roman, game_name)
+        game_name_number = re.compile(r"\b(cm|cd|d?c{0,3})(xc|xl|l?x{0,3})(ix|iv|v?i{0,3})\b").sub(repl_num, game_name)
+        if (
+            get_title == game_name_roman
+            or set(get_title.split(" ")) == set(game_name_roman.split(" "))
+            or sorted(get_title.replace(" ", "")) == sorted(game_name_roman.replace(" ", ""))
+            or get_title == game_name_number
+            or set(get_title.split(" ")) == set(game_name_number.split(" "))
+            or sorted(get_title.replace(" ", "")) == sorted(game_name_number.replace(" ", ""))
+        ):
+            appid = game_appid
+            break
+    if appid == 0 and "random" not in game_name:
+        for get_title, game_appid in games:
+            get_title = re.sub(r'[\W_]+', u' ', get_title.replace(",", ""), flags=re.UNICODE).lower()
+            get_title = get_title.replace("dlc", "").replace("  ", " ")
+            if len(get_title.split(" ")) <= len(game_name.split(" ")) + 1:
+                if game_name in get_title or all(x in get_title for x in game_name.split(" ")):
+                    appid = game_appid
+                    break
+            if len(get_title.split(" ")) <= len(game_name_roman.split(" ")) + 1:
+                if (
+                    game_name_roman in get_title
+                    or all(x in get_title for x in game_name_roman.split(" "))
+                    or game_name_number in get_title
+                    or all(x in get_title for x in game_name_number.split(" "))
+                ):
+                    appid = game_appid
+                    break
+    return appid
+
+
+def matcher_appid(game_name, games):
+    matcher = game_names.TitleMatcher(game_name)
+    return matcher.best(games, subset="random" not in matcher.name) or 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the search result title matcher")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--results", type=int, default=25, help="search results per title")
+    parser.add_argument("titles_file", nargs="?")
+    args = parser.parse_args()
+
+    titles = SAMPLE_TITLES
+    if args.titles_file:
+        with open(args.titles_file, encoding="utf-8") as titles_file:
+            titles = [line.strip() for line in titles_file if re.search(STEAM_TITLE_REGEX, line, re.IGNORECASE)]
+    names = [re.split(STEAM_TITLE_REGEX, title, flags=re.IGNORECASE)[-1].strip() for title in titles]
+    random.seed(0)
+    cases = []
+    for number, name in enumerate(names):
+        # the game, its soundtrack and other games, like a store search
+        others = random.sample([other for other in names if other != name], min(args.results - 2, len(names) - 1))
+        results = [(other, str(index)) for index, other in enumerate(others, 1000)]
+        results.insert(random.randrange(len(results) + 1), (name, str(number)))
+        results.insert(random.randrange(len(results) + 1), (name + " Soundtrack", "s" + str(number)))
+        cases.append((SteamSearchGame.game_name_searchable(name), results, str(number)))
+
+    print("titles: " + str(len(cases)) + ", results per title: " + str(args.results))
+    print("matcher        us/title  found")
+    for label, match in (("loop", legacy_appid), ("TitleMatcher", matcher_appid)):
+        found = 0
+        start = time.perf_counter()
+        for _ in range(args.runs):
+            for game_name, results, expected in cases:
+                found += match(game_name, results) == expected
+        elapsed = time.perf_counter() - start
+        print("{:<14} {:>8.1f}  {:>5}".format(label, elapsed / (args.runs * len(cases)) * 1e6, found // args.runs))
+
+
+if __name__ == "__main__":
+    main()
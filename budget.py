@@ -0,0 +1,29 @@
+import contextvars
+import os
+import time
+from contextlib import contextmanager
+
+LATENCY_BUDGET = float(os.getenv("RSGIB_LATENCY_BUDGET", "5"))
+
+current_deadline = contextvars.ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+@contextmanager
+def deadline(seconds=LATENCY_BUDGET):
+    token = current_deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        current_deadline.reset(token)
+
+
+def remaining():
+    # seconds left for optional work, None when there is no deadline
+    end = current_deadline.get()
+    if end is None:
+        return None
+    return max(0, end - time.monotonic())
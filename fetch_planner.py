@@ -0,0 +1,64 @@
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+import budget
+
+FETCH_WORKERS = int(os.getenv("RSGIB_FETCH_WORKERS", "8"))
+
+# shared by all watcher threads, bounds the amount of requests in flight
+executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="fetch")
+
+
+class FetchPlanner:
+
+    def __init__(self, pool=None):
+        # pool for the prefetches, the shared fetch pool unless they wait for fetches themselves
+        self.pool = executor if pool is None else pool
+        self.futures = {}
+        # a prefetch can add the next one from a pool thread
+        self.lock = threading.Lock()
+
+    def submit(self, key, fn, *args):
+        # start an independent request in the background
+        with self.lock:
+            if key not in self.futures:
+                # run with the caller's context so the request keeps its priority lane
+                context = contextvars.copy_context()
+                self.futures[key] = self.pool.submit(context.run, fn, *args)
+
+    def result(self, key, fn, *args):
+        # use the prefetched response if there is one, otherwise fetch now
+        with self.lock:
+            future = self.futures.pop(key, None)
+        if future is None:
+            return fn(*args)
+        return future.result()
+
+    def optional(self, key, fn, *args):
+        # like result, but gives up at the deadline of the current submission
+        with self.lock:
+            future = self.futures.pop(key, None)
+        remaining = budget.remaining()
+        if remaining is None:
+            if future is None:
+                return fn(*args)
+            return future.result()
+        if future is None:
+            if remaining <= 0:
+                raise budget.DeadlineExceeded(key)
+            # on the pool so it can be abandoned when the deadline passes
+            future = self.pool.submit(contextvars.copy_context().run, fn, *args)
+        try:
+            return future.result(timeout=remaining)
+        except TimeoutError:
+            raise budget.DeadlineExceeded(key)
+
+    def cancel(self):
+        # drop requests that are no longer needed, e.g. for an invalid appid
+        with self.lock:
+            futures = list(self.futures.values())
+            self.futures.clear()
+        for future in futures:
+            future.cancel()
@@ -0,0 +1,161 @@
+import argparse
+import os
+import threading
+import time
+
+import numpy as np
+
+import app_index
+import game_names
+
+# dice similarity of the trigrams, below it a candidate is never used for a comment
+THRESHOLD = float(os.getenv("RSGIB_FUZZY_THRESHOLD", "0.8"))
+# another candidate this close to the best one makes the title ambiguous
+MARGIN = float(os.getenv("RSGIB_FUZZY_MARGIN", "0.05"))
+TOP_K = 10
+# apps in the list that are not games or dlc, a close name is not what was posted
+NOT_GAME_WORDS = {"soundtrack", "ost", "playtest", "sdk", "artbook", "wallpapers"}
+NOT_GAME_PHRASES = ("dedicated server", "level editor", "mod tools")
+
+
+def isgame(name):
+    return NOT_GAME_WORDS.isdisjoint(name.split()) and not any(phrase in name for phrase in NOT_GAME_PHRASES)
+
+
+def trigrams(name):
+    # padded so the first and last letters count as much as the middle ones
+    name = " " + name.strip() + " "
+    return {name[i:i + 3] for i in range(len(name) - 2)}
+
+
+class TrigramIndex:
+    # app names as postings of trigram -> rows, stored in flat numpy arrays
+
+    def __init__(self, apps, built=None):
+        # apps are (normalized name, appid)
+        self.built = built
+        self.names = []
+        self.appids = []
+        self.vocabulary = {}
+        counts = []
+        trigram_ids = []
+        rows = []
+        for name, appid in apps:
+            grams = trigrams(name)
+            if not grams or not isgame(name):
+                continue
+            row = len(self.names)
+            self.names.append(name)
+            self.appids.append(str(appid))
+            counts.append(len(grams))
+            for gram in grams:
+                trigram_ids.append(self.vocabulary.setdefault(gram, len(self.vocabulary)))
+                rows.append(row)
+        self.counts = np.array(counts, dtype=np.float32)
+        trigram_ids = np.array(trigram_ids, dtype=np.int32)
+        order = np.argsort(trigram_ids, kind="stable")
+        # rows of trigram i are postings[offsets[i]:offsets[i + 1]]
+        self.postings = np.array(rows, dtype=np.int32)[order]
+        self.offsets = np.zeros(len(self.vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(trigram_ids, minlength=len(self.vocabulary)), out=self.offsets[1:])
+
+    def __len__(self):
+        return len(self.names)
+
+    def scores(self, name):
+        grams = trigrams(name)
+        ids = [self.vocabulary[gram] for gram in grams if gram in self.vocabulary]
+        if not ids:
+            return np.zeros(len(self.names), dtype=np.float32)
+        rows = np.concatenate([self.postings[self.offsets[i]:self.offsets[i + 1]] for i in ids])
+        shared = np.bincount(rows, minlength=len(self.names))
+        return 2 * shared / (self.counts + len(grams))
+
+    def rank(self, game_name, k=TOP_K):
+        # best k (appid, name, score), numeral variants of the title count too
+        scores = None
+        for name in dict.fromkeys(game_names.variants(game_names.normalize(game_name))):
+            variant_scores = self.scores(name)
+            scores = variant_scores if scores is None else np.maximum(scores, variant_scores)
+        if scores is None or len(scores) == 0:
+            return []
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self.appids[row], self.names[row], float(scores[row])) for row in top if scores[row] > 0]
+
+    def resolve(self, game_name, preferred=(), threshold=THRESHOLD):
+        # appid when one app is a confident match, a confident store search result in preferred wins
+        ranked = self.rank(game_name)
+        for appid, _, score in ranked:
+            if score >= threshold and appid in preferred:
+                return appid
+        if not ranked or ranked[0][2] < threshold:
+            return None
+        best = ranked[0]
+        if any(score > best[2] - MARGIN for _, _, score in ranked[1:]):
+            return None
+        return best[0]
+
+
+index = None
+index_lock = threading.Lock()
+refresher_started = False
+
+
+def rebuild(source):
+    global index
+    built = source.built()
+    if built is None or (index is not None and index.built == built):
+        return False
+    started = time.perf_counter()
+    trigram_index = TrigramIndex(source.names(), built)
+    with index_lock:
+        index = trigram_index
+    print("Fuzzy index built with " + str(len(trigram_index)) + " names in "
+          + str(round(time.perf_counter() - started, 1)) + "s")
+    return True
+
+
+def refresher(source):
+    # follows the app index, which is downloaded in the background
+    while True:
+        rebuild(source)
+        time.sleep(app_index.RETRY_INTERVAL)
+
+
+def shared():
+    global refresher_started
+    with index_lock:
+        if not refresher_started:
+            refresher_started = True
+            threading.Thread(target=refresher, args=(app_index.shared(),), name="fuzzy-index", daemon=True).start()
+        return index
+
+
+def resolve(game_name, preferred=()):
+    # None until the app index is built
+    if not app_index.INDEX_PATH:
+        return None
+    trigram_index = shared()
+    if trigram_index is None:
+        return None
+    return trigram_index.resolve(game_name, preferred)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rank Steam apps by trigram similarity to a title")
+    parser.add_argument("--path", default=app_index.INDEX_PATH)
+    parser.add_argument("-k", type=int, default=TOP_K)
+    parser.add_argument("name")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    trigram_index = TrigramIndex(app_index.AppIndex(args.path).names())
+    print(str(len(trigram_index)) + " names in " + str(round(time.perf_counter() - started, 1)) + "s")
+    started = time.perf_counter()
+    ranked = trigram_index.rank(args.name, args.k)
+    print("ranked in " + str(round((time.perf_counter() - started) * 1000, 2)) + "ms")
+    for appid, name, score in ranked:
+        print("{:.3f} {:>8} {}".format(score, appid, name))
+    print("resolved: " + str(trigram_index.resolve(args.name)))
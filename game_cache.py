@@ -0,0 +1,103 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+CACHE_SIZE = int(os.getenv("RSGIB_CACHE_SIZE", "5000"))
+
+FAST_TTL = 5 * 60
+MEDIUM_TTL = 60 * 60
+SLOW_TTL = 24 * 60 * 60
+INVALID_TTL = 60 * 60
+
+# how long a SteamGame field stays valid, prices and discounts change often
+FIELD_TTL = {
+    "title": SLOW_TTL,
+    "gettype": SLOW_TTL,
+    "discountamount": FAST_TTL,
+    "price": FAST_TTL,
+    "asf": FAST_TTL,
+    "achievements": SLOW_TTL,
+    "unreleased": MEDIUM_TTL,
+    "isearlyaccess": MEDIUM_TTL,
+    "unreleasedtext": MEDIUM_TTL,
+    "blurb": SLOW_TTL,
+    "reviewsummary": MEDIUM_TTL,
+    "reviewdetails": MEDIUM_TTL,
+    "genres": SLOW_TTL,
+    "usertags": SLOW_TTL,
+    "basegame": FAST_TTL,
+    "releasedate": SLOW_TTL,
+    "nsfw": SLOW_TTL,
+    "islearning": SLOW_TTL,
+    "developers": SLOW_TTL,
+    "cards": MEDIUM_TTL,
+    "pcgamingwiki": SLOW_TTL,
+}
+
+MISSING = object()
+
+
+class TTLCache:
+
+    def __init__(self, maxsize=CACHE_SIZE, ttl=FAST_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=MISSING):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                # expired
+                del self.entries[key]
+            self.misses += 1
+            return default
+
+    def has(self, key):
+        # presence check that does not count as a hit or miss
+        with self.lock:
+            entry = self.entries.get(key)
+            return entry is not None and entry[0] > time.monotonic()
+
+    def set(self, key, value, ttl=None):
+        if ttl is None:
+            ttl = self.ttl
+        with self.lock:
+            self.entries[key] = (time.monotonic() + ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                # evict least recently used
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            return {"size": len(self.entries), "hits": self.hits, "misses": self.misses}
+
+
+appdetails_cache = TTLCache(ttl=FAST_TTL)
+field_cache = TTLCache()
+invalid_cache = TTLCache(ttl=INVALID_TTL)
+
+
+def stats():
+    return {
+        "appdetails": appdetails_cache.stats(),
+        "fields": field_cache.stats(),
+        "invalid": invalid_cache.stats(),
+    }
@@ -0,0 +1,115 @@
+import json
+from collections import namedtuple
+
+from bs4 import PageElement
+
+# bump when fields change, snapshots of another version are fetched again
+SNAPSHOT_VERSION = 1
+
+# attributes read by buildcommenttext
+FIELDS = (
+    "appID", "url", "date", "title", "gettype", "discountamount", "price", "asf", "achievements",
+    "unreleased", "isearlyaccess", "unreleasedtext", "blurb", "reviewsummary", "reviewdetails",
+    "lowreviews", "genres", "usertags", "basegame", "releasedate", "nsfw", "plusone", "developers",
+    "developers_num", "cards", "pcgamingwiki",
+)
+
+# the base game of a DLC, soundtrack or mod, only appid and title when its appdetails failed
+# pcgamingwiki is always set for removed games, their url is the archived store page
+BaseGame = namedtuple(
+    "BaseGame", ["appid", "title", "price", "fullprice", "free", "discount", "pcgamingwiki", "url"],
+    defaults=[None, None, None, None, None, None])
+# total is 999 when only the market search found cards, drops and marketable are then unknown
+Cards = namedtuple("Cards", ["total", "drops", "marketurl", "marketable"], defaults=[None, None])
+RECORDS = {"basegame": BaseGame, "cards": Cards}
+
+
+def record(name, value):
+    # positional tuples from older code and lists from json become the named record
+    if name not in RECORDS or value is None:
+        return value
+    if isinstance(value, dict):
+        return RECORDS[name](**value)
+    return RECORDS[name](*value)
+
+
+def plain(value):
+    # strings from the page keep the whole tree alive, copy them
+    if isinstance(value, str):
+        return str(value)
+    if isinstance(value, PageElement):
+        return value.text
+    if hasattr(value, "_fields"):
+        return type(value)(*(plain(item) for item in value))
+    if isinstance(value, (list, tuple)):
+        return tuple(plain(item) for item in value)
+    if callable(value):
+        # field was never filled in, e.g. for an invalid appid
+        return None
+    return value
+
+
+class GameInfo:
+    # the extracted fields of a SteamGame or SteamRemovedGame, without the pages they came from
+    __slots__ = FIELDS + ("kind", "is_free", "degraded")
+
+    def __init__(self, kind, is_free=False, degraded=(), **fields):
+        object.__setattr__(self, "kind", kind)
+        object.__setattr__(self, "is_free", is_free)
+        object.__setattr__(self, "degraded", tuple(degraded))
+        for name in FIELDS:
+            object.__setattr__(self, name, record(name, plain(fields.get(name))))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("GameInfo is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("GameInfo is immutable")
+
+    def __repr__(self):
+        return "GameInfo(" + str(self.kind) + ", " + str(self.appID) + ", " + repr(self.title) + ")"
+
+    def __eq__(self, other):
+        return isinstance(other, GameInfo) and self.snapshot() == other.snapshot()
+
+    def __reduce__(self):
+        # pickled as its snapshot, for process pool results
+        return GameInfo.fromsnapshot, (self.snapshot(),)
+
+    @classmethod
+    def fromgame(cls, game):
+        fields = {name: getattr(game, name, None) for name in FIELDS}
+        is_free = False
+        if isinstance(fields["title"], str):
+            # isfree reads the appdetails, only there for a valid game
+            is_free = game.isfree()
+        return cls(type(game).__name__, is_free, getattr(game, "degraded", ()), **fields)
+
+    def isfree(self):
+        return self.is_free
+
+    def fields(self):
+        return {name: getattr(self, name) for name in FIELDS}
+
+    def snapshot(self):
+        fields = self.fields()
+        for name in RECORDS:
+            if fields[name] is not None:
+                fields[name] = fields[name]._asdict()
+        return {
+            "version": SNAPSHOT_VERSION, "kind": self.kind, "is_free": self.is_free,
+            "degraded": list(self.degraded), "fields": fields,
+        }
+
+    @classmethod
+    def fromsnapshot(cls, snapshot):
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            raise ValueError("Unsupported GameInfo snapshot version " + str(snapshot.get("version")))
+        return cls(snapshot["kind"], snapshot["is_free"], snapshot["degraded"], **snapshot["fields"])
+
+    def dumps(self):
+        return json.dumps(self.snapshot(), separators=(",", ":"))
+
+    @classmethod
+    def loads(cls, text):
+        return cls.fromsnapshot(json.loads(text))
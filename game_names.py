@@ -0,0 +1,158 @@
+import re
+from collections import OrderedDict
+from functools import lru_cache
+
+NUMBER_REGEX = re.compile(r"\b\d+\b")
+ROMAN_REGEX = re.compile(r"\b(cm|cd|d?c{0,3})(xc|xl|l?x{0,3})(ix|iv|v?i{0,3})\b")
+
+
+@lru_cache(maxsize=1024)
+def write_roman(num):
+    # Change number into roman numeral
+    if num <= 999:
+        roman = OrderedDict()
+        roman[900] = "cm"
+        roman[500] = "d"
+        roman[400] = "cd"
+        roman[100] = "c"
+        roman[90] = "xc"
+        roman[50] = "l"
+        roman[40] = "xl"
+        roman[10] = "x"
+        roman[9] = "ix"
+        roman[5] = "v"
+        roman[4] = "iv"
+        roman[1] = "i"
+
+        def roman_num(num):
+            for r in roman.keys():
+                x, y = divmod(num, r)
+                yield roman[r] * x
+                num -= (r * x)
+                if num <= 0:
+                    break
+
+        return "".join([a for a in roman_num(num)])
+    return str(num)
+
+
+@lru_cache(maxsize=1024)
+def write_num(roman_num):
+    # Change roman numeral into number
+    if roman_num != "":
+        roman = OrderedDict()
+        roman["i"] = 1
+        roman["v"] = 5
+        roman["x"] = 10
+        roman["l"] = 50
+        roman["c"] = 100
+        roman["d"] = 500
+        roman["m"] = 1000
+        roman["iv"] = 4
+        roman["ix"] = 9
+        roman["xl"] = 40
+        roman["xc"] = 90
+        roman["cd"] = 400
+        roman["cm"] = 900
+
+        pos = 0
+        num = 0
+        while pos < len(roman_num):
+            if pos+1 < len(roman_num) and roman_num[pos:pos+2] in roman:
+                num += roman[roman_num[pos:pos+2]]
+                pos += 2
+            else:
+                num += roman[roman_num[pos]]
+                pos += 1
+        return str(num)
+    return roman_num
+
+
+def normalize(title):
+    # Get rid of commas to avoid number issues
+    title = title.replace(",", "")
+    # Get rid of all non-alphanumerics and convert to lowercase
+    title = re.sub(r'[\W_]+', u' ', title, flags=re.UNICODE).lower()
+    # Some dlc have the word DLC in the name
+    return title.replace("dlc", "").replace("  ", " ")
+
+
+def variants(name):
+    # normalized name, with numbers written as roman numerals, and with roman numerals as numbers
+    roman = NUMBER_REGEX.sub(lambda match: write_roman(int(match.group(0))), name)
+    number = ROMAN_REGEX.sub(lambda match: write_num(match.group(0)), name)
+    return name, roman, number
+
+
+def keys(name):
+    # exactly the same, words are the same but different order, typo in target
+    return name, " ".join(sorted(set(name.split(" ")))), "".join(sorted(name.replace(" ", "")))
+
+
+# match tiers, lower is better
+EXACT, WORDS, ANAGRAM, VARIANT, SUBSTRING, SUBSET = range(6)
+
+
+class TitleMatcher:
+    # the target's keys are built once, then each result title is normalized once
+
+    def __init__(self, game_name):
+        self.name = normalize(game_name)
+        self.exact, self.words, self.letters = keys(self.name)
+        self.name_words = self.name.split(" ")
+        # Check for Roman numeral variant if posted with number
+        _, self.roman, self.number = variants(self.name)
+        variant_keys = [keys(self.roman), keys(self.number)]
+        self.variant_exact, self.variant_words, self.variant_letters = (set(kind) for kind in zip(*variant_keys))
+        self.roman_words = self.roman.split(" ")
+        self.number_words = self.number.split(" ")
+        # target or a numeral variant of it as part of a longer title
+        self.substrings = [name for name in (self.name, self.roman, self.number) if "random" not in name]
+
+    def tier(self, title, below=SUBSET + 1, substring=False, subset=False):
+        # best tier of the title, None when it does not match or is not better than below
+        title = normalize(title)
+        if title == self.exact:
+            return EXACT
+        title_words = title.split(" ")
+        words = " ".join(sorted(set(title_words)))
+        if below > WORDS and words == self.words:
+            return WORDS
+        if below <= ANAGRAM:
+            return None
+        letters = "".join(sorted(title.replace(" ", "")))
+        if letters == self.letters:
+            return ANAGRAM
+        if below > VARIANT and (title in self.variant_exact or words in self.variant_words or letters in self.variant_letters):
+            return VARIANT
+        if below > SUBSTRING and substring and any(name in title for name in self.substrings):
+            return SUBSTRING
+        if below > SUBSET and subset and self.contains(title, len(title_words)):
+            return SUBSET
+        return None
+
+    def contains(self, title, word_count):
+        # target fully in the result, or all target words, one word may be missing from target
+        if word_count <= len(self.name_words) + 1:
+            if self.name in title or all(x in title for x in self.name_words):
+                return True
+        if word_count <= len(self.roman_words) + 1:
+            return (
+                self.roman in title
+                or all(x in title for x in self.roman_words)
+                or self.number in title
+                or all(x in title for x in self.number_words)
+            )
+        return False
+
+    def best(self, results, substring=False, subset=False):
+        # results are (title, value) in relevance order, value of the first one in the best tier
+        best = None
+        best_tier = SUBSET + 1
+        for title, value in results:
+            tier = self.tier(title, best_tier, substring, subset)
+            if tier is not None:
+                best, best_tier = value, tier
+                if tier == EXACT:
+                    break
+        return best
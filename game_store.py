@@ -0,0 +1,209 @@
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import game_cache
+import rate_limit
+from game_info import GameInfo
+from single_flight import SingleFlight
+
+STORE_PATH = os.getenv("RSGIB_GAME_STORE", "gameinfo.db")
+STORE_SIZE = int(os.getenv("RSGIB_GAME_STORE_SIZE", "20000"))
+
+# (soft ttl, hard ttl) in seconds, stale entries are served until the hard ttl
+# while they are refreshed in the background
+TTL = {
+    # never older than its price and discount, the slow fields stay in the field cache so a refetch is mostly appdetails
+    "SteamGame": (game_cache.FAST_TTL - 60, game_cache.FAST_TTL),
+    # archived pages hardly ever change
+    "SteamRemovedGame": (14 * 24 * 60 * 60, 90 * 24 * 60 * 60),
+}
+
+
+class GameStore:
+
+    def __init__(self, path=STORE_PATH, maxsize=STORE_SIZE):
+        self.maxsize = maxsize
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS games ("
+            "kind TEXT NOT NULL, appid TEXT NOT NULL, snapshot REAL NOT NULL, fields TEXT NOT NULL, "
+            "PRIMARY KEY (kind, appid))")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS games_snapshot ON games (snapshot)")
+        self.connection.commit()
+        self.refreshing = set()
+        self.flights = SingleFlight()
+        self.refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="refresh")
+
+    def get(self, cls, appid):
+        kind = cls.__name__
+        soft_ttl, hard_ttl = TTL[kind]
+        entry = self.load(kind, appid)
+        if entry is not None:
+            snapshot, game = entry
+            age = time.time() - snapshot
+            if age < soft_ttl:
+                return game
+            if age < hard_ttl:
+                # serve stale now, refresh for the next lookup
+                self.refresh(cls, appid)
+                return game
+        return self.fetch(cls, appid)
+
+    def contains(self, cls, appid):
+        # True when get answers from the store without fetching
+        entry = self.load(cls.__name__, appid)
+        return entry is not None and time.time() - entry[0] < TTL[cls.__name__][1]
+
+    def fetch(self, cls, appid):
+        # concurrent lookups of the same appid share one fetch
+        return self.flights.do((cls.__name__, appid), self.fetchsave, cls, appid)
+
+    def fetchsave(self, cls, appid):
+        game = GameInfo.fromgame(cls(appid))
+        # degraded lookups are not stored, the next one fetches everything again
+        if isinstance(game.title, str) and not game.degraded:
+            self.save(game)
+        return game
+
+    def refresh(self, cls, appid):
+        key = (cls.__name__, appid)
+        with self.lock:
+            if key in self.refreshing:
+                return
+            self.refreshing.add(key)
+
+        def run():
+            try:
+                with rate_limit.priority(rate_limit.PRIORITY_BACKGROUND):
+                    self.fetch(cls, appid)
+            finally:
+                with self.lock:
+                    self.refreshing.discard(key)
+
+        self.refresh_executor.submit(run)
+
+    def load(self, kind, appid):
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT snapshot, fields FROM games WHERE kind = ? AND appid = ?", (kind, appid)).fetchone()
+        if row is None:
+            return None
+        try:
+            return row[0], GameInfo.loads(row[1])
+        except ValueError:
+            # written by an older version, fetched again
+            return None
+
+    def save(self, game):
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO games (kind, appid, snapshot, fields) VALUES (?, ?, ?, ?)",
+                (game.kind, game.appID, time.time(), game.dumps()))
+            self.evict()
+            self.connection.commit()
+
+    def evict(self):
+        count = self.connection.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+        if count > self.maxsize:
+            # drop the oldest snapshots
+            self.connection.execute(
+                "DELETE FROM games WHERE rowid IN (SELECT rowid FROM games ORDER BY snapshot LIMIT ?)",
+                (count - self.maxsize,))
+
+    def entries(self, kind=None, limit=20):
+        query = "SELECT kind, appid, snapshot FROM games"
+        params = ()
+        if kind is not None:
+            query += " WHERE kind = ?"
+            params = (kind,)
+        query += " ORDER BY snapshot DESC LIMIT ?"
+        with self.lock:
+            return self.connection.execute(query, params + (limit,)).fetchall()
+
+    def purge(self, kind=None, appid=None, older_than=None):
+        query = "DELETE FROM games WHERE 1 = 1"
+        params = []
+        if kind is not None:
+            query += " AND kind = ?"
+            params.append(kind)
+        if appid is not None:
+            query += " AND appid = ?"
+            params.append(appid)
+        if older_than is not None:
+            query += " AND snapshot < ?"
+            params.append(time.time() - older_than)
+        with self.lock:
+            deleted = self.connection.execute(query, params).rowcount
+            self.connection.commit()
+        return deleted
+
+    def stats(self):
+        with self.lock:
+            return self.connection.execute(
+                "SELECT kind, COUNT(*), MIN(snapshot), MAX(snapshot) FROM games GROUP BY kind").fetchall()
+
+
+store = None
+store_lock = threading.Lock()
+
+
+def shared():
+    global store
+    with store_lock:
+        if store is None:
+            store = GameStore()
+    return store
+
+
+def get(cls, appid):
+    return shared().get(cls, appid)
+
+
+def contains(cls, appid):
+    return shared().contains(cls, appid)
+
+
+def format_age(snapshot):
+    return str(int(time.time() - snapshot)) + "s ago"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or purge the game info store")
+    parser.add_argument("--path", default=STORE_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats")
+    list_parser = commands.add_parser("list")
+    list_parser.add_argument("--kind", choices=TTL.keys())
+    list_parser.add_argument("--limit", type=int, default=20)
+    show_parser = commands.add_parser("show")
+    show_parser.add_argument("appid")
+    show_parser.add_argument("--kind", choices=TTL.keys(), default="SteamGame")
+    purge_parser = commands.add_parser("purge")
+    purge_parser.add_argument("appid", nargs="?")
+    purge_parser.add_argument("--kind", choices=TTL.keys())
+    purge_parser.add_argument("--older-than", type=int, help="seconds")
+    args = parser.parse_args()
+
+    game_store = GameStore(args.path)
+    if args.command == "stats":
+        for kind, count, oldest, newest in game_store.stats():
+            print(kind + ": " + str(count) + " entries, newest " + format_age(newest) + ", oldest " + format_age(oldest))
+    elif args.command == "list":
+        for kind, appid, snapshot in game_store.entries(args.kind, args.limit):
+            print(kind + " " + appid + " " + format_age(snapshot))
+    elif args.command == "show":
+        entry = game_store.load(args.kind, args.appid)
+        if entry is None:
+            print("Not in store")
+        else:
+            print("Snapshot " + format_age(entry[0]))
+            print(json.dumps(entry[1].snapshot(), indent=2))
+    elif args.command == "purge":
+        print("Deleted " + str(game_store.purge(args.kind, args.appid, args.older_than)) + " entries")
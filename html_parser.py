@@ -0,0 +1,32 @@
+import os
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# "html.parser", or "lxml" or "html5lib" when installed, lxml is the fastest
+PARSER = os.getenv("RSGIB_HTML_PARSER", "html.parser")
+
+# the parts of each page type that are read, pages without one are parsed whole
+STRAINERS = {
+    "search": SoupStrainer("div", id="search_result_container"),
+    "steamtracker": SoupStrainer("a"),
+    "removedtable": SoupStrainer("tr", attrs={"data-type": "app"}),
+    "keyhub": SoupStrainer("span", class_="friendPlayerLevelNum"),
+}
+
+# fail at startup when the parser is not installed
+BeautifulSoup("", PARSER)
+
+
+def parse(markup, page=None):
+    return BeautifulSoup(markup, PARSER, parse_only=STRAINERS.get(page))
+
+
+def empty():
+    return BeautifulSoup("", PARSER)
+
+
+def free(page):
+    # BeautifulSoup.decompose does not walk the tree, the nodes would wait for the cycle collector
+    for child in list(page.contents):
+        child.decompose()
+    page.decompose()
@@ -0,0 +1,117 @@
+import codecs
+import os
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+
+import rate_limit
+import retry
+
+CONNECT_TIMEOUT = float(os.getenv("RSGIB_CONNECT_TIMEOUT", "5"))
+POOL_HOSTS = int(os.getenv("RSGIB_POOL_HOSTS", "16"))
+POOL_SIZE = int(os.getenv("RSGIB_POOL_SIZE", "16"))
+THROTTLE_RETRIES = int(os.getenv("RSGIB_THROTTLE_RETRIES", "2"))
+# streamed pages are cut off after this many bytes
+MAX_PAGE_BYTES = int(os.getenv("RSGIB_MAX_PAGE_BYTES", str(2 * 1024 * 1024)))
+CHUNK_SIZE = 64 * 1024
+# characters of the text before a chunk searched again with it, longer than a marker split between two chunks
+MARKER_OVERLAP = 4 * 1024
+
+# sent with every store page request so age gated games show their page
+AGE_CHECK_COOKIES = {
+    "birthtime": "640584001",
+    "lastagecheckage": "20-April-1990",
+    "mature_content": "1",
+}
+
+
+def build_session():
+    session = requests.Session()
+    # one pool per host, connections are kept alive between requests
+    adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_SIZE, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # gzip/deflate, and br when brotli is installed
+    session.headers.update(make_headers(accept_encoding=True))
+    session.headers["Connection"] = "keep-alive"
+    for name, value in AGE_CHECK_COOKIES.items():
+        session.cookies.set(name, value, domain="store.steampowered.com")
+    return session
+
+
+session = build_session()
+
+
+def get(url, timeout=30, policy=retry.DEFAULT_POLICY, **kwargs):
+    breaker = retry.breaker_for(url)
+    attempt = 0
+    throttles = 0
+    while True:
+        # raises HostUnavailable while the host is failing
+        breaker.check()
+        rate_limit.acquire(url)
+        try:
+            # short connect timeout so a dead host fails fast, read timeout per caller
+            response = session.get(url, timeout=(CONNECT_TIMEOUT, timeout), **kwargs)
+        except requests.exceptions.RequestException:
+            breaker.failure()
+            attempt += 1
+            if attempt >= policy.attempts:
+                raise
+            time.sleep(policy.backoff(attempt))
+            continue
+        if rate_limit.throttled(response):
+            # neither a success nor a failure, a half-open breaker must not wait for an outcome forever
+            breaker.release()
+            response.close()
+            if throttles >= THROTTLE_RETRIES:
+                # not a page, callers take their fallback like for an unreachable host
+                raise retry.HostUnavailable(breaker.host + " is still rate limiting, not retrying")
+            throttles += 1
+            rate_limit.pause(url, response)
+            continue
+        if response.status_code in retry.RETRY_STATUS:
+            breaker.failure()
+            attempt += 1
+            if attempt < policy.attempts:
+                response.close()
+                time.sleep(policy.backoff(attempt))
+                continue
+            return response
+        breaker.success()
+        return response
+
+
+def get_text(url, until=None, max_bytes=MAX_PAGE_BYTES, timeout=30, policy=retry.DEFAULT_POLICY, **kwargs):
+    # stream the page and stop reading once until matches, the rest is not needed
+    response = get(url, timeout=timeout, policy=policy, stream=True, **kwargs)
+    return read_text(response, until, max_bytes)
+
+
+def read_text(response, until=None, max_bytes=MAX_PAGE_BYTES):
+    decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+    # joined once at the end, only the new chunk and the end of the text before it are searched
+    parts = []
+    tail = ""
+    size = 0
+    try:
+        for chunk in response.iter_content(CHUNK_SIZE):
+            size += len(chunk)
+            part = decoder.decode(chunk)
+            parts.append(part)
+            if until is not None:
+                window = tail + part
+                if until.search(window):
+                    break
+                tail = window[-MARKER_OVERLAP:]
+            if size >= max_bytes:
+                print("Page larger than " + str(max_bytes) + " bytes, reading only the start: " + response.url)
+                break
+        else:
+            parts.append(decoder.decode(b"", final=True))
+    finally:
+        # drops the connection when the body was not read to the end
+        response.close()
+    return "".join(parts)
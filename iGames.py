@@ -1,9 +1,10 @@
 import os
-import time
 import json
 
 import requests
 
+import http_client
+
 
 class iGames:
 
@@ -15,17 +16,18 @@ class iGames:
             x_client_key = "micron"
         elif website == "igames":
             x_client_key = "igamesgg"
-        while True:
-            try:
-                if x_client_key != "":
-                    headers = {"X-Client-Key": x_client_key}
-                    igames_json = requests.get(api_url, headers=headers, timeout=10)
-                else:
-                    igames_json = requests.get(api_url, timeout=10)
-                break
-            except requests.exceptions.RequestException:
-                print("iGames API timeout: sleep for 10 seconds and try again")
-                time.sleep(10)
+        self.key_claimed = self.key_total = self.key_amount = None
+        self.gg_app = False
+        try:
+            if x_client_key != "":
+                headers = {"X-Client-Key": x_client_key}
+                igames_json = http_client.get(api_url, headers=headers, timeout=10)
+            else:
+                igames_json = http_client.get(api_url, timeout=10)
+        except requests.exceptions.RequestException:
+            # no key details, try again on the next update
+            print("iGames API unavailable: skipping key details")
+            return None
 
         if 'json' in igames_json.headers.get('Content-Type'):
             try:
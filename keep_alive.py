@@ -1,6 +1,8 @@
 from flask import Flask
 from threading import Thread
 
+import metrics
+
 app = Flask('')
 
 
@@ -9,6 +11,11 @@ def home():
     return "FGF Bot is Online!"
 
 
+@app.route('/metrics')
+def stats():
+    return metrics.snapshot()
+
+
 def run():
     app.run(host='0.0.0.0', port=8080)
 
@@ -3,8 +3,11 @@
 
 import os
 import re
+import signal
 import threading
 import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from humanfriendly import format_timespan
 
 import praw
@@ -13,10 +16,16 @@ from keep_alive import keep_alive
 
 from SteamGame import SteamGame
 from SteamRemovedGame import SteamRemovedGame
-from SteamSearchGame import SteamSearchGame
+from title_resolver import Resolution
 from AlienwareArena import AlienwareArena
 from iGames import iGames
 from Keyhub import Keyhub
+import budget
+import game_store
+import metrics
+import replied_store
+import stream_hub
+import work_pool
 
 BLOCKED_USER_FILE = 'blockedusers.txt'  # Will not reply to these people
 SUBLIST = "FreeGameFindings"
@@ -39,23 +48,45 @@ KEYHUB_URL_REGEX = r"((https?:\/\/)?)(key-hub.eu\/giveaway\/\d+)"
 GLEAMIO_URL_REGEX = r"http[s]?://(?:www\.)?gleam\.io"
 RANDOM_TITLE_REGEX = r"(Random).*(Game)"
 
+# reply with the appdetails first, then edit in the rest of the details
+TWO_PHASE_COMMENTS = os.getenv("RSGIB_TWO_PHASE_COMMENTS", "0") == "1"
+enrich_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="enrich")
+
+# submissions handled at the same time, and taken from the stream before it waits for a worker
+SUBMISSION_WORKERS = int(os.getenv("RSGIB_SUBMISSION_WORKERS", "4"))
+SUBMISSION_QUEUE = int(os.getenv("RSGIB_SUBMISSION_QUEUE", "50"))
+GIVEAWAY_URL_REGEXES = [
+    ALIENWARE_URL_REGEX, STEELSERIES_URL_REGEX, CRUCIAL_URL_REGEX, IGAMES_URL_REGEX, KEYHUB_URL_REGEX,
+]
+
 
 def fitscriteria(s):
     with open(BLOCKED_USER_FILE) as blocked_users:
         if s.author.name in blocked_users.read():
             return False
-    if hasbotalreadyreplied(s):
-        return False
-    if not hasbotalreadyreplied(s):
-        return True
-
-    return False
+    return not hasbotalreadyreplied(s)
 
 
 def hasbotalreadyreplied(s):
+    replied = replied_store.shared()
+    if replied.contains(s.fullname):
+        return True
+    if type(s).__name__ == "Comment":
+        if s.author == BOT_USERNAME:
+            return True
+        submission_title = str(s.submission.title)
+        megathread = submission_title.lower().replace(" ", "").find("megathread")
+        if megathread != -1:
+            # has not replied, but skip megathreads
+            replied.add(s.fullname, "skipped")
+            return True
+    if replied.covers(s.created_utc):
+        # replies since the store exists are in it, no need to ask Reddit
+        return False
     if type(s).__name__ == "Submission":
         for comment in s.comments:
             if comment.author == BOT_USERNAME:
+                replied.add(s.fullname)
                 return True
     elif type(s).__name__ == "Comment":
         comment = reddit.comment(s.id)
@@ -67,20 +98,20 @@ def hasbotalreadyreplied(s):
             except praw.exceptions.ClientException:
                 # ignore comment
                 return True
-        if comment.author == BOT_USERNAME:
-            return True
-        submission_title = str(comment.submission.title)
-        megathread = submission_title.lower().replace(" ", "").find("megathread")
-        if megathread != -1:
-            # has not replied, but skip megathreads
-            return True
         for reply in comment.replies:
             if reply.author == BOT_USERNAME:
+                replied.add(s.fullname)
                 return True
 
     return False
 
 
+def replyto(thing, commenttext):
+    reply = thing.reply(body=commenttext)
+    replied_store.shared().add(thing.fullname)
+    return reply
+
+
 def buildcommenttext_awa(g, source):
     commenttext = ''
     if source == "new":
@@ -182,24 +213,24 @@ def buildcommenttext(g, removed, source):
         commenttext += '\n'
         if (g.gettype == "dlc" or g.gettype == "mod") and g.basegame is not None:
             commenttext += '* '
-            if g.basegame[2] == "Free":
+            if g.basegame.price == "Free":
                 commenttext += 'Free'
             else:
                 commenttext += 'Paid'
-            commenttext += ' Base Game: **' + g.basegame[1] + '** - '
+            commenttext += ' Base Game: **' + g.basegame.title + '** - '
             if removed:
-                commenttext += '[Store Page (archived)](' + g.basegame[6]
+                commenttext += '[Store Page (archived)](' + g.basegame.url
             else:
-                commenttext += '[Store Page](https://store.steampowered.com/app/' + g.basegame[0]
-            commenttext += ') | [Community Hub](https://steamcommunity.com/app/' + g.basegame[0] + ') | [SteamDB](https://steamdb.info/app/' + g.basegame[0] + ')'
-            if g.basegame[6]:
-                commenttext += ' | [PCGamingWiki](https://www.pcgamingwiki.com/api/appid.php?appid=' + g.basegame[0] + ')'
+                commenttext += '[Store Page](https://store.steampowered.com/app/' + g.basegame.appid
+            commenttext += ') | [Community Hub](https://steamcommunity.com/app/' + g.basegame.appid + ') | [SteamDB](https://steamdb.info/app/' + g.basegame.appid + ')'
+            if g.basegame.pcgamingwiki:
+                commenttext += ' | [PCGamingWiki](https://www.pcgamingwiki.com/api/appid.php?appid=' + g.basegame.appid + ')'
             commenttext += '\n\n'
         elif g.gettype == "music" and g.basegame is not None:
             if removed:
-                commenttext += '* Base game ([' + g.basegame[1] + '](' + g.basegame[6] + ')) not required\n\n'
+                commenttext += '* Base game ([' + g.basegame.title + '](' + g.basegame.url + ')) not required\n\n'
             else:
-                commenttext += '* Base game ([' + g.basegame[1] + '](https://store.steampowered.com/app/' + g.basegame[0] + ')) not required\n\n'
+                commenttext += '* Base game ([' + g.basegame.title + '](https://store.steampowered.com/app/' + g.basegame.appid + ')) not required\n\n'
         else:
             commenttext += '\n'
         if not g.unreleased and (g.reviewsummary != "" or g.reviewdetails != ""):
@@ -230,7 +261,7 @@ def buildcommenttext(g, removed, source):
                 commenttext += '\n'
         if not removed and not (g.unreleased and g.price[0] == "No price found"):
             commenttext += ' * '
-            if g.gettype == "dlc" and g.price[0] == "Free" and g.price[1] == "" and g.basegame is not None and g.basegame[2] == "Free" and g.basegame[3] == "":
+            if g.gettype == "dlc" and g.price[0] == "Free" and g.price[1] == "" and g.basegame is not None and g.basegame.price == "Free" and g.basegame.fullprice == "":
                 commenttext += 'Game and '
             if g.gettype == "dlc":
                 commenttext += 'DLC '
@@ -245,15 +276,15 @@ def buildcommenttext(g, removed, source):
             if g.price[0] != "No price found" and g.price[1] != "" and g.discountamount:
                 commenttext += ' (' + g.discountamount + ')'
             commenttext += '\n'
-            if (g.gettype == "dlc" or g.gettype == "mod") and g.basegame is not None and len(g.basegame) > 2 and (g.price[0] != "Free" or g.price[1] != "" or g.basegame[3] != "" or g.basegame[2] != "Free"):
+            if (g.gettype == "dlc" or g.gettype == "mod") and g.basegame is not None and g.basegame.price is not None and (g.price[0] != "Free" or g.price[1] != "" or g.basegame.fullprice != "" or g.basegame.price != "Free"):
                 commenttext += ' * Game Price: '
-                if g.basegame[3] != "":
-                    commenttext += '~~' + g.basegame[3] + '~~ '
-                commenttext += g.basegame[2]
-                if not g.basegame[4] and g.basegame[2] != ("Free" and "No price found"):
+                if g.basegame.fullprice != "":
+                    commenttext += '~~' + g.basegame.fullprice + '~~ '
+                commenttext += g.basegame.price
+                if not g.basegame.free and g.basegame.price != ("Free" and "No price found"):
                     commenttext += ' USD'
-                if g.basegame[2] != "No price found" and g.basegame[3] != "" and g.basegame[5]:
-                    commenttext += ' (' + g.basegame[5] + ')'
+                if g.basegame.price != "No price found" and g.basegame.fullprice != "" and g.basegame.discount:
+                    commenttext += ' (' + g.basegame.discount + ')'
                 commenttext += '\n'
         if not g.unreleased and g.releasedate:
             commenttext += ' * '
@@ -278,41 +309,45 @@ def buildcommenttext(g, removed, source):
                     commenttext += ' * Has ' + str(g.achievements) + ' achievement\n'
                 if int(g.achievements) > 1:
                     commenttext += ' * Has ' + str(g.achievements) + ' achievements\n'
-                if len(g.cards) == 4 and g.cards[0] != 0:
-                    if int(g.achievements) == 0:
-                        commenttext += ' * Has no achievements\n'
-                    commenttext += ' * Has ' + str(g.cards[0]) + ' trading cards'
-                    if g.cards[1] != 0 and not g.isfree():
-                        commenttext += ' (drops ' + str(g.cards[1]) + ')'
-                    elif g.cards[1] != 0 and g.isfree():
-                        commenttext += ' (no drops)'
-                    if not g.cards[3]:
-                        commenttext += ' [non-marketable]'
-                    if g.cards[3]:
-                        commenttext += ' [^(view on Steam Market)](' + g.cards[2] + ')'
-                    commenttext += '\n'
-                if len(g.cards) == 3 and g.cards[0] != 0:
-                    if int(g.achievements) == 0:
-                        commenttext += ' * Has no achievements\n'
-                    commenttext += ' * Has trading cards'
-                    commenttext += ' [^(view on Steam Market)](' + g.cards[2] + ')'
-                    commenttext += '\n'
-                if g.cards[0] == 0:
-                    commenttext += ' * Has no trading cards'
-                    if int(g.achievements) == 0:
-                        commenttext += ' or achievements'
-                    commenttext += '\n'
-            if not g.unreleased and g.plusone:
-                commenttext += ' * Gives'
-            elif g.unreleased and g.plusone:
-                commenttext += ' * Full game license (no beta testing) will give'
-            else:
-                commenttext += ' * Does not give'
-            commenttext += ' +1 game count [^(what is +1?)](https://www.reddit.com/r/FreeGameFindings/wiki/faq/#wiki_what_is_.2B1.3F)\n'
-        if (g.isfree() or g.price[0] == "Free") and not g.unreleased and (source == "Steam" or g.gettype != "dlc" or (g.gettype == "dlc" and (g.isfree() or g.price[0] == "Free") and g.basegame is not None and len(g.basegame) > 2 and g.basegame[4])):
+                # left out when the market did not answer in time
+                if g.cards is not None:
+                    if g.cards.marketable is not None and g.cards.total != 0:
+                        if int(g.achievements) == 0:
+                            commenttext += ' * Has no achievements\n'
+                        commenttext += ' * Has ' + str(g.cards.total) + ' trading cards'
+                        if g.cards.drops != 0 and not g.isfree():
+                            commenttext += ' (drops ' + str(g.cards.drops) + ')'
+                        elif g.cards.drops != 0 and g.isfree():
+                            commenttext += ' (no drops)'
+                        if not g.cards.marketable:
+                            commenttext += ' [non-marketable]'
+                        if g.cards.marketable:
+                            commenttext += ' [^(view on Steam Market)](' + g.cards.marketurl + ')'
+                        commenttext += '\n'
+                    if g.cards.marketable is None and g.cards.total != 0:
+                        if int(g.achievements) == 0:
+                            commenttext += ' * Has no achievements\n'
+                        commenttext += ' * Has trading cards'
+                        commenttext += ' [^(view on Steam Market)](' + g.cards.marketurl + ')'
+                        commenttext += '\n'
+                    if g.cards.total == 0:
+                        commenttext += ' * Has no trading cards'
+                        if int(g.achievements) == 0:
+                            commenttext += ' or achievements'
+                        commenttext += '\n'
+            # not known yet in a preview
+            if g.plusone is not None:
+                if not g.unreleased and g.plusone:
+                    commenttext += ' * Gives'
+                elif g.unreleased and g.plusone:
+                    commenttext += ' * Full game license (no beta testing) will give'
+                else:
+                    commenttext += ' * Does not give'
+                commenttext += ' +1 game count [^(what is +1?)](https://www.reddit.com/r/FreeGameFindings/wiki/faq/#wiki_what_is_.2B1.3F)\n'
+        if (g.isfree() or g.price[0] == "Free") and not g.unreleased and (source == "Steam" or g.gettype != "dlc" or (g.gettype == "dlc" and (g.isfree() or g.price[0] == "Free") and g.basegame is not None and g.basegame.price is not None and g.basegame.free)):
             commenttext += ' * Can be added to ASF clients with `!addlicense asf '
-            if g.gettype == "dlc" and g.basegame is not None and len(g.basegame) > 2 and g.basegame[4]:
-                commenttext += "a/" + g.basegame[0] + ","
+            if g.gettype == "dlc" and g.basegame is not None and g.basegame.price is not None and g.basegame.free:
+                commenttext += "a/" + g.basegame.appid + ","
             commenttext += g.asf[0] + '`\n'
         commenttext += '\n***\n'
     return commenttext
@@ -324,6 +359,43 @@ def buildfootertext():
     return footertext
 
 
+def moderatesteampost(submission, commenttext, previoustext=""):
+    if "*(NSFW)*" in commenttext and "*(NSFW)*" not in previoustext and submission.over_18 is False:
+        # Set post as NSFW
+        submission.mod.nsfw()
+    if "* Paid Base Game:" in commenttext and "* Paid Base Game:" not in previoustext:
+        # Check for paid base game DLC
+        flair_text = submission.link_flair_text
+        if flair_text is None:
+            # if no flair exists
+            new_text = "Paid Base Game"
+            submission.mod.flair(text=new_text, css_class="BasePaid", flair_template_id="129ebd48-becd-11ed-9399-b250c43c4702")
+        elif "paid base game" not in flair_text.lower():
+            # if not yet in flair
+            flair_id = submission.link_flair_template_id
+            new_text = flair_text + " | Paid Base Game"
+            submission.mod.flair(text=new_text, flair_template_id=flair_id)
+
+
+def enrichcomment(reply, submission, appid, source_platform):
+    # edit the details that were left out into the comment
+    try:
+        commenttext = buildcommenttext(game_store.get(SteamGame, appid), False, source_platform)
+        if commenttext is not None and commenttext != "":
+            commenttext += buildfootertext()
+            previoustext = reply.body
+            if len(commenttext) < 10000 and commenttext != previoustext:
+                print('Completing comment ' + str(reply) + ' for game ' + appid)
+                reply.edit(body=commenttext)
+                moderatesteampost(submission, commenttext, previoustext)
+    except PrawcoreException:
+        print('Could not complete comment ' + str(reply))
+    except Exception:
+        # runs on the enrich pool, where nothing else would print what went wrong
+        print('Could not complete comment ' + str(reply))
+        traceback.print_exc()
+
+
 def repostwatch_title(title):
     repost_title_regex = r"[.;?!]$"
     if re.search(repost_title_regex, title):
@@ -353,487 +425,311 @@ def buildcommenttext_repost(submission):
     return commenttext
 
 
-class SubWatch(threading.Thread):
-    def run(self):
-        print('Started watching subs: ' + SUBLIST)
-        subreddit = reddit.subreddit(SUBLIST)
-        while True:
-            try:
-                for submission in subreddit.stream.submissions(skip_existing=True):
-                    if submission.banned_by is not None:
-                        continue
+def submissionlane(submission):
+    # giveaways run out of keys, they go before game details
+    for regex in GIVEAWAY_URL_REGEXES:
+        if re.search(regex, submission.url):
+            return work_pool.LANE_GIVEAWAY
+    return work_pool.LANE_GAME
+
+
+def handlesubmission(submission):
+    if submission.banned_by is not None:
+        return
+    if (
+        re.search(STEAM_APPURL_REGEX, submission.url)
+        or re.search(STEAMDB_APPURL_REGEX, submission.url)
+    ):
+        appid = re.search('\d+', submission.url).group(0)
+        source_platform = "Steam"
+        if fitscriteria(submission):
+            # optional details that take longer are left out of the comment, the budget starts after the Reddit checks
+            with budget.deadline():
+                if TWO_PHASE_COMMENTS and not game_store.contains(SteamGame, appid):
+                    g = SteamGame.preview(appid)
+                else:
+                    g = game_store.get(SteamGame, appid)
+                commenttext = buildcommenttext(g, False, source_platform)
+                if commenttext is not None and commenttext != "":
+                    commenttext += buildfootertext()
+                    if len(commenttext) < 10000:
+                        print('Commenting on post ' + str(submission) + ' after finding game ' + appid)
+                        reply = replyto(submission, commenttext)
+                        moderatesteampost(submission, commenttext)
+                        if TWO_PHASE_COMMENTS and getattr(g, "degraded", None):
+                            enrich_executor.submit(enrichcomment, reply, submission, appid, source_platform)
+    elif re.search(STEAM_TITLE_REGEX, submission.title, re.IGNORECASE):
+        title_split = re.split(STEAM_TITLE_REGEX, submission.title, flags=re.IGNORECASE)
+        game_name = title_split[-1].strip()
+        if fitscriteria(submission) and game_name != "":
+            with budget.deadline():
+                # the removed lists are searched while the store search runs
+                resolution = Resolution(game_name)
+                game = resolution.store
+                appid = game.appid
+                source_platform = "Steam"
+                commenttext = None
+                if appid != 0:
+                    commenttext = buildcommenttext(game_store.get(SteamGame, appid), False, source_platform)
+                if commenttext is not None and commenttext != "":
+                    commenttext_awa = ""
+                    if re.search(ALIENWARE_URL_REGEX, submission.url):
+                        commenttext_awa = buildcommenttext_awa(AlienwareArena(submission.url, "new"), "new")
+                    if commenttext_awa is not None and commenttext_awa != "":
+                        commenttext = commenttext_awa + commenttext
+                    commenttext_igames = ""
+                    g_website = "steelseries"
+                    if re.search(CRUCIAL_URL_REGEX, submission.url):
+                        g_website = "crucial"
+                    elif re.search(IGAMES_URL_REGEX, submission.url):
+                        g_website = "igames"
                     if (
-                        re.search(STEAM_APPURL_REGEX, submission.url)
-                        or re.search(STEAMDB_APPURL_REGEX, submission.url)
+                        re.search(STEELSERIES_URL_REGEX, submission.url)
+                        or re.search(CRUCIAL_URL_REGEX, submission.url)
+                        or re.search(IGAMES_URL_REGEX, submission.url)
                     ):
-                        appid = re.search('\d+', submission.url).group(0)
-                        source_platform = "Steam"
-                        if fitscriteria(submission):
-                            commenttext = buildcommenttext(SteamGame(appid), False, source_platform)
-                            if commenttext is not None and commenttext != "":
-                                commenttext += buildfootertext()
-                                if len(commenttext) < 10000:
-                                    print('Commenting on post ' + str(submission) + ' after finding game ' + appid)
-                                    submission.reply(body=commenttext)
-                                    if "*(NSFW)*" in commenttext and submission.over_18 is False:
-                                        # Set post as NSFW
-                                        submission.mod.nsfw()
-                                    if "* Paid Base Game:" in commenttext:
-                                        # Check for paid base game DLC
-                                        flair_text = submission.link_flair_text
+                        g_id = re.search('\d+', submission.url).group(0)
+                        commenttext_igames = buildcommenttext_igames(iGames(g_id, g_website), "new")
+                    if commenttext_igames is not None and commenttext_igames != "":
+                        commenttext = commenttext_igames + commenttext
+                    commenttext_keyhub = ""
+                    if re.search(KEYHUB_URL_REGEX, submission.url):
+                        commenttext_keyhub = buildcommenttext_keyhub(Keyhub(submission.url, "new"), "new")
+                    if commenttext_keyhub is not None and commenttext_keyhub != "":
+                        commenttext = commenttext_keyhub + commenttext
+                    commenttext += buildfootertext()
+                    if len(commenttext) < 10000:
+                        print('Commenting on post ' + str(submission) + ' after finding game ' + game_name)
+                        replyto(submission, commenttext)
+                        if commenttext_awa is not None and commenttext_awa != "":
+                            flair_text = submission.link_flair_text
+                            tier_number = commenttext_awa.split("Tier required: ")[1].split()[0]
+                            if "Tier required: 1" not in commenttext_awa and "* Keys available for all countries\n" not in commenttext_awa:
+                                # flair post with prior work required, regional issues and add tier
+                                if flair_text is None:
+                                    # if no flair exists
+                                    new_text = "Tier " + tier_number + "+ | Prior Work Required | Regional Issues"
+                                    submission.mod.flair(text=new_text, css_class="restoften", flair_template_id="b204d6b4-0b90-11e4-9095-12313b0add52")
+                                elif "prior work" not in flair_text.lower() and "regional" not in flair_text.lower():
+                                    # if not yet in flair
+                                    flair_id = submission.link_flair_template_id
+                                    new_text = "Tier " + tier_number + "+ | Prior Work Required | Regional Issues | " + flair_text
+                                    submission.mod.flair(text=new_text, flair_template_id=flair_id)
+                                elif "regional" not in flair_text.lower():
+                                    # if regional not yet in flair
+                                    flair_id = submission.link_flair_template_id
+                                    new_text = "Tier " + tier_number + "+ | Regional Issues | " + flair_text
+                                    submission.mod.flair(text=new_text, flair_template_id=flair_id)
+                            if "Tier required: 1" not in commenttext_awa and "* Keys available for all countries\n" in commenttext_awa:
+                                # flair post with prior work required and add tier
+                                if flair_text is None:
+                                    # if no flair exists
+                                    new_text = "Tier " + tier_number + "+ | Prior Work Required"
+                                    submission.mod.flair(text=new_text, css_class="restoften", flair_template_id="b204d6b4-0b90-11e4-9095-12313b0add52")
+                                elif "prior work" not in flair_text.lower():
+                                    # if not yet in flair
+                                    flair_id = submission.link_flair_template_id
+                                    new_text = "Tier " + tier_number + "+ | Prior Work Required | " + flair_text
+                                    submission.mod.flair(text=new_text, flair_template_id=flair_id)
+                            if "* Keys available for all countries\n" not in commenttext_awa and "Tier required: 1" in commenttext_awa:
+                                # flair post with regional issues
+                                if flair_text is None:
+                                    # if no flair exists
+                                    submission.mod.flair(text="Regional Issues", css_class="Regionlocked", flair_template_id="b3a089de-2437-11e6-8bda-0e93018c4773")
+                                elif "regional" not in flair_text.lower():
+                                    # if not yet in flair
+                                    flair_id = submission.link_flair_template_id
+                                    new_text = flair_text + " | Regional Issues"
+                                    submission.mod.flair(text=new_text, flair_template_id=flair_id)
+                        if commenttext_keyhub is not None and commenttext_keyhub != "":
+                            flair_text = submission.link_flair_text
+                            level_number = commenttext_keyhub.split("Steam level required: ")[1].split()[0]
+                            if flair_text is None:
+                                # if no flair exists
+                                new_text = "Steam level " + level_number + "+"
+                                submission.mod.flair(text=new_text, css_class="ReadComments", flair_template_id="c7e83006-e1b5-11e4-b507-22000b2681f9")
+                            elif "level" not in flair_text.lower():
+                                # if not yet in flair
+                                flair_id = submission.link_flair_template_id
+                                new_text = "Steam level " + level_number + "+ | " + flair_text
+                                submission.mod.flair(text=new_text, flair_template_id=flair_id)
+                        if "*(NSFW)*" in commenttext and submission.over_18 is False:
+                            # Set post as NSFW
+                            submission.mod.nsfw()
+                        if "* Paid Base Game:" in commenttext:
+                            # Check for paid base game DLC
+                            flair_text = submission.link_flair_text
+                            if flair_text is None:
+                                # if no flair exists
+                                new_text = "Paid Base Game"
+                                submission.mod.flair(text=new_text, css_class="BasePaid", flair_template_id="129ebd48-becd-11ed-9399-b250c43c4702")
+                            elif "paid base game" not in flair_text.lower():
+                                # if not yet in flair
+                                flair_id = submission.link_flair_template_id
+                                new_text = flair_text + " | Paid Base Game"
+                                submission.mod.flair(text=new_text, flair_template_id=flair_id)
+                else:
+                    # not in the store, or its store page is gone, e.g. a delisted app from the app index
+                    game = resolution.removed()
+                    appid = game.appid
+                    if appid != 0:
+                        # try for only removed store page
+                        commenttext = buildcommenttext(resolution.page(SteamGame, appid), False, source_platform)
+                        if commenttext is None or commenttext == "":
+                            # not available on Steam
+                            commenttext = buildcommenttext(resolution.page(SteamRemovedGame, appid), True, source_platform)
+                        if commenttext is not None and commenttext != "":
+                            commenttext_awa = ""
+                            if re.search(ALIENWARE_URL_REGEX, submission.url):
+                                commenttext_awa = buildcommenttext_awa(AlienwareArena(submission.url, "new"), "new")
+                            if commenttext_awa is not None and commenttext_awa != "":
+                                commenttext = commenttext_awa + commenttext
+                            commenttext_igames = ""
+                            g_website = "steelseries"
+                            if re.search(CRUCIAL_URL_REGEX, submission.url):
+                                g_website = "crucial"
+                            elif re.search(IGAMES_URL_REGEX, submission.url):
+                                g_website = "igames"
+                            if (
+                                re.search(STEELSERIES_URL_REGEX, submission.url)
+                                or re.search(CRUCIAL_URL_REGEX, submission.url)
+                                or re.search(IGAMES_URL_REGEX, submission.url)
+                            ):
+                                g_id = re.search('\d+', submission.url).group(0)
+                                commenttext_igames = buildcommenttext_igames(iGames(g_id, g_website), "new")
+                            if commenttext_igames is not None and commenttext_igames != "":
+                                commenttext = commenttext_igames + commenttext
+                            commenttext_keyhub = ""
+                            if re.search(KEYHUB_URL_REGEX, submission.url):
+                                commenttext_keyhub = buildcommenttext_keyhub(Keyhub(submission.url, "new"), "new")
+                            if commenttext_keyhub is not None and commenttext_keyhub != "":
+                                commenttext = commenttext_keyhub + commenttext
+                            commenttext += buildfootertext()
+                            if len(commenttext) < 10000:
+                                print('Commenting on post ' + str(submission) + ' after finding removed game ' + game_name)
+                                replyto(submission, commenttext)
+                                flair_text = submission.link_flair_text
+                                if commenttext.startswith("*Removed from Steam"):
+                                    if flair_text is None:
+                                        # flair post with delisted if no flair exists
+                                        submission.mod.flair(text="Delisted Game", css_class="DelistedGame", flair_template_id="9a5196c4-8865-11ec-8a1f-8261ed8ecd20")
+                                    elif "delisted" not in flair_text.lower():
+                                        # flair post with delisted if not yet in flair
+                                        flair_id = submission.link_flair_template_id
+                                        new_text = flair_text + " | Delisted Game"
+                                        submission.mod.flair(text=new_text, flair_template_id=flair_id)
+                                if commenttext_awa is not None and commenttext_awa != "":
+                                    tier_number = commenttext_awa.split("Tier required: ")[1].split()[0]
+                                    if "Tier required: 1" not in commenttext_awa and "* Keys available for all countries\n" not in commenttext_awa:
+                                        # flair post with prior work required, regional issues and add tier
                                         if flair_text is None:
                                             # if no flair exists
-                                            new_text = "Paid Base Game"
-                                            submission.mod.flair(text=new_text, css_class="BasePaid", flair_template_id="129ebd48-becd-11ed-9399-b250c43c4702")
-                                        elif "paid base game" not in flair_text.lower():
+                                            new_text = "Tier " + tier_number + "+ | Prior Work Required | Regional Issues"
+                                            submission.mod.flair(text=new_text, css_class="restoften", flair_template_id="b204d6b4-0b90-11e4-9095-12313b0add52")
+                                        elif "prior work" not in flair_text.lower() and "regional" not in flair_text.lower():
                                             # if not yet in flair
                                             flair_id = submission.link_flair_template_id
-                                            new_text = flair_text + " | Paid Base Game"
+                                            new_text = "Tier " + tier_number + "+ | Prior Work Required | Regional Issues" + flair_text
                                             submission.mod.flair(text=new_text, flair_template_id=flair_id)
-                    elif re.search(STEAM_TITLE_REGEX, submission.title, re.IGNORECASE):
-                        title_split = re.split(STEAM_TITLE_REGEX, submission.title, flags=re.IGNORECASE)
-                        game_name = title_split[-1].strip()
-                        if fitscriteria(submission) and game_name != "":
-                            game = SteamSearchGame(game_name, False)
-                            appid = game.appid
-                            source_platform = "Steam"
-                            if appid != 0:
-                                commenttext = buildcommenttext(SteamGame(appid), False, source_platform)
-                                if commenttext is not None and commenttext != "":
-                                    commenttext_awa = ""
-                                    if re.search(ALIENWARE_URL_REGEX, submission.url):
-                                        commenttext_awa = buildcommenttext_awa(AlienwareArena(submission.url, "new"), "new")
-                                    if commenttext_awa is not None and commenttext_awa != "":
-                                        commenttext = commenttext_awa + commenttext
-                                    commenttext_igames = ""
-                                    g_website = "steelseries"
-                                    if re.search(CRUCIAL_URL_REGEX, submission.url):
-                                        g_website = "crucial"
-                                    elif re.search(IGAMES_URL_REGEX, submission.url):
-                                        g_website = "igames"
-                                    if (
-                                        re.search(STEELSERIES_URL_REGEX, submission.url)
-                                        or re.search(CRUCIAL_URL_REGEX, submission.url)
-                                        or re.search(IGAMES_URL_REGEX, submission.url)
-                                    ):
-                                        g_id = re.search('\d+', submission.url).group(0)
-                                        commenttext_igames = buildcommenttext_igames(iGames(g_id, g_website), "new")
-                                    if commenttext_igames is not None and commenttext_igames != "":
-                                        commenttext = commenttext_igames + commenttext
-                                    commenttext_keyhub = ""
-                                    if re.search(KEYHUB_URL_REGEX, submission.url):
-                                        commenttext_keyhub = buildcommenttext_keyhub(Keyhub(submission.url, "new"), "new")
-                                    if commenttext_keyhub is not None and commenttext_keyhub != "":
-                                        commenttext = commenttext_keyhub + commenttext
-                                    commenttext += buildfootertext()
-                                    if len(commenttext) < 10000:
-                                        print('Commenting on post ' + str(submission) + ' after finding game ' + game_name)
-                                        submission.reply(body=commenttext)
-                                        if commenttext_awa is not None and commenttext_awa != "":
-                                            flair_text = submission.link_flair_text
-                                            tier_number = commenttext_awa.split("Tier required: ")[1].split()[0]
-                                            if "Tier required: 1" not in commenttext_awa and "* Keys available for all countries\n" not in commenttext_awa:
-                                                # flair post with prior work required, regional issues and add tier
-                                                if flair_text is None:
-                                                    # if no flair exists
-                                                    new_text = "Tier " + tier_number + "+ | Prior Work Required | Regional Issues"
-                                                    submission.mod.flair(text=new_text, css_class="restoften", flair_template_id="b204d6b4-0b90-11e4-9095-12313b0add52")
-                                                elif "prior work" not in flair_text.lower() and "regional" not in flair_text.lower():
-                                                    # if not yet in flair
-                                                    flair_id = submission.link_flair_template_id
-                                                    new_text = "Tier " + tier_number + "+ | Prior Work Required | Regional Issues | " + flair_text
-                                                    submission.mod.flair(text=new_text, flair_template_id=flair_id)
-                                                elif "regional" not in flair_text.lower():
-                                                    # if regional not yet in flair
-                                                    flair_id = submission.link_flair_template_id
-                                                    new_text = "Tier " + tier_number + "+ | Regional Issues | " + flair_text
-                                                    submission.mod.flair(text=new_text, flair_template_id=flair_id)
-                                            if "Tier required: 1" not in commenttext_awa and "* Keys available for all countries\n" in commenttext_awa:
-                                                # flair post with prior work required and add tier
-                                                if flair_text is None:
-                                                    # if no flair exists
-                                                    new_text = "Tier " + tier_number + "+ | Prior Work Required"
-                                                    submission.mod.flair(text=new_text, css_class="restoften", flair_template_id="b204d6b4-0b90-11e4-9095-12313b0add52")
-                                                elif "prior work" not in flair_text.lower():
-                                                    # if not yet in flair
-                                                    flair_id = submission.link_flair_template_id
-                                                    new_text = "Tier " + tier_number + "+ | Prior Work Required | " + flair_text
-                                                    submission.mod.flair(text=new_text, flair_template_id=flair_id)
-                                            if "* Keys available for all countries\n" not in commenttext_awa and "Tier required: 1" in commenttext_awa:
-                                                # flair post with regional issues
-                                                if flair_text is None:
-                                                    # if no flair exists
-                                                    submission.mod.flair(text="Regional Issues", css_class="Regionlocked", flair_template_id="b3a089de-2437-11e6-8bda-0e93018c4773")
-                                                elif "regional" not in flair_text.lower():
-                                                    # if not yet in flair
-                                                    flair_id = submission.link_flair_template_id
-                                                    new_text = flair_text + " | Regional Issues"
-                                                    submission.mod.flair(text=new_text, flair_template_id=flair_id)
-                                        if commenttext_keyhub is not None and commenttext_keyhub != "":
-                                            flair_text = submission.link_flair_text
-                                            level_number = commenttext_keyhub.split("Steam level required: ")[1].split()[0]
-                                            if flair_text is None:
-                                                # if no flair exists
-                                                new_text = "Steam level " + level_number + "+"
-                                                submission.mod.flair(text=new_text, css_class="ReadComments", flair_template_id="c7e83006-e1b5-11e4-b507-22000b2681f9")
-                                            elif "level" not in flair_text.lower():
-                                                # if not yet in flair
-                                                flair_id = submission.link_flair_template_id
-                                                new_text = "Steam level " + level_number + "+ | " + flair_text
-                                                submission.mod.flair(text=new_text, flair_template_id=flair_id)
-                                        if "*(NSFW)*" in commenttext and submission.over_18 is False:
-                                            # Set post as NSFW
-                                            submission.mod.nsfw()
-                                        if "* Paid Base Game:" in commenttext:
-                                            # Check for paid base game DLC
-                                            flair_text = submission.link_flair_text
-                                            if flair_text is None:
-                                                # if no flair exists
-                                                new_text = "Paid Base Game"
-                                                submission.mod.flair(text=new_text, css_class="BasePaid", flair_template_id="129ebd48-becd-11ed-9399-b250c43c4702")
-                                            elif "paid base game" not in flair_text.lower():
-                                                # if not yet in flair
-                                                flair_id = submission.link_flair_template_id
-                                                new_text = flair_text + " | Paid Base Game"
-                                                submission.mod.flair(text=new_text, flair_template_id=flair_id)
-                            else:
-                                game = SteamSearchGame(game_name, True)
-                                appid = game.appid
-                                if appid != 0:
-                                    # try for only removed store page
-                                    commenttext = buildcommenttext(SteamGame(appid), False, source_platform)
-                                    if commenttext is None or commenttext == "":
-                                        # not available on Steam
-                                        commenttext = buildcommenttext(SteamRemovedGame(appid), True, source_platform)
-                                    if commenttext is not None and commenttext != "":
-                                        commenttext_awa = ""
-                                        if re.search(ALIENWARE_URL_REGEX, submission.url):
-                                            commenttext_awa = buildcommenttext_awa(AlienwareArena(submission.url, "new"), "new")
-                                        if commenttext_awa is not None and commenttext_awa != "":
-                                            commenttext = commenttext_awa + commenttext
-                                        commenttext_igames = ""
-                                        g_website = "steelseries"
-                                        if re.search(CRUCIAL_URL_REGEX, submission.url):
-                                            g_website = "crucial"
-                                        elif re.search(IGAMES_URL_REGEX, submission.url):
-                                            g_website = "igames"
-                                        if (
-                                            re.search(STEELSERIES_URL_REGEX, submission.url)
-                                            or re.search(CRUCIAL_URL_REGEX, submission.url)
-                                            or re.search(IGAMES_URL_REGEX, submission.url)
-                                        ):
-                                            g_id = re.search('\d+', submission.url).group(0)
-                                            commenttext_igames = buildcommenttext_igames(iGames(g_id, g_website), "new")
-                                        if commenttext_igames is not None and commenttext_igames != "":
-                                            commenttext = commenttext_igames + commenttext
-                                        commenttext_keyhub = ""
-                                        if re.search(KEYHUB_URL_REGEX, submission.url):
-                                            commenttext_keyhub = buildcommenttext_keyhub(Keyhub(submission.url, "new"), "new")
-                                        if commenttext_keyhub is not None and commenttext_keyhub != "":
-                                            commenttext = commenttext_keyhub + commenttext
-                                        commenttext += buildfootertext()
-                                        if len(commenttext) < 10000:
-                                            print('Commenting on post ' + str(submission) + ' after finding removed game ' + game_name)
-                                            submission.reply(body=commenttext)
-                                            flair_text = submission.link_flair_text
-                                            if commenttext.startswith("*Removed from Steam"):
-                                                if flair_text is None:
-                                                    # flair post with delisted if no flair exists
-                                                    submission.mod.flair(text="Delisted Game", css_class="DelistedGame", flair_template_id="9a5196c4-8865-11ec-8a1f-8261ed8ecd20")
-                                                elif "delisted" not in flair_text.lower():
-                                                    # flair post with delisted if not yet in flair
-                                                    flair_id = submission.link_flair_template_id
-                                                    new_text = flair_text + " | Delisted Game"
-                                                    submission.mod.flair(text=new_text, flair_template_id=flair_id)
-                                            if commenttext_awa is not None and commenttext_awa != "":
-                                                tier_number = commenttext_awa.split("Tier required: ")[1].split()[0]
-                                                if "Tier required: 1" not in commenttext_awa and "* Keys available for all countries\n" not in commenttext_awa:
-                                                    # flair post with prior work required, regional issues and add tier
-                                                    if flair_text is None:
-                                                        # if no flair exists
-                                                        new_text = "Tier " + tier_number + "+ | Prior Work Required | Regional Issues"
-                                                        submission.mod.flair(text=new_text, css_class="restoften", flair_template_id="b204d6b4-0b90-11e4-9095-12313b0add52")
-                                                    elif "prior work" not in flair_text.lower() and "regional" not in flair_text.lower():
-                                                        # if not yet in flair
-                                                        flair_id = submission.link_flair_template_id
-                                                        new_text = "Tier " + tier_number + "+ | Prior Work Required | Regional Issues" + flair_text
-                                                        submission.mod.flair(text=new_text, flair_template_id=flair_id)
-                                                    elif "regional" not in flair_text.lower():
-                                                        # if regional not yet in flair
-                                                        flair_id = submission.link_flair_template_id
-                                                        new_text = "Tier " + tier_number + "+ | Regional Issues | " + flair_text
-                                                        submission.mod.flair(text=new_text, flair_template_id=flair_id)
-                                                if "Tier required: 1" not in commenttext_awa and "* Keys available for all countries\n" in commenttext_awa:
-                                                    # flair post with prior work required and add tier
-                                                    if flair_text is None:
-                                                        # if no flair exists
-                                                        new_text = "Tier " + tier_number + "+ | Prior Work Required"
-                                                        submission.mod.flair(text=new_text, css_class="restoften", flair_template_id="b204d6b4-0b90-11e4-9095-12313b0add52")
-                                                    elif "prior work" not in flair_text.lower():
-                                                        # if not yet in flair
-                                                        flair_id = submission.link_flair_template_id
-                                                        new_text = "Tier " + tier_number + "+ | Prior Work Required | " + flair_text
-                                                        submission.mod.flair(text=new_text, flair_template_id=flair_id)
-                                                if "* Keys available for all countries\n" not in commenttext_awa and "Tier required: 1" in commenttext_awa:
-                                                    # flair post with regional issues
-                                                    if flair_text is None:
-                                                        # if no flair exists
-                                                        submission.mod.flair(text="Regional Issues", css_class="Regionlocked", flair_template_id="b3a089de-2437-11e6-8bda-0e93018c4773")
-                                                    elif "regional" not in flair_text.lower():
-                                                        # if not yet in flair
-                                                        flair_id = submission.link_flair_template_id
-                                                        new_text = flair_text + " | Regional Issues"
-                                                        submission.mod.flair(text=new_text, flair_template_id=flair_id)
-                                            if commenttext_keyhub is not None and commenttext_keyhub != "":
-                                                flair_text = submission.link_flair_text
-                                                level_number = commenttext_keyhub.split("Steam level required: ")[1].split()[0]
-                                                if flair_text is None:
-                                                    # if no flair exists
-                                                    new_text = "Steam level " + level_number + "+"
-                                                    submission.mod.flair(text=new_text, css_class="ReadComments", flair_template_id="c7e83006-e1b5-11e4-b507-22000b2681f9")
-                                                elif "level" not in flair_text.lower():
-                                                    # if not yet in flair
-                                                    flair_id = submission.link_flair_template_id
-                                                    new_text = "Steam level " + level_number + "+ | " + flair_text
-                                                    submission.mod.flair(text=new_text, flair_template_id=flair_id)
-                                            if "*(NSFW)*" in commenttext and submission.over_18 is False:
-                                                # Set post as NSFW
-                                                submission.mod.nsfw()
-                                            if "* Paid Base Game:" in commenttext:
-                                                # Check for paid base game DLC
-                                                flair_text = submission.link_flair_text
-                                                if flair_text is None:
-                                                    # if no flair exists
-                                                    new_text = "Paid Base Game"
-                                                    submission.mod.flair(text=new_text, css_class="BasePaid", flair_template_id="129ebd48-becd-11ed-9399-b250c43c4702")
-                                                elif "paid base game" not in flair_text.lower():
-                                                    # if not yet in flair
-                                                    flair_id = submission.link_flair_template_id
-                                                    new_text = flair_text + " | Paid Base Game"
-                                                    submission.mod.flair(text=new_text, flair_template_id=flair_id)
-                                    elif (
-                                        re.search(STEELSERIES_URL_REGEX, submission.url)
-                                        or re.search(CRUCIAL_URL_REGEX, submission.url)
-                                        or re.search(IGAMES_URL_REGEX, submission.url)
-                                        or re.search(ALIENWARE_URL_REGEX, submission.url)
-                                        or re.search(KEYHUB_URL_REGEX, submission.url)
-                                    ):
-                                        # Not found on archive.org, post steamdb and key availability part
-                                        commenttext += '*Removed from Steam, no information found on archive.org*\n\n'
-                                        commenttext += '**' + game_name +'**\n\n'
-                                        commenttext += '[Community Hub](https://steamcommunity.com/app/' + game.appid + ') | '
-                                        commenttext += '[SteamDB](https://steamdb.info/app/' + game.appid + ')\n\n***\n'
-                                        g_website = "steelseries"
-                                        if re.search(CRUCIAL_URL_REGEX, submission.url):
-                                            g_website = "crucial"
-                                        elif re.search(IGAMES_URL_REGEX, submission.url):
-                                            g_website = "igames"
-                                        if (
-                                            re.search(STEELSERIES_URL_REGEX, submission.url)
-                                            or re.search(CRUCIAL_URL_REGEX, submission.url)
-                                            or re.search(IGAMES_URL_REGEX, submission.url)
-                                        ):
-                                            g_id = re.search('\d+', submission.url).group(0)
-                                            commenttext = buildcommenttext_igames(iGames(g_id, g_website), "new")
-                                        if re.search(ALIENWARE_URL_REGEX, submission.url):
-                                            g_website = "alienware"
-                                            commenttext = buildcommenttext_awa(AlienwareArena(submission.url, "new"), "new")
-                                        if re.search(KEYHUB_URL_REGEX, submission.url):
-                                            g_website = "keyhub"
-                                            commenttext = buildcommenttext_keyhub(Keyhub(submission.url, "new"), "new")
-                                        if commenttext is not None and commenttext != "":
-                                            commenttext += buildfootertext()
-                                            if len(commenttext) < 10000:
-                                                print('Commenting on post ' + str(submission) + ' after finding ' + g_website + ' domain')
-                                                submission.reply(body=commenttext)
-                                                flair_text = submission.link_flair_text
-                                                if commenttext.startswith("*Removed from Steam"):
-                                                    if flair_text is None:
-                                                        # flair post with delisted if no flair exists
-                                                        submission.mod.flair(text="Delisted Game", css_class="DelistedGame", flair_template_id="9a5196c4-8865-11ec-8a1f-8261ed8ecd20")
-                                                    elif "delisted" not in flair_text.lower():
-                                                        # flair post with delisted if not yet in flair
-                                                        flair_id = submission.link_flair_template_id
-                                                        new_text = flair_text + " | Delisted Game"
-                                                        submission.mod.flair(text=new_text, flair_template_id=flair_id)
-                                                if g_website == "alienware" and commenttext is not None and commenttext != "":
-                                                    tier_number = commenttext.split("Tier required: ")[1].split()[0]
-                                                    if "Tier required: 1" not in commenttext and "* Keys available for all countries\n" not in commenttext:
-                                                        # flair post with prior work required, regional issues and add tier
-                                                        if flair_text is None:
-                                                            # if no flair exists
-                                                            new_text = "Tier " + tier_number + "+ | Prior Work Required | Regional Issues"
-                                                            submission.mod.flair(text=new_text, css_class="restoften", flair_template_id="b204d6b4-0b90-11e4-9095-12313b0add52")
-                                                        elif "prior work" not in flair_text.lower() and "regional" not in flair_text.lower():
-                                                            # if not yet in flair
-                                                            flair_id = submission.link_flair_template_id
-                                                            new_text = "Tier " + tier_number + "+ | Prior Work Required | Regional Issues" + flair_text
-                                                            submission.mod.flair(text=new_text, flair_template_id=flair_id)
-                                                        elif "regional" not in flair_text.lower():
-                                                            # if regional not yet in flair
-                                                            flair_id = submission.link_flair_template_id
-                                                            new_text = "Tier " + tier_number + "+ | Regional Issues | " + flair_text
-                                                            submission.mod.flair(text=new_text, flair_template_id=flair_id)
-                                                    if "Tier required: 1" not in commenttext and "* Keys available for all countries\n" in commenttext:
-                                                        # flair post with prior work required and add tier
-                                                        if flair_text is None:
-                                                            # if no flair exists
-                                                            new_text = "Tier " + tier_number + "+ | Prior Work Required"
-                                                            submission.mod.flair(text=new_text, css_class="restoften", flair_template_id="b204d6b4-0b90-11e4-9095-12313b0add52")
-                                                        elif "prior work" not in flair_text.lower():
-                                                            # if not yet in flair
-                                                            flair_id = submission.link_flair_template_id
-                                                            new_text = "Tier " + tier_number + "+ | Prior Work Required | " + flair_text
-                                                            submission.mod.flair(text=new_text, flair_template_id=flair_id)
-                                                    if "* Keys available for all countries\n" not in commenttext and "Tier required: 1" in commenttext:
-                                                        # flair post with regional issues
-                                                        if flair_text is None:
-                                                            # if no flair exists
-                                                            submission.mod.flair(text="Regional Issues", css_class="Regionlocked", flair_template_id="b3a089de-2437-11e6-8bda-0e93018c4773")
-                                                        elif "regional" not in flair_text.lower():
-                                                            # if not yet in flair
-                                                            flair_id = submission.link_flair_template_id
-                                                            new_text = flair_text + " | Regional Issues"
-                                                            submission.mod.flair(text=new_text, flair_template_id=flair_id)
-                                                if g_website == "keyhub" and commenttext is not None and commenttext != "":
-                                                    flair_text = submission.link_flair_text
-                                                    level_number = commenttext.split("Steam level required: ")[1].split()[0]
-                                                    if flair_text is None:
-                                                        # if no flair exists
-                                                        new_text = "Steam level " + level_number + "+"
-                                                        submission.mod.flair(text=new_text, css_class="ReadComments", flair_template_id="c7e83006-e1b5-11e4-b507-22000b2681f9")
-                                                    elif "level" not in flair_text.lower():
-                                                        # if not yet in flair
-                                                        flair_id = submission.link_flair_template_id
-                                                        new_text = "Steam level " + level_number + "+ | " + flair_text
-                                                        submission.mod.flair(text=new_text, flair_template_id=flair_id)
-                                                if "*(NSFW)*" in commenttext and submission.over_18 is False:
-                                                    # Set post as NSFW
-                                                    submission.mod.nsfw()
-                                elif (
-                                    re.search(STEELSERIES_URL_REGEX, submission.url)
-                                    or re.search(CRUCIAL_URL_REGEX, submission.url)
-                                    or re.search(IGAMES_URL_REGEX, submission.url)
-                                    or re.search(ALIENWARE_URL_REGEX, submission.url)
-                                    or re.search(KEYHUB_URL_REGEX, submission.url)
-                                ):
-                                    # Not found on steam-tracker, still post key availability part
-                                    g_website = "steelseries"
-                                    if re.search(CRUCIAL_URL_REGEX, submission.url):
-                                        g_website = "crucial"
-                                    elif re.search(IGAMES_URL_REGEX, submission.url):
-                                        g_website = "igames"
-                                    if (
-                                        re.search(STEELSERIES_URL_REGEX, submission.url)
-                                        or re.search(CRUCIAL_URL_REGEX, submission.url)
-                                        or re.search(IGAMES_URL_REGEX, submission.url)
-                                    ):
-                                        g_id = re.search('\d+', submission.url).group(0)
-                                        commenttext = buildcommenttext_igames(iGames(g_id, g_website), "new")
-                                    if re.search(ALIENWARE_URL_REGEX, submission.url):
-                                        g_website = "alienware"
-                                        commenttext = buildcommenttext_awa(AlienwareArena(submission.url, "new"), "new")
-                                    if re.search(KEYHUB_URL_REGEX, submission.url):
-                                        g_website = "keyhub"
-                                        commenttext = buildcommenttext_keyhub(Keyhub(submission.url, "new"), "new")
-                                    if commenttext is not None and commenttext != "":
-                                        commenttext += buildfootertext()
-                                        if len(commenttext) < 10000:
-                                            print('Commenting on post ' + str(submission) + ' after finding ' + g_website + ' domain')
-                                            submission.reply(body=commenttext)
-                                            flair_text = submission.link_flair_text
-                                            if g_website == "alienware" and commenttext is not None and commenttext != "":
-                                                tier_number = commenttext.split("Tier required: ")[1].split()[0]
-                                                if "Tier required: 1" not in commenttext and "* Keys available for all countries\n" not in commenttext:
-                                                    # flair post with prior work required, regional issues and add tier
-                                                    if flair_text is None:
-                                                        # if no flair exists
-                                                        new_text = "Tier " + tier_number + "+ | Prior Work Required | Regional Issues"
-                                                        submission.mod.flair(text=new_text, css_class="restoften", flair_template_id="b204d6b4-0b90-11e4-9095-12313b0add52")
-                                                    elif "prior work" not in flair_text.lower() and "regional" not in flair_text.lower():
-                                                        # if not yet in flair
-                                                        flair_id = submission.link_flair_template_id
-                                                        new_text = "Tier " + tier_number + "+ | Prior Work Required | Regional Issues" + flair_text
-                                                        submission.mod.flair(text=new_text, flair_template_id=flair_id)
-                                                    elif "regional" not in flair_text.lower():
-                                                        # if regional not yet in flair
-                                                        flair_id = submission.link_flair_template_id
-                                                        new_text = "Tier " + tier_number + "+ | Regional Issues | " + flair_text
-                                                        submission.mod.flair(text=new_text, flair_template_id=flair_id)
-                                                if "Tier required: 1" not in commenttext and "* Keys available for all countries\n" in commenttext:
-                                                    # flair post with prior work required and add tier
-                                                    if flair_text is None:
-                                                        # if no flair exists
-                                                        new_text = "Tier " + tier_number + "+ | Prior Work Required"
-                                                        submission.mod.flair(text=new_text, css_class="restoften", flair_template_id="b204d6b4-0b90-11e4-9095-12313b0add52")
-                                                    elif "prior work" not in flair_text.lower():
-                                                        # if not yet in flair
-                                                        flair_id = submission.link_flair_template_id
-                                                        new_text = "Tier " + tier_number + "+ | Prior Work Required | " + flair_text
-                                                        submission.mod.flair(text=new_text, flair_template_id=flair_id)
-                                                if "* Keys available for all countries\n" not in commenttext and "Tier required: 1" in commenttext:
-                                                    # flair post with regional issues
-                                                    if flair_text is None:
-                                                        # if no flair exists
-                                                        submission.mod.flair(text="Regional Issues", css_class="Regionlocked", flair_template_id="b3a089de-2437-11e6-8bda-0e93018c4773")
-                                                    elif "regional" not in flair_text.lower():
-                                                        # if not yet in flair
-                                                        flair_id = submission.link_flair_template_id
-                                                        new_text = flair_text + " | Regional Issues"
-                                                        submission.mod.flair(text=new_text, flair_template_id=flair_id)
-                                            if g_website == "keyhub" and commenttext is not None and commenttext != "":
-                                                flair_text = submission.link_flair_text
-                                                level_number = commenttext.split("Steam level required: ")[1].split()[0]
-                                                if flair_text is None:
-                                                    # if no flair exists
-                                                    new_text = "Steam level " + level_number + "+"
-                                                    submission.mod.flair(text=new_text, css_class="ReadComments", flair_template_id="c7e83006-e1b5-11e4-b507-22000b2681f9")
-                                                elif "level" not in flair_text.lower():
-                                                    # if not yet in flair
-                                                    flair_id = submission.link_flair_template_id
-                                                    new_text = "Steam level " + level_number + "+ | " + flair_text
-                                                    submission.mod.flair(text=new_text, flair_template_id=flair_id)
-                                            if "*(NSFW)*" in commenttext and submission.over_18 is False:
-                                                # Set post as NSFW
-                                                submission.mod.nsfw()
-                    elif (
-                        (indiegala := re.search(INDIEGALA_TITLE_REGEX, submission.title, re.IGNORECASE)
-                            and re.search(INDIEGALA_URL_REGEX, submission.url))
-                        or (epic := re.search(EPIC_TITLE_REGEX, submission.title, re.IGNORECASE)
-                            and re.search(EPIC_URL_REGEX, submission.url))
-                    ):
-                        if indiegala is not None:
-                            title_split = re.split(INDIEGALA_TITLE_REGEX, submission.title, flags=re.IGNORECASE)
-                            source_platform = "Indiegala"
-                        elif epic is not None:
-                            title_split = re.split(EPIC_TITLE_REGEX, submission.title, flags=re.IGNORECASE)
-                            source_platform = "Epic"
-                        game_name = title_split[-1].strip()
-                        if fitscriteria(submission) and game_name != "":
-                            game = SteamSearchGame(game_name, False, "non-Steam")
-                            if game.appid == 0:
-                                game = SteamSearchGame(game_name, True, "non-Steam")
-                            appid = game.appid
-                            if appid != 0:
-                                commenttext = buildcommenttext(SteamGame(appid), False, source_platform)
-                                if commenttext is not None and commenttext != "":
-                                    commenttext += buildfootertext()
-                                    if len(commenttext) < 10000:
-                                        print('Commenting on post ' + str(submission) + ' after finding game ' + game_name)
-                                        submission.reply(body=commenttext)
-                                        if "*(NSFW)*" in commenttext and submission.over_18 is False:
-                                            # Set post as NSFW
-                                            submission.mod.nsfw()
-                    elif re.search(ALIENWARE_URL_REGEX, submission.url):
-                        if fitscriteria(submission):
-                            commenttext = buildcommenttext_awa(AlienwareArena(submission.url, "new"), "new")
+                                        elif "regional" not in flair_text.lower():
+                                            # if regional not yet in flair
+                                            flair_id = submission.link_flair_template_id
+                                            new_text = "Tier " + tier_number + "+ | Regional Issues | " + flair_text
+                                            submission.mod.flair(text=new_text, flair_template_id=flair_id)
+                                    if "Tier required: 1" not in commenttext_awa and "* Keys available for all countries\n" in commenttext_awa:
+                                        # flair post with prior work required and add tier
+                                        if flair_text is None:
+                                            # if no flair exists
+                                            new_text = "Tier " + tier_number + "+ | Prior Work Required"
+                                            submission.mod.flair(text=new_text, css_class="restoften", flair_template_id="b204d6b4-0b90-11e4-9095-12313b0add52")
+                                        elif "prior work" not in flair_text.lower():
+                                            # if not yet in flair
+                                            flair_id = submission.link_flair_template_id
+                                            new_text = "Tier " + tier_number + "+ | Prior Work Required | " + flair_text
+                                            submission.mod.flair(text=new_text, flair_template_id=flair_id)
+                                    if "* Keys available for all countries\n" not in commenttext_awa and "Tier required: 1" in commenttext_awa:
+                                        # flair post with regional issues
+                                        if flair_text is None:
+                                            # if no flair exists
+                                            submission.mod.flair(text="Regional Issues", css_class="Regionlocked", flair_template_id="b3a089de-2437-11e6-8bda-0e93018c4773")
+                                        elif "regional" not in flair_text.lower():
+                                            # if not yet in flair
+                                            flair_id = submission.link_flair_template_id
+                                            new_text = flair_text + " | Regional Issues"
+                                            submission.mod.flair(text=new_text, flair_template_id=flair_id)
+                                if commenttext_keyhub is not None and commenttext_keyhub != "":
+                                    flair_text = submission.link_flair_text
+                                    level_number = commenttext_keyhub.split("Steam level required: ")[1].split()[0]
+                                    if flair_text is None:
+                                        # if no flair exists
+                                        new_text = "Steam level " + level_number + "+"
+                                        submission.mod.flair(text=new_text, css_class="ReadComments", flair_template_id="c7e83006-e1b5-11e4-b507-22000b2681f9")
+                                    elif "level" not in flair_text.lower():
+                                        # if not yet in flair
+                                        flair_id = submission.link_flair_template_id
+                                        new_text = "Steam level " + level_number + "+ | " + flair_text
+                                        submission.mod.flair(text=new_text, flair_template_id=flair_id)
+                                if "*(NSFW)*" in commenttext and submission.over_18 is False:
+                                    # Set post as NSFW
+                                    submission.mod.nsfw()
+                                if "* Paid Base Game:" in commenttext:
+                                    # Check for paid base game DLC
+                                    flair_text = submission.link_flair_text
+                                    if flair_text is None:
+                                        # if no flair exists
+                                        new_text = "Paid Base Game"
+                                        submission.mod.flair(text=new_text, css_class="BasePaid", flair_template_id="129ebd48-becd-11ed-9399-b250c43c4702")
+                                    elif "paid base game" not in flair_text.lower():
+                                        # if not yet in flair
+                                        flair_id = submission.link_flair_template_id
+                                        new_text = flair_text + " | Paid Base Game"
+                                        submission.mod.flair(text=new_text, flair_template_id=flair_id)
+                        elif (
+                            re.search(STEELSERIES_URL_REGEX, submission.url)
+                            or re.search(CRUCIAL_URL_REGEX, submission.url)
+                            or re.search(IGAMES_URL_REGEX, submission.url)
+                            or re.search(ALIENWARE_URL_REGEX, submission.url)
+                            or re.search(KEYHUB_URL_REGEX, submission.url)
+                        ):
+                            # Not found on archive.org, post steamdb and key availability part
+                            commenttext += '*Removed from Steam, no information found on archive.org*\n\n'
+                            commenttext += '**' + game_name +'**\n\n'
+                            commenttext += '[Community Hub](https://steamcommunity.com/app/' + game.appid + ') | '
+                            commenttext += '[SteamDB](https://steamdb.info/app/' + game.appid + ')\n\n***\n'
+                            g_website = "steelseries"
+                            if re.search(CRUCIAL_URL_REGEX, submission.url):
+                                g_website = "crucial"
+                            elif re.search(IGAMES_URL_REGEX, submission.url):
+                                g_website = "igames"
+                            if (
+                                re.search(STEELSERIES_URL_REGEX, submission.url)
+                                or re.search(CRUCIAL_URL_REGEX, submission.url)
+                                or re.search(IGAMES_URL_REGEX, submission.url)
+                            ):
+                                g_id = re.search('\d+', submission.url).group(0)
+                                commenttext = buildcommenttext_igames(iGames(g_id, g_website), "new")
+                            if re.search(ALIENWARE_URL_REGEX, submission.url):
+                                g_website = "alienware"
+                                commenttext = buildcommenttext_awa(AlienwareArena(submission.url, "new"), "new")
+                            if re.search(KEYHUB_URL_REGEX, submission.url):
+                                g_website = "keyhub"
+                                commenttext = buildcommenttext_keyhub(Keyhub(submission.url, "new"), "new")
                             if commenttext is not None and commenttext != "":
                                 commenttext += buildfootertext()
                                 if len(commenttext) < 10000:
-                                    print('Commenting on post ' + str(submission) + ' after finding Alienware Arena domain')
-                                    submission.reply(body=commenttext)
+                                    print('Commenting on post ' + str(submission) + ' after finding ' + g_website + ' domain')
+                                    replyto(submission, commenttext)
                                     flair_text = submission.link_flair_text
-                                    if commenttext != "":
+                                    if commenttext.startswith("*Removed from Steam"):
+                                        if flair_text is None:
+                                            # flair post with delisted if no flair exists
+                                            submission.mod.flair(text="Delisted Game", css_class="DelistedGame", flair_template_id="9a5196c4-8865-11ec-8a1f-8261ed8ecd20")
+                                        elif "delisted" not in flair_text.lower():
+                                            # flair post with delisted if not yet in flair
+                                            flair_id = submission.link_flair_template_id
+                                            new_text = flair_text + " | Delisted Game"
+                                            submission.mod.flair(text=new_text, flair_template_id=flair_id)
+                                    if g_website == "alienware" and commenttext is not None and commenttext != "":
                                         tier_number = commenttext.split("Tier required: ")[1].split()[0]
                                         if "Tier required: 1" not in commenttext and "* Keys available for all countries\n" not in commenttext:
                                             # flair post with prior work required, regional issues and add tier
@@ -872,99 +768,361 @@ class SubWatch(threading.Thread):
                                                 flair_id = submission.link_flair_template_id
                                                 new_text = flair_text + " | Regional Issues"
                                                 submission.mod.flair(text=new_text, flair_template_id=flair_id)
+                                    if g_website == "keyhub" and commenttext is not None and commenttext != "":
+                                        flair_text = submission.link_flair_text
+                                        level_number = commenttext.split("Steam level required: ")[1].split()[0]
+                                        if flair_text is None:
+                                            # if no flair exists
+                                            new_text = "Steam level " + level_number + "+"
+                                            submission.mod.flair(text=new_text, css_class="ReadComments", flair_template_id="c7e83006-e1b5-11e4-b507-22000b2681f9")
+                                        elif "level" not in flair_text.lower():
+                                            # if not yet in flair
+                                            flair_id = submission.link_flair_template_id
+                                            new_text = "Steam level " + level_number + "+ | " + flair_text
+                                            submission.mod.flair(text=new_text, flair_template_id=flair_id)
+                                    if "*(NSFW)*" in commenttext and submission.over_18 is False:
+                                        # Set post as NSFW
+                                        submission.mod.nsfw()
                     elif (
                         re.search(STEELSERIES_URL_REGEX, submission.url)
                         or re.search(CRUCIAL_URL_REGEX, submission.url)
                         or re.search(IGAMES_URL_REGEX, submission.url)
+                        or re.search(ALIENWARE_URL_REGEX, submission.url)
+                        or re.search(KEYHUB_URL_REGEX, submission.url)
                     ):
-                        if fitscriteria(submission):
-                            g_website = "steelseries"
-                            if re.search(CRUCIAL_URL_REGEX, submission.url):
-                                g_website = "crucial"
-                            elif re.search(IGAMES_URL_REGEX, submission.url):
-                                g_website = "igames"
+                        # Not found on steam-tracker, still post key availability part
+                        g_website = "steelseries"
+                        if re.search(CRUCIAL_URL_REGEX, submission.url):
+                            g_website = "crucial"
+                        elif re.search(IGAMES_URL_REGEX, submission.url):
+                            g_website = "igames"
+                        if (
+                            re.search(STEELSERIES_URL_REGEX, submission.url)
+                            or re.search(CRUCIAL_URL_REGEX, submission.url)
+                            or re.search(IGAMES_URL_REGEX, submission.url)
+                        ):
                             g_id = re.search('\d+', submission.url).group(0)
                             commenttext = buildcommenttext_igames(iGames(g_id, g_website), "new")
-                            if commenttext is not None and commenttext != "":
-                                commenttext += buildfootertext()
-                                if len(commenttext) < 10000:
-                                    print('Commenting on post ' + str(submission) + ' after finding ' + g_website + ' domain')
-                                    submission.reply(body=commenttext)
-                    elif re.search(KEYHUB_URL_REGEX, submission.url):
-                        if fitscriteria(submission):
+                        if re.search(ALIENWARE_URL_REGEX, submission.url):
+                            g_website = "alienware"
+                            commenttext = buildcommenttext_awa(AlienwareArena(submission.url, "new"), "new")
+                        if re.search(KEYHUB_URL_REGEX, submission.url):
+                            g_website = "keyhub"
                             commenttext = buildcommenttext_keyhub(Keyhub(submission.url, "new"), "new")
-                            if commenttext is not None and commenttext != "":
-                                commenttext += buildfootertext()
-                                if len(commenttext) < 10000:
-                                    print('Commenting on post ' + str(submission) + ' after finding Keyhub domain')
-                                    submission.reply(body=commenttext)
-                                    if commenttext is not None and commenttext != "":
-                                        flair_text = submission.link_flair_text
-                                        level_number = commenttext.split("Steam level required: ")[1].split()[0]
+                        if commenttext is not None and commenttext != "":
+                            commenttext += buildfootertext()
+                            if len(commenttext) < 10000:
+                                print('Commenting on post ' + str(submission) + ' after finding ' + g_website + ' domain')
+                                replyto(submission, commenttext)
+                                flair_text = submission.link_flair_text
+                                if g_website == "alienware" and commenttext is not None and commenttext != "":
+                                    tier_number = commenttext.split("Tier required: ")[1].split()[0]
+                                    if "Tier required: 1" not in commenttext and "* Keys available for all countries\n" not in commenttext:
+                                        # flair post with prior work required, regional issues and add tier
                                         if flair_text is None:
                                             # if no flair exists
-                                            new_text = "Steam level " + level_number + "+"
-                                            submission.mod.flair(text=new_text, css_class="ReadComments", flair_template_id="c7e83006-e1b5-11e4-b507-22000b2681f9")
-                                        elif "level" not in flair_text.lower():
+                                            new_text = "Tier " + tier_number + "+ | Prior Work Required | Regional Issues"
+                                            submission.mod.flair(text=new_text, css_class="restoften", flair_template_id="b204d6b4-0b90-11e4-9095-12313b0add52")
+                                        elif "prior work" not in flair_text.lower() and "regional" not in flair_text.lower():
                                             # if not yet in flair
                                             flair_id = submission.link_flair_template_id
-                                            new_text = "Steam level " + level_number + "+ | " + flair_text
+                                            new_text = "Tier " + tier_number + "+ | Prior Work Required | Regional Issues" + flair_text
+                                            submission.mod.flair(text=new_text, flair_template_id=flair_id)
+                                        elif "regional" not in flair_text.lower():
+                                            # if regional not yet in flair
+                                            flair_id = submission.link_flair_template_id
+                                            new_text = "Tier " + tier_number + "+ | Regional Issues | " + flair_text
                                             submission.mod.flair(text=new_text, flair_template_id=flair_id)
-                    if re.search(RANDOM_TITLE_REGEX, submission.title, re.IGNORECASE):
+                                    if "Tier required: 1" not in commenttext and "* Keys available for all countries\n" in commenttext:
+                                        # flair post with prior work required and add tier
+                                        if flair_text is None:
+                                            # if no flair exists
+                                            new_text = "Tier " + tier_number + "+ | Prior Work Required"
+                                            submission.mod.flair(text=new_text, css_class="restoften", flair_template_id="b204d6b4-0b90-11e4-9095-12313b0add52")
+                                        elif "prior work" not in flair_text.lower():
+                                            # if not yet in flair
+                                            flair_id = submission.link_flair_template_id
+                                            new_text = "Tier " + tier_number + "+ | Prior Work Required | " + flair_text
+                                            submission.mod.flair(text=new_text, flair_template_id=flair_id)
+                                    if "* Keys available for all countries\n" not in commenttext and "Tier required: 1" in commenttext:
+                                        # flair post with regional issues
+                                        if flair_text is None:
+                                            # if no flair exists
+                                            submission.mod.flair(text="Regional Issues", css_class="Regionlocked", flair_template_id="b3a089de-2437-11e6-8bda-0e93018c4773")
+                                        elif "regional" not in flair_text.lower():
+                                            # if not yet in flair
+                                            flair_id = submission.link_flair_template_id
+                                            new_text = flair_text + " | Regional Issues"
+                                            submission.mod.flair(text=new_text, flair_template_id=flair_id)
+                                if g_website == "keyhub" and commenttext is not None and commenttext != "":
+                                    flair_text = submission.link_flair_text
+                                    level_number = commenttext.split("Steam level required: ")[1].split()[0]
+                                    if flair_text is None:
+                                        # if no flair exists
+                                        new_text = "Steam level " + level_number + "+"
+                                        submission.mod.flair(text=new_text, css_class="ReadComments", flair_template_id="c7e83006-e1b5-11e4-b507-22000b2681f9")
+                                    elif "level" not in flair_text.lower():
+                                        # if not yet in flair
+                                        flair_id = submission.link_flair_template_id
+                                        new_text = "Steam level " + level_number + "+ | " + flair_text
+                                        submission.mod.flair(text=new_text, flair_template_id=flair_id)
+                                if "*(NSFW)*" in commenttext and submission.over_18 is False:
+                                    # Set post as NSFW
+                                    submission.mod.nsfw()
+    elif (
+        (indiegala := re.search(INDIEGALA_TITLE_REGEX, submission.title, re.IGNORECASE)
+            and re.search(INDIEGALA_URL_REGEX, submission.url))
+        or (epic := re.search(EPIC_TITLE_REGEX, submission.title, re.IGNORECASE)
+            and re.search(EPIC_URL_REGEX, submission.url))
+    ):
+        if indiegala is not None:
+            title_split = re.split(INDIEGALA_TITLE_REGEX, submission.title, flags=re.IGNORECASE)
+            source_platform = "Indiegala"
+        elif epic is not None:
+            title_split = re.split(EPIC_TITLE_REGEX, submission.title, flags=re.IGNORECASE)
+            source_platform = "Epic"
+        game_name = title_split[-1].strip()
+        if fitscriteria(submission) and game_name != "":
+            with budget.deadline():
+                resolution = Resolution(game_name, "non-Steam")
+                game = resolution.store
+                if game.appid == 0:
+                    game = resolution.removed()
+                appid = game.appid
+                if appid != 0:
+                    commenttext = buildcommenttext(resolution.page(SteamGame, appid), False, source_platform)
+                    if commenttext is not None and commenttext != "":
+                        commenttext += buildfootertext()
+                        if len(commenttext) < 10000:
+                            print('Commenting on post ' + str(submission) + ' after finding game ' + game_name)
+                            replyto(submission, commenttext)
+                            if "*(NSFW)*" in commenttext and submission.over_18 is False:
+                                # Set post as NSFW
+                                submission.mod.nsfw()
+    elif re.search(ALIENWARE_URL_REGEX, submission.url):
+        if fitscriteria(submission):
+            commenttext = buildcommenttext_awa(AlienwareArena(submission.url, "new"), "new")
+            if commenttext is not None and commenttext != "":
+                commenttext += buildfootertext()
+                if len(commenttext) < 10000:
+                    print('Commenting on post ' + str(submission) + ' after finding Alienware Arena domain')
+                    replyto(submission, commenttext)
+                    flair_text = submission.link_flair_text
+                    if commenttext != "":
+                        tier_number = commenttext.split("Tier required: ")[1].split()[0]
+                        if "Tier required: 1" not in commenttext and "* Keys available for all countries\n" not in commenttext:
+                            # flair post with prior work required, regional issues and add tier
+                            if flair_text is None:
+                                # if no flair exists
+                                new_text = "Tier " + tier_number + "+ | Prior Work Required | Regional Issues"
+                                submission.mod.flair(text=new_text, css_class="restoften", flair_template_id="b204d6b4-0b90-11e4-9095-12313b0add52")
+                            elif "prior work" not in flair_text.lower() and "regional" not in flair_text.lower():
+                                # if not yet in flair
+                                flair_id = submission.link_flair_template_id
+                                new_text = "Tier " + tier_number + "+ | Prior Work Required | Regional Issues" + flair_text
+                                submission.mod.flair(text=new_text, flair_template_id=flair_id)
+                            elif "regional" not in flair_text.lower():
+                                # if regional not yet in flair
+                                flair_id = submission.link_flair_template_id
+                                new_text = "Tier " + tier_number + "+ | Regional Issues | " + flair_text
+                                submission.mod.flair(text=new_text, flair_template_id=flair_id)
+                        if "Tier required: 1" not in commenttext and "* Keys available for all countries\n" in commenttext:
+                            # flair post with prior work required and add tier
+                            if flair_text is None:
+                                # if no flair exists
+                                new_text = "Tier " + tier_number + "+ | Prior Work Required"
+                                submission.mod.flair(text=new_text, css_class="restoften", flair_template_id="b204d6b4-0b90-11e4-9095-12313b0add52")
+                            elif "prior work" not in flair_text.lower():
+                                # if not yet in flair
+                                flair_id = submission.link_flair_template_id
+                                new_text = "Tier " + tier_number + "+ | Prior Work Required | " + flair_text
+                                submission.mod.flair(text=new_text, flair_template_id=flair_id)
+                        if "* Keys available for all countries\n" not in commenttext and "Tier required: 1" in commenttext:
+                            # flair post with regional issues
+                            if flair_text is None:
+                                # if no flair exists
+                                submission.mod.flair(text="Regional Issues", css_class="Regionlocked", flair_template_id="b3a089de-2437-11e6-8bda-0e93018c4773")
+                            elif "regional" not in flair_text.lower():
+                                # if not yet in flair
+                                flair_id = submission.link_flair_template_id
+                                new_text = flair_text + " | Regional Issues"
+                                submission.mod.flair(text=new_text, flair_template_id=flair_id)
+    elif (
+        re.search(STEELSERIES_URL_REGEX, submission.url)
+        or re.search(CRUCIAL_URL_REGEX, submission.url)
+        or re.search(IGAMES_URL_REGEX, submission.url)
+    ):
+        if fitscriteria(submission):
+            g_website = "steelseries"
+            if re.search(CRUCIAL_URL_REGEX, submission.url):
+                g_website = "crucial"
+            elif re.search(IGAMES_URL_REGEX, submission.url):
+                g_website = "igames"
+            g_id = re.search('\d+', submission.url).group(0)
+            commenttext = buildcommenttext_igames(iGames(g_id, g_website), "new")
+            if commenttext is not None and commenttext != "":
+                commenttext += buildfootertext()
+                if len(commenttext) < 10000:
+                    print('Commenting on post ' + str(submission) + ' after finding ' + g_website + ' domain')
+                    replyto(submission, commenttext)
+    elif re.search(KEYHUB_URL_REGEX, submission.url):
+        if fitscriteria(submission):
+            commenttext = buildcommenttext_keyhub(Keyhub(submission.url, "new"), "new")
+            if commenttext is not None and commenttext != "":
+                commenttext += buildfootertext()
+                if len(commenttext) < 10000:
+                    print('Commenting on post ' + str(submission) + ' after finding Keyhub domain')
+                    replyto(submission, commenttext)
+                    if commenttext is not None and commenttext != "":
                         flair_text = submission.link_flair_text
+                        level_number = commenttext.split("Steam level required: ")[1].split()[0]
                         if flair_text is None:
                             # if no flair exists
-                            new_text = "Random"
-                            submission.mod.flair(text=new_text, css_class="itchio", flair_template_id="2e9be5ce-8121-11ec-97f5-ae0ba3b1ee73")
-                        elif "random" not in flair_text.lower():
+                            new_text = "Steam level " + level_number + "+"
+                            submission.mod.flair(text=new_text, css_class="ReadComments", flair_template_id="c7e83006-e1b5-11e4-b507-22000b2681f9")
+                        elif "level" not in flair_text.lower():
                             # if not yet in flair
                             flair_id = submission.link_flair_template_id
-                            new_text = flair_text + " | Random"
+                            new_text = "Steam level " + level_number + "+ | " + flair_text
                             submission.mod.flair(text=new_text, flair_template_id=flair_id)
-            except PrawcoreException:
-                print('Trying to reach Reddit')
-                time.sleep(30)
+    if re.search(RANDOM_TITLE_REGEX, submission.title, re.IGNORECASE):
+        flair_text = submission.link_flair_text
+        if flair_text is None:
+            # if no flair exists
+            new_text = "Random"
+            submission.mod.flair(text=new_text, css_class="itchio", flair_template_id="2e9be5ce-8121-11ec-97f5-ae0ba3b1ee73")
+        elif "random" not in flair_text.lower():
+            # if not yet in flair
+            flair_id = submission.link_flair_template_id
+            new_text = flair_text + " | Random"
+            submission.mod.flair(text=new_text, flair_template_id=flair_id)
 
 
-class CommentWatch(threading.Thread):
-    def run(self):
-        print('Watching all comments on: ' + SUBLIST)
-        while True:
-            try:
-                for comment in reddit.subreddit(SUBLIST).stream.comments(skip_existing=True):
-                    if comment.banned_by is not None:
-                        continue
-                    test_comment_gleamio = re.search(GLEAMIO_URL_REGEX, comment.body)
-                    test_comment_steam = re.search(STEAM_APPURL_REGEX, comment.body)
-                    if test_comment_gleamio:
-                        if comment.approved_by is None:
-                            comment.mod.approve()
-                    if test_comment_steam and fitscriteria(comment):
-                        games = []
-                        urlregex = re.finditer(STEAM_APPURL_REGEX, comment.body)
-                        for url in urlregex:
-                            games.append(url.group(0))
-                        # remove duplicates
-                        games = list(dict.fromkeys(games))
-                        appids = []
-                        commenttext = ""
-                        source_platform = "Steam"
-                        if not re.search(STEAM_PLATFORM_REGEX, comment.submission.title, re.IGNORECASE):
-                            source_platform = "nonSteam"
-                        for i in range(len(games)):
-                            appid = re.search('\d+', games[i]).group(0)
-                            make_comment = buildcommenttext(SteamGame(appid), False, source_platform)
-                            if make_comment is not None and make_comment != "":
-                                commenttext += make_comment
-                                appids.append(appid)
-                        if commenttext != "":
-                            commenttext += buildfootertext()
-                            if len(commenttext) < 10000:
-                                print('Replying to comment ' + str(comment) + ' after finding game ' + ', '.join(appids))
-                                comment.reply(body=commenttext)
-            except PrawcoreException:
-                print('Trying to reach Reddit')
-                time.sleep(30)
+def handlecomment(comment):
+    if comment.banned_by is not None:
+        return
+    test_comment_gleamio = re.search(GLEAMIO_URL_REGEX, comment.body)
+    test_comment_steam = re.search(STEAM_APPURL_REGEX, comment.body)
+    if test_comment_gleamio:
+        if comment.approved_by is None:
+            comment.mod.approve()
+    if test_comment_steam and fitscriteria(comment):
+        with budget.deadline():
+            games = []
+            urlregex = re.finditer(STEAM_APPURL_REGEX, comment.body)
+            for url in urlregex:
+                games.append(url.group(0))
+            # remove duplicates
+            games = list(dict.fromkeys(games))
+            appids = []
+            commenttext = ""
+            source_platform = "Steam"
+            if not re.search(STEAM_PLATFORM_REGEX, comment.submission.title, re.IGNORECASE):
+                source_platform = "nonSteam"
+            for i in range(len(games)):
+                appid = re.search('\d+', games[i]).group(0)
+                make_comment = buildcommenttext(game_store.get(SteamGame, appid), False, source_platform)
+                if make_comment is not None and make_comment != "":
+                    commenttext += make_comment
+                    appids.append(appid)
+            if commenttext != "":
+                commenttext += buildfootertext()
+                if len(commenttext) < 10000:
+                    print('Replying to comment ' + str(comment) + ' after finding game ' + ', '.join(appids))
+                    replyto(comment, commenttext)
+
+
+def isgiveawaycomment(comment, longlasting):
+    # giveaways running for more than 4 hours are refreshed less often
+    age = time.time() - comment.created_utc  # in seconds
+    if (age > 14400) != longlasting:
+        return False
+    return comment.banned_by is None and comment.body.startswith('**Giveaway details**') and "* Available keys: 0\n" not in comment.body
+
+
+def giveawaysleeptime(count, longlasting):
+    # try edit(s) every minute, every 30 minutes for longlasting giveaways
+    seconds = 1800 if longlasting else 60
+    if count > 10:
+        seconds *= 2
+    return seconds / count
+
+
+def refreshgiveawaycomment(comment, interval):
+    # returns False when the comment was skipped, the watcher then moves on without waiting
+    g_website = ""
+    submission_url = comment.submission.url
+    if re.search(ALIENWARE_URL_REGEX, submission_url):
+        g_website = "alienware"
+        split_part = "* No keys for:"
+    elif re.search(STEELSERIES_URL_REGEX, submission_url):
+        g_website = "steelseries"
+        split_part = "\n* Total keys:"
+    elif re.search(CRUCIAL_URL_REGEX, submission_url):
+        g_website = "crucial"
+        split_part = "\n* Total keys:"
+    elif re.search(IGAMES_URL_REGEX, submission_url):
+        g_website = "igames"
+        split_part = "\n* Total keys:"
+    elif re.search(KEYHUB_URL_REGEX, submission_url):
+        g_website = "keyhub"
+        split_part = "* Steam level required:"
+    if g_website == "alienware":
+        edited_part = buildcommenttext_awa(AlienwareArena(comment.submission.url, "update"), "update")
+    elif g_website in ["steelseries", "crucial", "igames"]:
+        g_id = re.search('\d+', comment.submission.url).group(0)
+        edited_part = buildcommenttext_igames(iGames(g_id, g_website), "update")
+    elif g_website == "keyhub":
+        edited_part = buildcommenttext_keyhub(Keyhub(comment.submission.url, "update"), "update")
+    else:
+        return False
+    original_body = comment.body
+    original_body_split = original_body.split("**Giveaway details**\n\n")
+    split_test = original_body_split[1].split(split_part, 1)
+    part_to_edit = split_test[0]
+    if g_website == "alienware" and len(split_test) == 1:
+        split_part = "* Keys available for"
+    if g_website in ["steelseries", "crucial", "igames"]:
+        test_out_of_keys = re.sub("[^0-9]", "", part_to_edit)
+        if test_out_of_keys.startswith('0'):
+            # prevents edits on a restock, leads to incorrect keys
+            edited_part = part_to_edit
+    if g_website == "alienware":
+        try:
+            if "Tier required: 0" in edited_part and "Tier required: 0" not in part_to_edit:
+                original_tier_split = part_to_edit.split("Tier required")
+                zero_tier_split = edited_part.split("Tier required")
+                edited_part = zero_tier_split[0] + "Tier required" + original_tier_split[1]
+        except TypeError:
+            return False
+    original_body_part = split_test[1]
+    edited_comment = ""
+    if edited_part != part_to_edit:
+        try:
+            edited_comment = "**Giveaway details**\n\n" + edited_part + split_part + original_body_part.replace("available keys every minute", "available keys every " + interval)
+        except TypeError:
+            return False
+        if len(edited_comment) < 10000:
+            if "Available keys: 0\n" in edited_part:
+                # flair post as expired, replace update text with runtime
+                comment.submission.mod.flair(text="Expired", css_class="Expired", flair_template_id="3f44a048-da47-11e3-8cba-12313d051ab0")
+                age = time.time() - comment.submission.created_utc  # in seconds
+                updating_text = "\n*Updating available keys every " + interval + "*\n"
+                if updating_text in edited_comment:
+                    expire_time = "\n*Giveaway lasted for " + format_timespan(int(age), max_units=2) + "*\n"
+                    edited_comment = edited_comment.replace(updating_text, expire_time)
+            comment.edit(body=edited_comment)
+    return True
+
+
+def handlerepost(submission):
+    if submission.banned_by is not None:
+        return
+    if repostwatch_title(submission.title) and repostwatch_duplicate(submission):
+        commenttext = buildcommenttext_repost(submission)
+        submission.mod.remove(spam=True)
+        comment = replyto(submission, commenttext)
+        comment.mod.distinguish(sticky=True)
 
 
 class EditCommentWatch(threading.Thread):
@@ -974,79 +1132,11 @@ class EditCommentWatch(threading.Thread):
             try:
                 comments = []
                 for comment in reddit.redditor(BOT_USERNAME).comments.new(limit=20):
-                    now = time.time()
-                    age = now - comment.created_utc  # in seconds
-                    if comment.banned_by is None and age <= 14400 and comment.body.startswith('**Giveaway details**') and "* Available keys: 0\n" not in comment.body:
+                    if isgiveawaycomment(comment, False):
                         comments.append(comment)
-                if len(comments) > 0:
-                    seconds = 60
-                    if len(comments) > 10:
-                        seconds = 120
-                    sleep_time = seconds / len(comments)
-                    for comment in comments:
-                        g_website = ""
-                        submission_url = comment.submission.url
-                        if re.search(ALIENWARE_URL_REGEX, submission_url):
-                            g_website = "alienware"
-                            split_part = "* No keys for:"
-                        elif re.search(STEELSERIES_URL_REGEX, submission_url):
-                            g_website = "steelseries"
-                            split_part = "\n* Total keys:"
-                        elif re.search(CRUCIAL_URL_REGEX, submission_url):
-                            g_website = "crucial"
-                            split_part = "\n* Total keys:"
-                        elif re.search(IGAMES_URL_REGEX, submission_url):
-                            g_website = "igames"
-                            split_part = "\n* Total keys:"
-                        elif re.search(KEYHUB_URL_REGEX, submission_url):
-                            g_website = "keyhub"
-                            split_part = "* Steam level required:"
-                        if g_website == "alienware":
-                            edited_part = buildcommenttext_awa(AlienwareArena(comment.submission.url, "update"), "update")
-                        elif g_website in ["steelseries", "crucial", "igames"]:
-                            g_id = re.search('\d+', comment.submission.url).group(0)
-                            edited_part = buildcommenttext_igames(iGames(g_id, g_website), "update")
-                        elif g_website == "keyhub":
-                            edited_part = buildcommenttext_keyhub(Keyhub(comment.submission.url, "update"), "update")
-                        else:
-                            continue
-                        original_body = comment.body
-                        original_body_split = original_body.split("**Giveaway details**\n\n")
-                        split_test = original_body_split[1].split(split_part, 1)
-                        part_to_edit = split_test[0]
-                        if g_website == "alienware" and len(split_test) == 1:
-                            split_part = "* Keys available for"
-                        if g_website in ["steelseries", "crucial", "igames"]:
-                            test_out_of_keys = re.sub("[^0-9]", "", part_to_edit)
-                            if test_out_of_keys.startswith('0'):
-                                # prevents edits on a restock, leads to incorrect keys
-                                edited_part = part_to_edit
-                        if g_website == "alienware":
-                            try:
-                                if "Tier required: 0" in edited_part and "Tier required: 0" not in part_to_edit:
-                                    original_tier_split = part_to_edit.split("Tier required")
-                                    zero_tier_split = edited_part.split("Tier required")
-                                    edited_part = zero_tier_split[0] + "Tier required" + original_tier_split[1]
-                            except TypeError:
-                                continue
-                        original_body_part = split_test[1]
-                        edited_comment = ""
-                        if edited_part != part_to_edit:
-                            try:
-                                edited_comment = "**Giveaway details**\n\n" + edited_part + split_part + original_body_part
-                            except TypeError:
-                                continue
-                            if len(edited_comment) < 10000:
-                                if "Available keys: 0\n" in edited_part:
-                                    # flair post as expired, replace update text with runtime
-                                    comment.submission.mod.flair(text="Expired", css_class="Expired", flair_template_id="3f44a048-da47-11e3-8cba-12313d051ab0")
-                                    age = time.time() - comment.submission.created_utc  # in seconds
-                                    if "\n*Updating available keys every minute*\n" in edited_comment:
-                                        expire_time = "\n*Giveaway lasted for " + format_timespan(int(age), max_units=2) + "*\n"
-                                        edited_comment = edited_comment.replace("\n*Updating available keys every minute*\n", expire_time)
-                                comment.edit(body=edited_comment)
-                        # try edit(s) every minute
-                        time.sleep(sleep_time)
+                for comment in comments:
+                    if refreshgiveawaycomment(comment, "minute"):
+                        time.sleep(giveawaysleeptime(len(comments), False))
             except PrawcoreException:
                 print('Trying to reach Reddit')
                 time.sleep(30)
@@ -1059,98 +1149,11 @@ class EditCommentWatchLong(threading.Thread):
             try:
                 comments = []
                 for comment in reddit.redditor(BOT_USERNAME).comments.new(limit=100):
-                    now = time.time()
-                    age = now - comment.created_utc  # in seconds
-                    if comment.banned_by is None and age > 14400 and comment.body.startswith('**Giveaway details**') and "* Available keys: 0\n" not in comment.body:
+                    if isgiveawaycomment(comment, True):
                         comments.append(comment)
-                if len(comments) > 0:
-                    seconds = 1800
-                    if len(comments) > 10:
-                        seconds = 3600
-                    sleep_time = seconds / len(comments)
-                    for comment in comments:
-                        g_website = ""
-                        submission_url = comment.submission.url
-                        if re.search(ALIENWARE_URL_REGEX, submission_url):
-                            g_website = "alienware"
-                            split_part = "* No keys for:"
-                        elif re.search(STEELSERIES_URL_REGEX, submission_url):
-                            g_website = "steelseries"
-                            split_part = "\n* Total keys:"
-                        elif re.search(CRUCIAL_URL_REGEX, submission_url):
-                            g_website = "crucial"
-                            split_part = "\n* Total keys:"
-                        elif re.search(IGAMES_URL_REGEX, submission_url):
-                            g_website = "igames"
-                            split_part = "\n* Total keys:"
-                        elif re.search(KEYHUB_URL_REGEX, submission_url):
-                            g_website = "keyhub"
-                            split_part = "* Steam level required:"
-                        if g_website == "alienware":
-                            edited_part = buildcommenttext_awa(AlienwareArena(comment.submission.url, "update"), "update")
-                        elif g_website in ["steelseries", "crucial", "igames"]:
-                            g_id = re.search('\d+', comment.submission.url).group(0)
-                            edited_part = buildcommenttext_igames(iGames(g_id, g_website), "update")
-                        elif g_website == "keyhub":
-                            edited_part = buildcommenttext_keyhub(Keyhub(comment.submission.url, "update"), "update")
-                        else:
-                            continue
-                        original_body = comment.body
-                        original_body_split = original_body.split("**Giveaway details**\n\n")
-                        split_test = original_body_split[1].split(split_part, 1)
-                        part_to_edit = split_test[0]
-                        if g_website == "alienware" and len(split_test) == 1:
-                            split_part = "* Keys available for"
-                        if g_website in ["steelseries", "crucial", "igames"]:
-                            test_out_of_keys = re.sub("[^0-9]", "", part_to_edit)
-                            if test_out_of_keys.startswith('0'):
-                                # prevents edits on a restock, leads to incorrect keys
-                                edited_part = part_to_edit
-                        if g_website == "alienware":
-                            try:
-                                if "Tier required: 0" in edited_part and "Tier required: 0" not in part_to_edit:
-                                    original_tier_split = part_to_edit.split("Tier required")
-                                    zero_tier_split = edited_part.split("Tier required")
-                                    edited_part = zero_tier_split[0] + "Tier required" + original_tier_split[1]
-                            except TypeError:
-                                continue
-                        original_body_part = split_test[1]
-                        edited_comment = ""
-                        if edited_part != part_to_edit:
-                            try:
-                                edited_comment = "**Giveaway details**\n\n" + edited_part + split_part + original_body_part.replace("available keys every minute", "available keys every 30 minutes")
-                            except TypeError:
-                                continue
-                            if len(edited_comment) < 10000:
-                                if "Available keys: 0\n" in edited_part:
-                                    # flair post as expired, replace update text with runtime
-                                    comment.submission.mod.flair(text="Expired", css_class="Expired", flair_template_id="3f44a048-da47-11e3-8cba-12313d051ab0")
-                                    age = time.time() - comment.submission.created_utc  # in seconds
-                                    if "\n*Updating available keys every 30 minutes*\n" in edited_comment:
-                                        expire_time = "\n*Giveaway lasted for " + format_timespan(int(age), max_units=2) + "*\n"
-                                        edited_comment = edited_comment.replace("\n*Updating available keys every 30 minutes*\n", expire_time)
-                                comment.edit(body=edited_comment)
-                        # try edit(s) every 30 minutes
-                        time.sleep(sleep_time)
-            except PrawcoreException:
-                print('Trying to reach Reddit')
-                time.sleep(30)
-
-
-class RepostWatch(threading.Thread):
-    def run(self):
-        print('Started watching subs for reposts: ' + SUBLIST)
-        subreddit = reddit.subreddit(SUBLIST)
-        while True:
-            try:
-                for submission in subreddit.stream.submissions(skip_existing=True):
-                    if submission.banned_by is not None:
-                        continue
-                    if repostwatch_title(submission.title) and repostwatch_duplicate(submission):
-                        commenttext = buildcommenttext_repost(submission)
-                        submission.mod.remove(spam=True)
-                        comment = submission.reply(body=commenttext)
-                        comment.mod.distinguish(sticky=True)
+                for comment in comments:
+                    if refreshgiveawaycomment(comment, "30 minutes"):
+                        time.sleep(giveawaysleeptime(len(comments), True))
             except PrawcoreException:
                 print('Trying to reach Reddit')
                 time.sleep(30)
@@ -1167,16 +1170,38 @@ if __name__ == "__main__":
     )
     reddit.validate_on_submit = True
 
+    submission_pool = work_pool.WorkPool(handlesubmission, SUBMISSION_WORKERS, SUBMISSION_QUEUE, "submission")
+    metrics.gauge("pool.submissions", submission_pool.depth)
+    metrics.gauge("pool.submissions.giveaway", lambda: submission_pool.depth(work_pool.LANE_GIVEAWAY))
+
+    # each listing is polled once, its items go to every watcher of it
+    hub = stream_hub.StreamHub()
+    subreddit = reddit.subreddit(SUBLIST)
+    hub.listing("submissions", subreddit.new)
+    hub.listing("comments", subreddit.comments)
+    print('Started watching subs: ' + SUBLIST)
+    # handled by the pool's workers, waits when the queue is full
+    hub.subscribe("submissions", lambda submission: submission_pool.put(submission, submissionlane(submission)), "subwatch")
+    print('Watching all comments on: ' + SUBLIST)
+    hub.subscribe("comments", handlecomment, "commentwatch")
+    print('Started watching subs for reposts: ' + SUBLIST)
+    hub.subscribe("submissions", handlerepost, "repostwatch")
+
+    def shutdown(signum, frame):
+        # finish the submissions in the pool, the other watchers stop with the process
+        print('Stopping, ' + str(submission_pool.depth()) + ' submissions left')
+        submission_pool.shutdown()
+        enrich_executor.shutdown(wait=True)
+        os._exit(0)
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
     keep_alive()
 
-    subwatch = SubWatch()
-    commentwatch = CommentWatch()
     editcommentwatch = EditCommentWatch()
     editcommentwatchlong = EditCommentWatchLong()
-    repostwatch = RepostWatch()
 
-    subwatch.start()
-    commentwatch.start()
+    hub.start()
     editcommentwatch.start()
     editcommentwatchlong.start()
-    repostwatch.start()
@@ -0,0 +1,24 @@
+import threading
+from collections import Counter
+
+counters = Counter()
+counters_lock = threading.Lock()
+# read on every snapshot, e.g. queue depths
+gauges = {}
+
+
+def increment(name, amount=1):
+    with counters_lock:
+        counters[name] += amount
+
+
+def gauge(name, read):
+    gauges[name] = read
+
+
+def snapshot():
+    with counters_lock:
+        values = dict(counters)
+    for name, read in list(gauges.items()):
+        values[name] = read()
+    return values
@@ -0,0 +1,54 @@
+from bs4 import Tag
+
+# nodes of a store page that the field methods read, keyed by (tag name, class or id)
+CLASS_KEYS = {
+    ("div", "game_area_purchase_game"): "purchase_game",
+    ("p", "game_purchase_discount_quantity"): "discount_quantity",
+    ("p", "game_purchase_discount_countdown"): "discount_countdown",
+    ("div", "game_area_comingsoon"): "comingsoon",
+    ("div", "early_access_header"): "early_access_header",
+    ("div", "learning_about"): "learning_about",
+    ("div", "user_reviews"): "user_reviews",
+    ("div", "popular_tags"): "popular_tags",
+    ("div", "mature_content_notice"): "mature_content_notice",
+}
+ID_KEYS = {
+    ("div", "achievement_block"): "achievement_block",
+    ("div", "category_block"): "category_block",
+    ("div", "userReviews"): "userReviews",
+}
+
+
+class PageIndex:
+
+    def __init__(self, page):
+        self.nodes = {}
+        # every indexed node once, in document order
+        self.order = []
+        # one walk over the document instead of a find per field
+        for node in page.descendants:
+            if type(node) is not Tag or not node.attrs:
+                continue
+            keys = [CLASS_KEYS.get((node.name, tag_class)) for tag_class in node.attrs.get("class", ())]
+            if "id" in node.attrs:
+                keys.append(ID_KEYS.get((node.name, node.attrs["id"])))
+            keys = [key for key in keys if key is not None]
+            for key in keys:
+                self.nodes.setdefault(key, []).append(node)
+            if keys:
+                self.order.append(node)
+
+    def find(self, key):
+        # first node in document order, like BeautifulSoup.find
+        nodes = self.nodes.get(key)
+        if nodes:
+            return nodes[0]
+        return None
+
+    def find_all(self, key):
+        return self.nodes.get(key, [])
+
+    def outermost(self):
+        # indexed nodes that are not inside another one, together they hold everything the index finds
+        indexed = set(map(id, self.order))
+        return [node for node in self.order if not any(id(parent) in indexed for parent in node.parents)]
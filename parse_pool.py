@@ -0,0 +1,39 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+# worker processes for parsing pages, 0 parses on the calling thread
+# the watcher threads share one GIL, in a worker a parse does not hold up the others
+PARSE_WORKERS = int(os.getenv("RSGIB_PARSE_WORKERS", "0"))
+
+executor = None
+executor_lock = threading.Lock()
+
+
+def shared():
+    global executor
+    with executor_lock:
+        if executor is None:
+            # spawned, forking a process with running threads can copy held locks
+            executor = ProcessPoolExecutor(max_workers=PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return executor
+
+
+def enabled():
+    return PARSE_WORKERS > 0
+
+
+def run(fn, *args):
+    # fn gets the page text and returns plain values, both are pickled to and from the worker
+    if PARSE_WORKERS == 0:
+        return fn(*args)
+    return shared().submit(fn, *args).result()
+
+
+def shutdown():
+    global executor
+    with executor_lock:
+        if executor is not None:
+            executor.shutdown(wait=True)
+            executor = None
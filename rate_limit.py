@@ -0,0 +1,150 @@
+import contextvars
+import email.utils
+import os
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+# lanes, lower goes first
+PRIORITY_NEW = 0
+PRIORITY_BACKGROUND = 1
+
+DEFAULT_RETRY_AFTER = float(os.getenv("RSGIB_DEFAULT_RETRY_AFTER", "30"))
+# longest pause a host gets, whatever its Retry-After says
+MAX_RETRY_AFTER = float(os.getenv("RSGIB_MAX_RETRY_AFTER", "60"))
+
+# requests per second and burst size, subdomains share the bucket of their domain
+HOST_LIMITS = {
+    "store.steampowered.com": (1.0, 10),
+    "steamcommunity.com": (0.3, 5),
+    "web.archive.org": (1.0, 5),
+    "steam-tracker.com": (0.5, 3),
+    "alienwarearena.com": (1.0, 5),
+    "key-hub.eu": (1.0, 5),
+}
+
+igames_host = urlparse(os.getenv("IGAMES_API", "")).hostname
+if igames_host:
+    HOST_LIMITS[igames_host] = (1.0, 5)
+
+# override with e.g. RSGIB_RATE_LIMITS="steamcommunity.com=0.2/3,web.archive.org=0.5/2"
+for limit in filter(None, os.getenv("RSGIB_RATE_LIMITS", "").split(",")):
+    host, rate_burst = limit.strip().split("=")
+    rate, burst = rate_burst.split("/")
+    HOST_LIMITS[host] = (float(rate), int(burst))
+
+current_priority = contextvars.ContextVar("priority", default=PRIORITY_NEW)
+
+
+@contextmanager
+def priority(lane):
+    token = current_priority.set(lane)
+    try:
+        yield
+    finally:
+        current_priority.reset(token)
+
+
+class TokenBucket:
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0
+        self.condition = threading.Condition()
+        self.waiting = [0, 0]
+
+    def refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, lane=PRIORITY_NEW):
+        with self.condition:
+            self.waiting[lane] += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self.refill(now)
+                    # higher lanes take the tokens first
+                    ahead = any(self.waiting[higher] for higher in range(lane))
+                    if now >= self.blocked_until and self.tokens >= 1 and not ahead:
+                        self.tokens -= 1
+                        return
+                    wait = max(self.blocked_until - now, (1 - self.tokens) / self.rate, 0.01)
+                    self.condition.wait(wait)
+            finally:
+                self.waiting[lane] -= 1
+                self.condition.notify_all()
+
+    def pause(self, seconds):
+        # host asked us to back off, nobody gets a token until then
+        with self.condition:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self.tokens = 0
+            self.condition.notify_all()
+
+
+buckets = {}
+buckets_lock = threading.Lock()
+
+
+def bucket_for(url):
+    host = urlparse(url).hostname or ""
+    for limited_host in HOST_LIMITS:
+        if host == limited_host or host.endswith("." + limited_host):
+            with buckets_lock:
+                if limited_host not in buckets:
+                    buckets[limited_host] = TokenBucket(*HOST_LIMITS[limited_host])
+                return buckets[limited_host]
+    return None
+
+
+# end of the pause of each host without a bucket
+paused = {}
+
+
+def acquire(url):
+    bucket = bucket_for(url)
+    if bucket is not None:
+        bucket.acquire(current_priority.get())
+        return
+    with buckets_lock:
+        wait = paused.get(urlparse(url).hostname or "", 0) - time.monotonic()
+    if wait > 0:
+        # like a paused bucket, only requests to the host wait
+        time.sleep(wait)
+
+
+def retry_after(response):
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return min(DEFAULT_RETRY_AFTER, MAX_RETRY_AFTER)
+    if value.strip().isdigit():
+        return min(float(value), MAX_RETRY_AFTER)
+    try:
+        # HTTP date
+        return min(max(0, email.utils.parsedate_to_datetime(value).timestamp() - time.time()), MAX_RETRY_AFTER)
+    except (TypeError, ValueError):
+        return min(DEFAULT_RETRY_AFTER, MAX_RETRY_AFTER)
+
+
+def throttled(response):
+    # True when the response asks to slow down
+    return response.status_code == 429 or (response.status_code == 503 and "Retry-After" in response.headers)
+
+
+def pause(url, response):
+    # back off from the host of a throttled response
+    seconds = retry_after(response)
+    print("Rate limited by " + str(urlparse(url).hostname) + ": pause for " + str(int(seconds)) + " seconds")
+    bucket = bucket_for(url)
+    if bucket is not None:
+        bucket.pause(seconds)
+        return
+    host = urlparse(url).hostname or ""
+    with buckets_lock:
+        # the next request to the host waits, not the thread that got the response
+        paused[host] = max(paused.get(host, 0), time.monotonic() + seconds)
@@ -0,0 +1,275 @@
+import argparse
+import bisect
+import os
+import sqlite3
+import threading
+import time
+
+import requests
+
+import game_names
+import html_parser
+import http_client
+import parse_pool
+
+# ":memory:" keeps the lists only while the bot runs
+INDEX_PATH = os.getenv("RSGIB_REMOVED_INDEX", "removedapps.db")
+# seconds between checks of the lists, a list that did not change costs a 304
+REFRESH_INTERVAL = float(os.getenv("RSGIB_REMOVED_INDEX_REFRESH", str(60 * 60)))
+RETRY_INTERVAL = 10 * 60
+# a second site with the banned and delisted lists as app table rows, empty to leave it out
+BACKUP_BANNED_URL = os.getenv("RSGIB_REMOVED_BACKUP_BANNED", "")
+BACKUP_DELISTED_URL = os.getenv("RSGIB_REMOVED_BACKUP_DELISTED", "")
+
+
+def trackerrows(text):
+    # (appid, name) of each app link on a steam-tracker list
+    page = html_parser.parse(text, "steamtracker")
+    rows = []
+    for link in page.find_all("a", href=True):
+        href = link["href"].split("/")
+        if "app" in href and href.index("app") + 1 < len(href):
+            rows.append((href[href.index("app") + 1], link.text.strip()))
+    html_parser.free(page)
+    return rows
+
+
+def tablerows(text):
+    # (appid, name) of each app row of a backup list
+    page = html_parser.parse(text, "removedtable")
+    rows = [(game['data-id'], game.find('a').text.strip()) for game in page.select('tr[data-type="app"]')]
+    html_parser.free(page)
+    return rows
+
+
+# (list type, url, parser) in the order they are searched
+SOURCES = [
+    ("banned", "https://steam-tracker.com/apps/banned", trackerrows),
+    ("delisted", "https://steam-tracker.com/apps/delisted", trackerrows),
+]
+if BACKUP_BANNED_URL:
+    SOURCES.append(("banned", BACKUP_BANNED_URL, tablerows))
+if BACKUP_DELISTED_URL:
+    SOURCES.append(("delisted", BACKUP_DELISTED_URL, tablerows))
+
+
+class Listing:
+    # one list in memory, each key points to the first row in page order with it
+
+    def __init__(self, rows):
+        # rows are (appid, name, exact, words, letters) in page order
+        self.rows = rows
+        self.exact = {}
+        self.words = {}
+        self.letters = {}
+        for position, (_, _, exact, words, letters) in enumerate(rows):
+            self.exact.setdefault(exact, position)
+            self.words.setdefault(words, position)
+            self.letters.setdefault(letters, position)
+        # all names in one string, a substring is found with one find instead of a loop over the rows
+        # each name between spaces so the target only matches whole words, "war" is not in "swarm"
+        self.text = "\n".join(" " + row[2] + " " for row in rows)
+        self.starts = []
+        start = 0
+        for row in rows:
+            self.starts.append(start)
+            start += len(row[2]) + 3
+
+    def best(self, matcher):
+        # same tiers as TitleMatcher.best with substring matches, the key tiers are dictionary probes
+        for keys, key in ((self.exact, matcher.exact), (self.words, matcher.words), (self.letters, matcher.letters)):
+            if key in keys:
+                return self.rows[keys[key]][0]
+        positions = [keys[key] for keys, variant_keys in (
+            (self.exact, matcher.variant_exact),
+            (self.words, matcher.variant_words),
+            (self.letters, matcher.variant_letters),
+        ) for key in variant_keys if key in keys]
+        if positions:
+            return self.rows[min(positions)][0]
+        found = [self.text.find(" " + name.strip() + " ") for name in matcher.substrings if name.strip()]
+        positions = [bisect.bisect_right(self.starts, index) - 1 for index in found if index != -1]
+        if positions:
+            return self.rows[min(positions)][0]
+        return None
+
+
+class RemovedIndex:
+    # banned and delisted apps of steam-tracker and the backup site, kept up to date with conditional GETs
+
+    def __init__(self, path=INDEX_PATH, sources=None):
+        self.sources = SOURCES if sources is None else sources
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS removed (url TEXT NOT NULL, appid TEXT NOT NULL, list TEXT NOT NULL, "
+            "position INTEGER NOT NULL, name TEXT NOT NULL, exact TEXT NOT NULL, words TEXT NOT NULL, "
+            "letters TEXT NOT NULL, PRIMARY KEY (url, appid))")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS validators (url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, "
+            "checked REAL NOT NULL)")
+        self.connection.commit()
+        self.listings = {}
+        for _, url, _ in self.sources:
+            self.listings[url] = self.load(url)
+
+    def load(self, url):
+        with self.lock:
+            return Listing(self.connection.execute(
+                "SELECT appid, name, exact, words, letters FROM removed WHERE url = ? ORDER BY position",
+                (url,)).fetchall())
+
+    def checked(self, url):
+        # time of the last answer from the site, None when never downloaded
+        with self.lock:
+            row = self.connection.execute("SELECT checked FROM validators WHERE url = ?", (url,)).fetchone()
+        return row[0] if row is not None else None
+
+    def ready(self):
+        return all(self.checked(url) is not None for _, url, _ in self.sources)
+
+    def due(self):
+        now = time.time()
+        return [source for source in self.sources
+                if self.checked(source[1]) is None or self.checked(source[1]) + REFRESH_INTERVAL <= now]
+
+    def refresh(self, source):
+        # number of changed rows, 0 when the list did not change
+        kind, url, parser = source
+        with self.lock:
+            validators = self.connection.execute(
+                "SELECT etag, last_modified FROM validators WHERE url = ?", (url,)).fetchone()
+        headers = {}
+        if validators is not None:
+            if validators[0]:
+                headers["If-None-Match"] = validators[0]
+            if validators[1]:
+                headers["If-Modified-Since"] = validators[1]
+        response = http_client.get(url, timeout=60, headers=headers)
+        if response.status_code == 304:
+            self.update(url, kind, None, validators)
+            return 0
+        response.raise_for_status()
+        # parsed in a worker process when enabled
+        rows = parse_pool.run(parser, response.text)
+        if not rows:
+            raise ValueError("no apps on " + url)
+        return self.update(url, kind, rows, (response.headers.get("ETag"), response.headers.get("Last-Modified")))
+
+    def update(self, url, kind, rows, validators):
+        # writes only the rows that changed, rows None keeps the list
+        changed = 0
+        reload = False
+        with self.lock, self.connection:
+            if rows is not None:
+                stored = {appid: (position, name) for appid, position, name in self.connection.execute(
+                    "SELECT appid, position, name FROM removed WHERE url = ?", (url,))}
+                listed = {}
+                for appid, name in rows:
+                    if name and appid not in listed:
+                        listed[appid] = (len(listed), name)
+                gone = [(url, appid) for appid in stored if appid not in listed]
+                new = [
+                    (url, appid, kind, position, name) + game_names.keys(game_names.normalize(name))
+                    for appid, (position, name) in listed.items()
+                    if appid not in stored or stored[appid][1] != name
+                ]
+                # apps added at the top move the others down, only their position is written
+                moved = [
+                    (position, url, appid) for appid, (position, name) in listed.items()
+                    if appid in stored and stored[appid][1] == name and stored[appid][0] != position
+                ]
+                self.connection.executemany("DELETE FROM removed WHERE url = ? AND appid = ?", gone)
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO removed (url, appid, list, position, name, exact, words, letters) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", new)
+                self.connection.executemany("UPDATE removed SET position = ? WHERE url = ? AND appid = ?", moved)
+                changed = len(gone) + len(new)
+                reload = changed or moved
+            etag, last_modified = validators if validators is not None else (None, None)
+            self.connection.execute(
+                "INSERT OR REPLACE INTO validators (url, etag, last_modified, checked) VALUES (?, ?, ?, ?)",
+                (url, etag, last_modified, time.time()))
+        if reload:
+            self.listings[url] = self.load(url)
+        return changed
+
+    def lookup(self, game_name):
+        # appid of the best match on the first list that has one, lists in search order
+        matcher = game_names.TitleMatcher(game_name)
+        for _, url, _ in self.sources:
+            appid = self.listings[url].best(matcher)
+            if appid is not None:
+                return appid
+        return None
+
+    def stats(self):
+        with self.lock:
+            return self.connection.execute("SELECT url, list, COUNT(*) FROM removed GROUP BY url").fetchall()
+
+
+def refresh(removed_index, sources=None):
+    # False when a list could not be downloaded, the others are still refreshed
+    refreshed = True
+    for source in removed_index.sources if sources is None else sources:
+        try:
+            changed = removed_index.refresh(source)
+        except (requests.exceptions.RequestException, ValueError):
+            print("Removed games list unavailable: keeping the index of " + source[1])
+            refreshed = False
+            continue
+        if changed:
+            print("Removed games index of " + source[1] + " updated with " + str(changed) + " changes")
+    return refreshed
+
+
+def refresher(removed_index):
+    while True:
+        with refresh_lock:
+            refreshed = refresh(removed_index, removed_index.due())
+        time.sleep(REFRESH_INTERVAL if refreshed else RETRY_INTERVAL)
+
+
+index = None
+index_lock = threading.Lock()
+# one download of the lists at a time, lookups wait for the first one
+refresh_lock = threading.Lock()
+
+
+def shared():
+    global index
+    with index_lock:
+        if index is None:
+            index = RemovedIndex()
+            threading.Thread(target=refresher, args=(index,), name="removed-index", daemon=True).start()
+    return index
+
+
+def lookup(game_name):
+    removed_index = shared()
+    if not removed_index.ready():
+        with refresh_lock:
+            refresh(removed_index, [source for source in removed_index.sources
+                                    if removed_index.checked(source[1]) is None])
+    return removed_index.lookup(game_name)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Refresh or query the index of removed Steam apps")
+    parser.add_argument("--path", default=INDEX_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("refresh")
+    commands.add_parser("stats")
+    lookup_parser = commands.add_parser("lookup")
+    lookup_parser.add_argument("name")
+    args = parser.parse_args()
+
+    removed_index = RemovedIndex(args.path)
+    if args.command == "refresh":
+        refresh(removed_index)
+    elif args.command == "stats":
+        for url, kind, count in removed_index.stats():
+            print(kind + " " + url + ": " + str(count) + " apps")
+    elif args.command == "lookup":
+        print(removed_index.lookup(args.name))
@@ -0,0 +1,78 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+STORE_PATH = os.getenv("RSGIB_REPLIED_STORE", "replied.db")
+# ids the bloom filter holds at about 1% false positives, it only gets slower when full
+BLOOM_CAPACITY = int(os.getenv("RSGIB_REPLIED_CAPACITY", "200000"))
+
+
+class BloomFilter:
+    # False means never added, True means probably added
+
+    def __init__(self, capacity, hashes=7):
+        # about 10 bits per id for 1% false positives with 7 hashes
+        self.size = capacity * 10
+        self.hashes = hashes
+        self.bits = bytearray(self.size // 8 + 1)
+
+    def positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=self.hashes * 4).digest()
+        for i in range(self.hashes):
+            yield int.from_bytes(digest[i * 4:i * 4 + 4], "little") % self.size
+
+    def add(self, key):
+        for position in self.positions(key):
+            self.bits[position // 8] |= 1 << (position % 8)
+
+    def __contains__(self, key):
+        return all(self.bits[position // 8] & (1 << (position % 8)) for position in self.positions(key))
+
+
+class RepliedStore:
+    # fullnames of submissions and comments the bot replied to or skipped
+
+    def __init__(self, path=STORE_PATH, capacity=BLOOM_CAPACITY):
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS replied (thing TEXT PRIMARY KEY, outcome TEXT NOT NULL, recorded REAL NOT NULL)")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value REAL NOT NULL)")
+        self.connection.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('created', ?)", (time.time(),))
+        self.connection.commit()
+        self.created = self.connection.execute("SELECT value FROM meta WHERE key = 'created'").fetchone()[0]
+        self.bloom = BloomFilter(capacity)
+        for (thing,) in self.connection.execute("SELECT thing FROM replied"):
+            self.bloom.add(thing)
+
+    def covers(self, created_utc):
+        # every reply to a thing posted since the store exists was recorded
+        return created_utc >= self.created
+
+    def contains(self, thing):
+        if thing not in self.bloom:
+            return False
+        with self.lock:
+            return self.connection.execute("SELECT 1 FROM replied WHERE thing = ?", (thing,)).fetchone() is not None
+
+    def add(self, thing, outcome="replied"):
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO replied (thing, outcome, recorded) VALUES (?, ?, ?)", (thing, outcome, time.time()))
+            self.connection.commit()
+            self.bloom.add(thing)
+
+
+store = None
+store_lock = threading.Lock()
+
+
+def shared():
+    global store
+    with store_lock:
+        if store is None:
+            store = RepliedStore()
+    return store
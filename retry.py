@@ -0,0 +1,92 @@
+import os
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+
+BREAKER_THRESHOLD = int(os.getenv("RSGIB_BREAKER_THRESHOLD", "5"))
+BREAKER_RESET = float(os.getenv("RSGIB_BREAKER_RESET", "60"))
+
+# gateway errors are worth another try, other errors are returned to the caller
+RETRY_STATUS = (502, 503, 504)
+
+
+class HostUnavailable(requests.exceptions.ConnectionError):
+    pass
+
+
+class RetryPolicy:
+
+    def __init__(self, attempts=4, base=2, cap=30):
+        self.attempts = attempts
+        self.base = base
+        self.cap = cap
+
+    def backoff(self, attempt):
+        # exponential with full jitter
+        return random.uniform(0, min(self.cap, self.base * 2 ** (attempt - 1)))
+
+
+DEFAULT_POLICY = RetryPolicy()
+# for requests that only add optional details to a comment
+QUICK_POLICY = RetryPolicy(attempts=2, base=1, cap=5)
+
+
+class CircuitBreaker:
+
+    def __init__(self, host, threshold=BREAKER_THRESHOLD, reset=BREAKER_RESET):
+        self.host = host
+        self.threshold = threshold
+        self.reset = reset
+        self.failures = 0
+        self.opened = None
+        self.trial = False
+        self.lock = threading.Lock()
+
+    def check(self):
+        # fail fast while the host is unhealthy, let one request through after the reset time
+        with self.lock:
+            if self.opened is None:
+                return
+            if time.monotonic() - self.opened >= self.reset and not self.trial:
+                self.trial = True
+                return
+        raise HostUnavailable(self.host + " is unavailable, not sending request")
+
+    def success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened = None
+            self.trial = False
+
+    def failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.trial or self.failures >= self.threshold:
+                if self.opened is None or self.trial:
+                    print("Too many failed requests to " + self.host + ": skip it for " + str(int(self.reset)) + " seconds")
+                self.opened = time.monotonic()
+                self.trial = False
+
+    def release(self):
+        # the host answered without an outcome, e.g. throttled, the next request is the trial again
+        with self.lock:
+            self.trial = False
+
+    def isopen(self):
+        with self.lock:
+            return self.opened is not None
+
+
+breakers = {}
+breakers_lock = threading.Lock()
+
+
+def breaker_for(url):
+    host = urlparse(url).hostname or ""
+    with breakers_lock:
+        if host not in breakers:
+            breakers[host] = CircuitBreaker(host)
+        return breakers[host]
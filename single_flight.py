@@ -0,0 +1,35 @@
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def do(self, key, fn, *args):
+        # the first caller for a key runs fn, concurrent callers wait for its result
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = Future()
+                self.calls[key] = call
+        if not leader:
+            return call.result()
+        try:
+            result = fn(*args)
+        except BaseException as error:
+            call.set_exception(error)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            with self.lock:
+                del self.calls[key]
+
+    def inflight(self):
+        with self.lock:
+            return len(self.calls)
@@ -0,0 +1,120 @@
+import os
+import queue
+import threading
+import time
+import traceback
+from collections import OrderedDict
+
+from prawcore.exceptions import PrawcoreException
+
+import metrics
+
+# pause between polls of a listing, doubled after every poll without new items
+MIN_PAUSE = float(os.getenv("RSGIB_STREAM_MIN_PAUSE", "1"))
+MAX_PAUSE = float(os.getenv("RSGIB_STREAM_MAX_PAUSE", "16"))
+# items waiting for one handler, a full queue holds up the listing's other handlers too
+SUBSCRIBER_QUEUE = int(os.getenv("RSGIB_SUBSCRIBER_QUEUE", "100"))
+# ids remembered per listing, more than one poll returns
+SEEN_LIMIT = 1000
+
+
+class Stream(threading.Thread):
+    # polls one listing and hands each new item to every subscriber of it
+
+    def __init__(self, name, fetch):
+        super().__init__(name="stream-" + name)
+        self.listing = name
+        self.fetch = fetch
+        self.subscribers = []
+        self.seen = OrderedDict()
+        self.pause = MIN_PAUSE
+        self.started = False
+
+    def poll(self):
+        # new items, oldest first like a praw stream
+        items = []
+        for item in self.fetch(limit=100):
+            if item.fullname in self.seen:
+                continue
+            self.seen[item.fullname] = None
+            items.append(item)
+        while len(self.seen) > SEEN_LIMIT:
+            self.seen.popitem(last=False)
+        if not self.started:
+            # skip_existing, only items posted after the start
+            self.started = True
+            return []
+        return list(reversed(items))
+
+    def adapt(self, found):
+        if found:
+            self.pause = MIN_PAUSE
+        else:
+            self.pause = min(self.pause * 2, MAX_PAUSE)
+
+    def run(self):
+        while True:
+            try:
+                items = self.poll()
+            except PrawcoreException:
+                print('Trying to reach Reddit')
+                time.sleep(30)
+                continue
+            metrics.increment("stream." + self.listing + ".polls")
+            for item in items:
+                for subscriber in self.subscribers:
+                    subscriber.put(item)
+            self.adapt(items)
+            time.sleep(self.pause)
+
+
+class Subscriber(threading.Thread):
+    # runs one handler on the items of a listing, in stream order
+
+    def __init__(self, name, handler, maxsize=SUBSCRIBER_QUEUE):
+        super().__init__(name=name)
+        self.handler = handler
+        self.queue = queue.Queue(maxsize)
+
+    def put(self, item):
+        self.queue.put(item)
+
+    def depth(self):
+        return self.queue.qsize()
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            try:
+                self.handler(item)
+            except PrawcoreException:
+                print('Trying to reach Reddit')
+                time.sleep(30)
+            except Exception:
+                traceback.print_exc()
+            finally:
+                self.queue.task_done()
+
+
+class StreamHub:
+
+    def __init__(self):
+        self.streams = {}
+        self.subscribers = []
+
+    def listing(self, name, fetch):
+        # fetch(limit=...) returns the newest items first, e.g. subreddit.new
+        self.streams[name] = Stream(name, fetch)
+
+    def subscribe(self, name, handler, label):
+        subscriber = Subscriber(name + "." + label, handler)
+        self.streams[name].subscribers.append(subscriber)
+        self.subscribers.append(subscriber)
+        metrics.gauge("queue." + subscriber.name, subscriber.depth)
+        return subscriber
+
+    def start(self):
+        for subscriber in self.subscribers:
+            subscriber.start()
+        for stream in self.streams.values():
+            stream.start()
@@ -0,0 +1,63 @@
+# Tests the local index of Steam app names
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import app_index
+import http_client
+from app_index import AppIndex
+from SteamSearchGame import SteamSearchGame
+
+APPS = [
+    (220, "Half-Life 2"),
+    (400, "Portal"),
+    (620, "Portal 2"),
+    (1001, "Ghost Story: DLC"),
+    (1002, "Twin Game"),
+    (1003, "Twin Game"),
+    (1004, "Final Fantasy VII"),
+]
+
+
+class AppIndexValidate(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.index = AppIndex(os.path.join(self.directory.name, "steamapps.db"))
+        self.index.build(APPS)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_lookup(self):
+        self.assertEqual(self.index.lookup("Portal"), "400")
+        self.assertEqual(self.index.lookup("portal 2"), "620")
+        # words in another order
+        self.assertEqual(self.index.lookup("Story Ghost"), "1001")
+        # typos are left to the store search results
+        self.assertIsNone(self.index.lookup("Protal"))
+        # numeral variants
+        self.assertEqual(self.index.lookup("Half Life II"), "220")
+        self.assertEqual(self.index.lookup("Final Fantasy 7"), "1004")
+
+    def test_no_match(self):
+        self.assertIsNone(self.index.lookup("Unknown Game"))
+        # same name twice, left to the store search
+        self.assertIsNone(self.index.lookup("Twin Game"))
+
+    def test_rebuild(self):
+        self.assertIsNotNone(self.index.built())
+        self.index.build([(999, "Other Game")])
+        self.assertIsNone(self.index.lookup("Portal"))
+        self.assertEqual(self.index.lookup("Other Game"), "999")
+
+    def test_search_answered_from_index(self):
+        with mock.patch.object(app_index, "shared", return_value=self.index), \
+                mock.patch.object(http_client, "get", side_effect=AssertionError("store search")):
+            self.assertEqual(SteamSearchGame("Half-Life 2", False).appid, "220")
+
+
+if __name__ == '__main__':
+    unittest.main()
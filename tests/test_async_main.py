@@ -0,0 +1,77 @@
+# Tests the stream consumers of the asyncio entry point
+
+import asyncio
+import importlib.util
+import threading
+import unittest
+
+import main
+import work_pool
+
+ASYNCPRAW = importlib.util.find_spec("asyncpraw") is not None
+if ASYNCPRAW:
+    import async_main
+
+
+@unittest.skipUnless(ASYNCPRAW, "asyncpraw is not installed")
+class LanesValidate(unittest.TestCase):
+
+    def test_giveaway_lane_first(self):
+        order = []
+        started = threading.Event()
+        release = threading.Event()
+
+        def handler(url):
+            started.set()
+            # the first post holds the only worker while the others queue
+            release.wait(5)
+            order.append(url)
+
+        async def run():
+            lanes = async_main.Lanes(handler, 1, 10, lambda url: main.submissionlane(type("Post", (), {"url": url})))
+            await lanes.put("https://store.steampowered.com/app/1")
+            await asyncio.get_event_loop().run_in_executor(None, started.wait, 5)
+            await lanes.put("https://store.steampowered.com/app/2")
+            await lanes.put("https://www.alienwarearena.com/ucf/show/3")
+            self.assertEqual(lanes.depth(), 2)
+            self.assertEqual(lanes.depth(work_pool.LANE_GIVEAWAY), 1)
+            release.set()
+            while len(order) < 3:
+                await asyncio.sleep(0.01)
+            for worker in lanes.workers:
+                worker.cancel()
+
+        asyncio.new_event_loop().run_until_complete(run())
+        self.assertEqual(order, [
+            "https://store.steampowered.com/app/1",
+            "https://www.alienwarearena.com/ucf/show/3",
+            "https://store.steampowered.com/app/2",
+        ])
+
+    def test_watch_feeds_every_consumer(self):
+        received = []
+
+        class Consumer:
+            async def put(self, item):
+                received.append(item)
+
+        class Bridge:
+            def wrap(self, item):
+                return "wrapped " + item
+
+        async def stream():
+            for item in ["a", "b"]:
+                yield item
+            # stops the endless watch
+            raise asyncio.CancelledError
+
+        async def run():
+            with self.assertRaises(asyncio.CancelledError):
+                await async_main.watch(stream, [Consumer(), Consumer()], Bridge())
+
+        asyncio.new_event_loop().run_until_complete(run())
+        self.assertEqual(received, ["wrapped a", "wrapped a", "wrapped b", "wrapped b"])
+
+
+if __name__ == '__main__':
+    unittest.main()
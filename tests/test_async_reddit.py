@@ -0,0 +1,79 @@
+# Tests the praw shaped view the handlers get in the asyncio entry point
+
+import asyncio
+import importlib.util
+import threading
+import unittest
+from unittest import mock
+
+import prawcore
+
+import main
+
+ASYNCPRAW = importlib.util.find_spec("asyncpraw") is not None
+if ASYNCPRAW:
+    import asyncpraw
+    import asyncprawcore
+
+    import async_reddit
+
+
+@unittest.skipUnless(ASYNCPRAW, "asyncpraw is not installed")
+class AsyncRedditValidate(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.reddit = asyncpraw.Reddit(client_id="id", client_secret="secret", user_agent="test")
+        self.bridge = async_reddit.Bridge(self.loop)
+        self.loop_thread = threading.get_ident()
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.reddit.close())
+        self.loop.close()
+
+    def inthread(self, fn, *args):
+        # the handlers run on worker threads while the loop runs
+        return self.loop.run_until_complete(self.loop.run_in_executor(None, fn, *args))
+
+    def submission(self, **data):
+        data.setdefault("id", "abc")
+        return self.bridge.wrap(asyncpraw.models.Submission(self.reddit, _data=data))
+
+    def test_calls_run_on_loop(self):
+        calls = []
+
+        async def flair(moderation, **kwargs):
+            calls.append((threading.get_ident(), kwargs["css_class"]))
+
+        submission = self.submission(over_18=True, link_flair_text=None)
+        self.assertEqual(type(submission).__name__, "Submission")
+        with mock.patch.object(asyncpraw.models.reddit.submission.SubmissionModeration, "flair", flair):
+            self.inthread(main.moderatesteampost, submission, "* Paid Base Game: Test")
+        self.assertEqual(calls, [(self.loop_thread, "BasePaid")])
+
+    def test_lazy_object_is_loaded(self):
+        async def load(lazy):
+            lazy.__dict__["title"] = "Loaded"
+            lazy._fetched = True
+
+        comment = self.bridge.wrap(asyncpraw.models.Comment(self.reddit, _data={"id": "c1", "link_id": "t3_abc"}))
+        with mock.patch.object(asyncpraw.models.Submission, "load", load):
+            self.assertEqual(self.inthread(lambda: comment.submission.title), "Loaded")
+
+    def test_reddit_errors_become_praw_errors(self):
+        async def fail():
+            raise asyncprawcore.exceptions.AsyncPrawcoreException("down")
+
+        with self.assertRaises(prawcore.exceptions.PrawcoreException):
+            self.inthread(self.bridge.call, fail())
+
+    def test_no_blocking_call_on_loop_thread(self):
+        async def nothing():
+            pass
+
+        with self.assertRaises(RuntimeError):
+            self.bridge.call(nothing())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+# Tests the FetchPlanner used to run independent requests in parallel
+
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import budget
+from fetch_planner import FetchPlanner
+
+
+class FetchPlannerValidate(unittest.TestCase):
+
+    def test_prefetched_result(self):
+        planner = FetchPlanner()
+        planner.submit("page", lambda url: url.upper(), "store")
+        self.assertEqual(planner.result("page", lambda url: "not used", "store"), "STORE")
+
+    def test_fetch_without_prefetch(self):
+        planner = FetchPlanner()
+        self.assertEqual(planner.result("page", lambda url: url + "!", "store"), "store!")
+
+    def test_result_is_used_once(self):
+        calls = []
+        planner = FetchPlanner()
+        planner.submit("page", calls.append, "prefetch")
+        planner.result("page", calls.append, "refetch")
+        planner.result("page", calls.append, "refetch")
+        self.assertEqual(calls, ["prefetch", "refetch"])
+
+    def test_runs_in_parallel(self):
+        barrier = threading.Barrier(3, timeout=5)
+        planner = FetchPlanner()
+        for key in ["a", "b", "c"]:
+            planner.submit(key, barrier.wait)
+        start = time.time()
+        for key in ["a", "b", "c"]:
+            planner.result(key, barrier.wait)
+        self.assertLess(time.time() - start, 5)
+
+    def test_optional_within_budget(self):
+        planner = FetchPlanner()
+        planner.submit("cards", lambda: 8)
+        with budget.deadline(5):
+            self.assertEqual(planner.optional("cards", lambda: 0), 8)
+
+    def test_optional_past_deadline(self):
+        release = threading.Event()
+        planner = FetchPlanner()
+        planner.submit("cards", release.wait)
+        with budget.deadline(0.1):
+            with self.assertRaises(budget.DeadlineExceeded):
+                planner.optional("cards", release.wait)
+            with self.assertRaises(budget.DeadlineExceeded):
+                planner.optional("wiki", lambda: True)
+        release.set()
+
+    def test_optional_without_deadline(self):
+        planner = FetchPlanner()
+        self.assertEqual(planner.optional("cards", lambda: 8), 8)
+
+    def test_optional_on_own_pool(self):
+        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="own")
+        self.addCleanup(pool.shutdown)
+        planner = FetchPlanner(pool)
+        with budget.deadline(5):
+            self.assertTrue(planner.optional("wiki", lambda: threading.current_thread().name.startswith("own")))
+
+
+if __name__ == '__main__':
+    unittest.main()
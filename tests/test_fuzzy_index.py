@@ -0,0 +1,82 @@
+# Tests the trigram ranking of Steam app names
+
+import unittest
+from unittest import mock
+
+import requests
+
+import fuzzy_index
+import http_client
+from fuzzy_index import TrigramIndex
+from SteamSearchGame import SteamSearchGame
+
+APPS = [
+    ("the stanley parable", 221910),
+    ("the elder scrolls iii morrowind", 22320),
+    ("grand theft auto v", 271590),
+    ("borderlands", 8980),
+    ("borderlands 2", 49520),
+    ("hollow knight", 367520),
+    ("twin game", 1002),
+    ("twin game", 1003),
+    ("orbital drift soundtrack", 2001),
+    ("orbital drift dedicated server", 2002),
+]
+
+
+class TrigramIndexValidate(unittest.TestCase):
+
+    def setUp(self):
+        self.index = TrigramIndex(APPS)
+
+    def test_rank(self):
+        ranked = self.index.rank("Stanley Parable")
+        self.assertEqual(ranked[0][:2], ("221910", "the stanley parable"))
+        self.assertGreater(ranked[0][2], fuzzy_index.THRESHOLD)
+        # best first, unrelated names left out
+        self.assertEqual([score for _, _, score in ranked], sorted((score for _, _, score in ranked), reverse=True))
+        self.assertEqual(self.index.rank("zzzz"), [])
+
+    def test_resolve(self):
+        self.assertEqual(self.index.resolve("Stanley Parable"), "221910")
+        self.assertEqual(self.index.resolve("Elder Scrolls Morrowind"), "22320")
+        # numeral variant
+        self.assertEqual(self.index.resolve("Grand Theft Auto 5"), "271590")
+
+    def test_below_threshold(self):
+        self.assertIsNone(self.index.resolve("Hollow"))
+        self.assertIsNone(self.index.resolve("Unknown Game"))
+
+    def test_ambiguous(self):
+        # borderlands is almost as close
+        self.assertIsNone(self.index.resolve("Borderland 2"))
+        self.assertIsNone(self.index.resolve("Twin Games"))
+        # unless the store search found one of them
+        self.assertEqual(self.index.resolve("Borderland 2", {"49520"}), "49520")
+        self.assertEqual(self.index.resolve("Twin Games", {"1003"}), "1003")
+
+    def test_search_falls_back_to_index(self):
+        # the only result is not close enough for the title matcher
+        page = ('<div id="search_result_container"><a class="search_result_row" data-ds-appid="1703340">'
+                '<span class="title">The Stanley Parable: Ultra Deluxe</span></a></div>')
+        response = mock.Mock(text=page)
+        with mock.patch.object(fuzzy_index, "shared", return_value=self.index), \
+                mock.patch("app_index.lookup", return_value=None), \
+                mock.patch.object(http_client, "get", return_value=response):
+            self.assertEqual(SteamSearchGame("Stanley Parable", False).appid, "221910")
+            # not for other stores
+            self.assertEqual(SteamSearchGame("Stanley Parable", False, "non-Steam").appid, 0)
+
+    def test_not_games_left_out(self):
+        self.assertNotIn("orbital drift soundtrack", [name for _, name, _ in self.index.rank("Orbital Drift")])
+        self.assertIsNone(self.index.resolve("Orbital Drift"))
+
+    def test_no_guess_without_store_search(self):
+        with mock.patch.object(fuzzy_index, "shared", return_value=self.index), \
+                mock.patch("app_index.lookup", return_value=None), \
+                mock.patch.object(http_client, "get", side_effect=requests.exceptions.ConnectionError()):
+            self.assertEqual(SteamSearchGame("Stanley Parable", False).appid, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
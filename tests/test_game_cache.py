@@ -0,0 +1,42 @@
+# Tests the in-memory TTL/LRU cache used for Steam app data
+
+import time
+import unittest
+
+from game_cache import TTLCache, MISSING
+
+
+class TTLCacheValidate(unittest.TestCase):
+
+    def test_hit_and_miss(self):
+        cache = TTLCache(maxsize=10, ttl=60)
+        self.assertIs(cache.get("72850"), MISSING)
+        cache.set("72850", {"name": "The Elder Scrolls V: Skyrim"})
+        self.assertEqual(cache.get("72850"), {"name": "The Elder Scrolls V: Skyrim"})
+        self.assertEqual(cache.stats(), {"size": 1, "hits": 1, "misses": 1})
+
+    def test_expired(self):
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set("72850", "price", ttl=0.01)
+        time.sleep(0.02)
+        self.assertIs(cache.get("72850"), MISSING)
+        self.assertFalse(cache.has("72850"))
+
+    def test_lru_eviction(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("1", "a")
+        cache.set("2", "b")
+        cache.get("1")
+        cache.set("3", "c")
+        self.assertEqual(cache.get("1"), "a")
+        self.assertIs(cache.get("2"), MISSING)
+        self.assertEqual(cache.get("3"), "c")
+
+    def test_negative_result(self):
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set("999", False)
+        self.assertIs(cache.get("999"), False)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,271 @@
+# Tests the GameInfo record and that page trees are released after extraction
+
+import gc
+import json
+import os
+import pickle
+import threading
+import tracemalloc
+import unittest
+from unittest import mock
+
+import game_cache
+import html_parser
+import main
+from game_info import BaseGame, Cards, GameInfo
+from SteamGame import SteamGame
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+STORE_PAGE = """<html><head><title>Test Game on Steam</title></head><body>
+<div class="game_area_purchase_game"><h1>Buy Test Game</h1><div class="game_purchase_price">$9.99</div></div>
+<div id="achievement_block"><span></span><div>Includes 12 Steam Achievements</div></div>
+<div id="category_block">Steam Trading Cards</div>
+<div class="user_reviews"><div itemprop="aggregateRating"><span class="game_review_summary">Very Positive</span>
+<span class="nonresponsive_hidden responsive_reviewdesc">- 90% of the 500 user reviews for this game are positive.</span>
+<meta itemprop="reviewCount" content="500"></div></div>
+<div class="popular_tags"><a class="app_tag">Indie</a><a class="app_tag">Puzzle</a></div>
+""" + '<div class="game_area_description"><p>About this game</p></div>' * 500 + "</body></html>"
+
+
+def appdetails(appid):
+    return {appid: {"success": True, "data": {
+        "name": "Test Game " + appid, "type": "game", "is_free": False,
+        "price_overview": {"discount_percent": 0, "final_formatted": "$9.99", "initial_formatted": ""},
+        "package_groups": [{"subs": [{"packageid": 5, "is_free_license": False, "percent_savings_text": ""}]}],
+        "short_description": "A test game.", "genres": [{"id": "23", "description": "Indie"}],
+        "release_date": {"coming_soon": False, "date": "1 Jan, 2020"}, "developers": ["Dev"],
+    }}}
+
+
+class GameInfoValidate(unittest.TestCase):
+
+    def test_immutable(self):
+        game = GameInfo("SteamGame", True, title="Test Game", cards=[8, 4, "url", True])
+        self.assertEqual(game.cards, (8, 4, "url", True))
+        self.assertTrue(game.isfree())
+        with self.assertRaises(AttributeError):
+            game.title = "Other"
+        with self.assertRaises(AttributeError):
+            game.gamePage = None
+
+    def test_no_page_references(self):
+        page = html_parser.parse("<span>Very Positive</span>")
+        game = GameInfo("SteamGame", reviewsummary=page.span.string, title=lambda: None)
+        self.assertIs(type(game.reviewsummary), str)
+        self.assertIsNone(game.title)
+
+    def test_named_records(self):
+        game = GameInfo("SteamGame", basegame=("72850", "Skyrim"), cards=[8, 4, "url", True])
+        self.assertEqual(game.basegame, BaseGame("72850", "Skyrim"))
+        self.assertIsNone(game.basegame.price)
+        self.assertEqual(game.cards, Cards(8, 4, "url", True))
+        self.assertTrue(game.cards.marketable)
+
+
+class GameInfoSnapshotValidate(unittest.TestCase):
+
+    def setUp(self):
+        self.game = GameInfo(
+            "SteamGame", True, ["cards"], appID="1245620", title="Test DLC", price=("Free", ""),
+            basegame=BaseGame("72850", "Skyrim", "$39.99", "", False, False, True), cards=Cards(0, 0))
+
+    def test_round_trip(self):
+        game = GameInfo.loads(self.game.dumps())
+        self.assertEqual(game, self.game)
+        self.assertEqual(game.basegame.title, "Skyrim")
+        self.assertEqual(game.degraded, ("cards",))
+        self.assertTrue(game.isfree())
+
+    def test_pickle(self):
+        self.assertEqual(pickle.loads(pickle.dumps(self.game)), self.game)
+
+    def test_other_version(self):
+        snapshot = self.game.snapshot()
+        snapshot["version"] = 0
+        with self.assertRaises(ValueError):
+            GameInfo.fromsnapshot(snapshot)
+
+    def test_replay_fixtures(self):
+        for name, removed in (("steamgame", False), ("steamremovedgame_dlc", True)):
+            with open(os.path.join(FIXTURES, name + ".json")) as snapshot_file:
+                game = GameInfo.loads(snapshot_file.read())
+            with open(os.path.join(FIXTURES, name + ".txt")) as comment_file:
+                self.assertEqual(main.buildcommenttext(game, removed, "Steam"), comment_file.read())
+
+
+@mock.patch.object(SteamGame, "fetchstorepage", classmethod(lambda cls, url: html_parser.parse(STORE_PAGE)))
+@mock.patch.object(SteamGame, "fetchappdetailsuncached", classmethod(lambda cls, appid: appdetails(appid)))
+@mock.patch.object(SteamGame, "fetchmarketpage", classmethod(lambda cls, url: None))
+@mock.patch.object(SteamGame, "fetchpcgamingwiki", classmethod(lambda cls, appid: False))
+@mock.patch.object(SteamGame, "fetchappreviews", classmethod(lambda cls, url: None))
+class GameInfoMemoryValidate(unittest.TestCase):
+
+    def test_burst_memory_flat(self):
+        games = []
+        gc.collect()
+        # without the garbage collector only released trees are freed
+        gc.disable()
+        tracemalloc.start()
+        try:
+            games.append(GameInfo.fromgame(SteamGame("100")))
+            first_current, first_peak = tracemalloc.get_traced_memory()
+            for appid in range(101, 150):
+                games.append(GameInfo.fromgame(SteamGame(str(appid))))
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+            gc.enable()
+            game_cache.appdetails_cache.clear()
+            game_cache.field_cache.clear()
+        self.assertEqual(games[-1].title, "Test Game 149")
+        self.assertEqual(games[-1].achievements, "12")
+        # only the records and cache entries are kept, not 50 page trees
+        self.assertLess((current - first_current) / 49, 64 * 1024)
+        self.assertLess(peak - first_peak, 49 * 64 * 1024)
+
+
+@mock.patch.object(SteamGame, "fetchstorepage", classmethod(lambda cls, url: None))
+@mock.patch.object(SteamGame, "fetchappdetailsuncached", classmethod(lambda cls, appid: appdetails(appid)))
+@mock.patch.object(SteamGame, "fetchmarketpage", classmethod(lambda cls, url: None))
+@mock.patch.object(SteamGame, "fetchpcgamingwiki", classmethod(lambda cls, appid: None))
+@mock.patch.object(SteamGame, "fetchappreviews", classmethod(lambda cls, url: None))
+class GameUnavailableValidate(unittest.TestCase):
+
+    def tearDown(self):
+        game_cache.appdetails_cache.clear()
+        game_cache.field_cache.clear()
+
+    def test_fallbacks_not_cached(self):
+        game = SteamGame("200")
+        self.assertEqual(game.title, "Test Game 200")
+        self.assertIn("storepage", game.degraded)
+        self.assertIn("market", game.degraded)
+        self.assertIn("pcgamingwiki", game.degraded)
+        self.assertFalse(game.pcgamingwiki)
+        # read from the empty page, fetched again next time
+        for field in ["achievements", "usertags", "cards", "pcgamingwiki"]:
+            self.assertFalse(game_cache.field_cache.has(("200", field)), field)
+
+    def test_marketable_only_with_cards(self):
+        urls = []
+        with mock.patch.object(SteamGame, "fetchmarketpage", classmethod(lambda cls, url: urls.append(url))):
+            game = SteamGame("201")
+            self.assertEqual(game.cards.total, 0)
+        self.assertEqual(urls, [SteamGame.marketurl("201")])
+
+
+@mock.patch.object(SteamGame, "fetchstorepage", classmethod(lambda cls, url: html_parser.parse(STORE_PAGE)))
+@mock.patch.object(SteamGame, "fetchappdetailsuncached", classmethod(lambda cls, appid: appdetails(appid)))
+@mock.patch.object(SteamGame, "fetchpcgamingwiki", classmethod(lambda cls, appid: False))
+@mock.patch.object(SteamGame, "fetchappreviews", classmethod(lambda cls, url: None))
+class MarketValidate(unittest.TestCase):
+
+    def setUp(self):
+        self.fetches = []
+        self.totals = {}
+
+    def tearDown(self):
+        game_cache.appdetails_cache.clear()
+        game_cache.field_cache.clear()
+
+    def fetchmarketpage(self, url):
+        self.fetches.append((url, threading.current_thread().name))
+        return html_parser.parse('<span id="searchResults_total">' + self.totals[url] + '</span>')
+
+    def test_marketable_prefetched_with_cards(self):
+        self.totals = {SteamGame.marketurl("202"): "8", SteamGame.marketableurl("202"): "0"}
+        with mock.patch.object(SteamGame, "fetchmarketpage", classmethod(lambda cls, url: self.fetchmarketpage(url))):
+            game = SteamGame("202")
+        self.assertEqual(game.cards, Cards(8, 4, SteamGame.marketurl("202"), True))
+        # started by the market fetch on the pool, not asked for by getcards after it
+        self.assertEqual([url for url, _ in self.fetches], [SteamGame.marketurl("202"), SteamGame.marketableurl("202")])
+        self.assertTrue(all(thread.startswith("fetch") for _, thread in self.fetches))
+
+    def test_no_marketable_without_cards(self):
+        self.totals = {SteamGame.marketurl("203"): "0"}
+        with mock.patch.object(SteamGame, "fetchmarketpage", classmethod(lambda cls, url: self.fetchmarketpage(url))):
+            game = SteamGame("203")
+        self.assertEqual(game.cards.total, 0)
+        # the market page was read again, the marketable page not at all
+        self.assertEqual([url for url, _ in self.fetches], [SteamGame.marketurl("203")] * 2)
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name)) as fixture_file:
+        return json.load(fixture_file)
+
+
+class JsonFirstValidate(unittest.TestCase):
+    # the store page has other values than the json, each field shows where it was read
+
+    def setUp(self):
+        self.details = fixture("appdetails_json_first.json")
+        self.reviews = []
+        self.pages = []
+        patches = [
+            mock.patch("SteamGame.JSON_FIRST", True),
+            mock.patch.object(SteamGame, "fetchstorepage", classmethod(lambda cls, url: self.storepage(url))),
+            mock.patch.object(SteamGame, "fetchappdetailsuncached", classmethod(lambda cls, appid: self.details)),
+            mock.patch.object(SteamGame, "fetchappreviews", classmethod(lambda cls, url: self.appreviews(url))),
+            mock.patch.object(SteamGame, "fetchmarketpage", classmethod(
+                lambda cls, url: html_parser.parse('<span id="searchResults_total">0</span>'))),
+            mock.patch.object(SteamGame, "fetchpcgamingwiki", classmethod(lambda cls, appid: False)),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.addCleanup(game_cache.appdetails_cache.clear)
+        self.addCleanup(game_cache.field_cache.clear)
+
+    def storepage(self, url):
+        self.pages.append(url)
+        return html_parser.parse(STORE_PAGE.replace(
+            "<body>", '<body><div class="game_area_comingsoon"><h1>Planned release: Q3</h1></div>'))
+
+    def appreviews(self, url):
+        self.reviews.append(url)
+        return fixture("appreviews_summary.json")
+
+    def test_fields_from_json(self):
+        game = SteamGame("300")
+        self.assertEqual(game.achievements, "34")
+        # genre 70, the page has no early access header
+        self.assertTrue(game.isearlyaccess)
+        # the page shows the coming soon box, the json says released
+        self.assertFalse(game.unreleased)
+        self.assertIsNone(game.unreleasedtext)
+        # content descriptors, the page has no mature content notice
+        self.assertTrue(game.nsfw)
+        self.assertEqual(game.reviewsummary, "Overwhelmingly Positive")
+        self.assertEqual(game.reviewdetails, " (95% of the 2000 user reviews are positive)")
+        self.assertFalse(game.lowreviews)
+        # the totals without review texts
+        self.assertIn(SteamGame.reviewssummaryurl("300"), self.reviews)
+        self.assertIn("num_per_page=0", SteamGame.reviewssummaryurl("300"))
+
+    def test_no_content_descriptors(self):
+        del self.details["300"]["data"]["content_descriptors"]
+        self.details["300"]["data"]["genres"] = [{"id": "25", "description": "Adventure"}]
+        game = SteamGame("300")
+        self.assertFalse(game.nsfw)
+        self.assertFalse(game.isearlyaccess)
+
+    def test_unreleased_text_from_page(self):
+        self.details["300"]["data"]["release_date"] = {"coming_soon": True, "date": "Q3"}
+        game = SteamGame("300")
+        self.assertTrue(game.unreleased)
+        self.assertEqual(game.unreleasedtext, "Planned release: Q3")
+
+    def test_cold_lookup_reads_store_page(self):
+        # the tags are only on the store page
+        game = SteamGame("300")
+        self.assertEqual(len(self.pages), 1)
+        self.assertIn("Indie", game.usertags)
+        # warm, the tags are cached
+        SteamGame("300")
+        self.assertEqual(len(self.pages), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+# Tests the title matcher used for store search and steam-tracker results
+
+import unittest
+
+import game_names
+from game_names import TitleMatcher
+
+
+class TitleMatcherValidate(unittest.TestCase):
+
+    def test_tiers(self):
+        matcher = TitleMatcher("Half-Life 2")
+        self.assertEqual(matcher.tier("Half-Life 2"), game_names.EXACT)
+        self.assertEqual(matcher.tier("2 Half-Life"), game_names.WORDS)
+        self.assertEqual(matcher.tier("Hlaf-Life 2"), game_names.ANAGRAM)
+        self.assertEqual(matcher.tier("Half-Life II"), game_names.VARIANT)
+        self.assertIsNone(matcher.tier("Half-Life 2: Episode One"))
+        self.assertEqual(matcher.tier("Half-Life 2: Episode One", substring=True), game_names.SUBSTRING)
+        self.assertEqual(matcher.tier("Half-Life 2: Deathmatch", subset=True), game_names.SUBSET)
+        self.assertIsNone(matcher.tier("Half-Life 2: Episode One Soundtrack", subset=True))
+
+    def test_best_tier_wins(self):
+        results = [("Portal Demo", "1"), ("Protal", "2"), ("Portal", "400")]
+        self.assertEqual(TitleMatcher("Portal").best(results), "400")
+        self.assertEqual(TitleMatcher("Portal").best(results[:2]), "2")
+        self.assertIsNone(TitleMatcher("Portal").best(results[:1]))
+        self.assertEqual(TitleMatcher("Portal").best(results[:1], subset=True), "1")
+
+    def test_first_in_tier(self):
+        results = [("Portal Stories", "1"), ("Portal Demo", "2")]
+        self.assertEqual(TitleMatcher("Portal").best(results, substring=True), "1")
+
+    def test_random_not_substring(self):
+        self.assertIsNone(TitleMatcher("Random Game").best([("Random Game Bundle", "1")], substring=True))
+
+    def test_dlc_and_numerals(self):
+        self.assertEqual(TitleMatcher("Final Fantasy VII DLC").best([("FINAL FANTASY 7", "39140")]), "39140")
+        self.assertEqual(game_names.write_roman(14), "xiv")
+        self.assertEqual(game_names.write_num("xiv"), "14")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+# Tests the persistent game info store
+
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import game_cache
+from game_store import GameStore, TTL
+
+
+class FakeGame:
+    fetches = 0
+    PRICE = ("Free", "")
+
+    def __init__(self, appid):
+        FakeGame.fetches += 1
+        self.appID = appid
+        self.title = "Fake Game"
+        self.price = FakeGame.PRICE
+        self.cards = (8, 4, "https://steamcommunity.com/market/", True)
+
+    def isfree(self):
+        return self.json["is_free"] if hasattr(self, "json") else True
+
+
+class GameStoreValidate(unittest.TestCase):
+
+    def setUp(self):
+        FakeGame.fetches = 0
+        ttl = mock.patch.dict(TTL, {"FakeGame": TTL["SteamGame"]})
+        ttl.start()
+        self.addCleanup(ttl.stop)
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = GameStore(os.path.join(self.directory.name, "games.db"), maxsize=2)
+
+    def tearDown(self):
+        self.store.refresh_executor.shutdown(wait=True)
+        self.store.connection.close()
+        self.directory.cleanup()
+
+    def test_restore_fields(self):
+        self.store.get(FakeGame, "1")
+        game = self.store.get(FakeGame, "1")
+        self.assertEqual(FakeGame.fetches, 1)
+        self.assertEqual(game.title, "Fake Game")
+        self.assertEqual(game.price, ("Free", ""))
+        self.assertEqual(game.cards[0], 8)
+        self.assertTrue(game.isfree())
+
+    def test_stale_entry_is_refreshed(self):
+        self.store.get(FakeGame, "1")
+        # past the soft ttl, within the hard one
+        self.store.connection.execute("UPDATE games SET snapshot = snapshot - ?", (TTL["SteamGame"][0] + 1,))
+        game = self.store.get(FakeGame, "1")
+        self.assertEqual(game.title, "Fake Game")
+        self.store.refresh_executor.shutdown(wait=True)
+        self.assertEqual(FakeGame.fetches, 2)
+        self.assertLess(time.time() - self.store.load("FakeGame", "1")[0], 60)
+
+    def test_no_old_price(self):
+        self.store.get(FakeGame, "1")
+        self.store.connection.execute("UPDATE games SET snapshot = snapshot - ?", (game_cache.FAST_TTL,))
+        # the discount ended since the snapshot
+        with mock.patch.object(FakeGame, "PRICE", ("$9.99", "")):
+            game = self.store.get(FakeGame, "1")
+        self.assertEqual(game.price, ("$9.99", ""))
+        self.assertEqual(FakeGame.fetches, 2)
+
+    def test_contains(self):
+        self.assertFalse(self.store.contains(FakeGame, "1"))
+        self.store.get(FakeGame, "1")
+        self.assertTrue(self.store.contains(FakeGame, "1"))
+        self.store.connection.execute("UPDATE games SET snapshot = snapshot - 2 * 86400")
+        self.assertFalse(self.store.contains(FakeGame, "1"))
+
+    def test_size_eviction(self):
+        for appid in ["1", "2", "3"]:
+            self.store.get(FakeGame, appid)
+        self.assertIsNone(self.store.load("FakeGame", "1"))
+        self.assertEqual(self.store.purge(), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
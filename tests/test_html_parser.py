@@ -0,0 +1,38 @@
+# Tests that the page strainers keep the parts that are read
+
+import unittest
+
+import html_parser
+
+
+class HtmlParserValidate(unittest.TestCase):
+
+    def test_search_results_kept(self):
+        page = html_parser.parse(
+            '<html><body><div id="nav"><a href="/">Store</a></div><div id="search_result_container">'
+            '<a class="search_result_row" data-ds-appid="72850">Skyrim</a></div></body></html>', "search")
+        rows = page.find("div", id="search_result_container").find_all("a", {"class": "search_result_row"})
+        self.assertEqual([row["data-ds-appid"] for row in rows], ["72850"])
+        self.assertIsNone(page.find("div", id="nav"))
+
+    def test_keyhub_level_kept(self):
+        page = html_parser.parse('<div><p>Giveaway</p><span class="friendPlayerLevelNum">10</span></div>', "keyhub")
+        self.assertEqual(page.find("span", class_="friendPlayerLevelNum").text, "10")
+        self.assertIsNone(page.find("p"))
+
+    def test_whole_page_without_strainer(self):
+        page = html_parser.parse("<html><head><title>Skyrim on Steam</title></head></html>", "store")
+        self.assertEqual(page.title.string, "Skyrim on Steam")
+
+    def test_empty(self):
+        self.assertIsNone(html_parser.empty().title)
+
+    def test_free(self):
+        page = html_parser.parse("<html><body><p>Skyrim</p></body></html>")
+        paragraph = page.p
+        html_parser.free(page)
+        self.assertTrue(paragraph.decomposed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+# Tests reading streamed pages
+
+import re
+import time
+import unittest
+from unittest import mock
+
+import http_client
+import retry
+
+
+class FakeResponse:
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.read = 0
+        self.closed = False
+        self.encoding = "utf-8"
+        self.url = "https://store.steampowered.com/app/1"
+
+    def iter_content(self, chunk_size):
+        for chunk in self.chunks:
+            self.read += 1
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+
+class ReadTextValidate(unittest.TestCase):
+
+    def test_stops_at_marker(self):
+        response = FakeResponse([b"<html><div>tags</div>", b'<div id="app_reviews_hash">', b"reviews", b"</html>"])
+        text = http_client.read_text(response, re.compile(r'id="app_reviews_hash"'))
+        self.assertEqual(text, '<html><div>tags</div><div id="app_reviews_hash">')
+        self.assertEqual(response.read, 2)
+        self.assertTrue(response.closed)
+
+    def test_marker_split_between_chunks(self):
+        response = FakeResponse([b"<html>" + b"x" * 100 + b'<div id="app_rev', b'iews_hash">', b"reviews"])
+        text = http_client.read_text(response, re.compile(r'id="app_reviews_hash"'))
+        self.assertTrue(text.endswith('<div id="app_reviews_hash">'))
+        self.assertEqual(response.read, 2)
+
+    def test_reads_to_end_without_marker(self):
+        response = FakeResponse([b"<html>", b"</html>"])
+        self.assertEqual(http_client.read_text(response, re.compile("missing")), "<html></html>")
+
+    def test_byte_cap(self):
+        response = FakeResponse([b"a" * 10, b"b" * 10, b"c" * 10])
+        self.assertEqual(http_client.read_text(response, max_bytes=15), "a" * 10 + "b" * 10)
+        self.assertTrue(response.closed)
+
+    def test_split_characters(self):
+        euro = "€".encode("utf-8")
+        response = FakeResponse([b"price " + euro[:1], euro[1:] + b"5"])
+        self.assertEqual(http_client.read_text(response), "price €5")
+
+
+class GetValidate(unittest.TestCase):
+
+    def test_throttled_trial_request(self):
+        url = "https://throttled.example/app/1"
+        breaker = retry.breaker_for(url)
+        breaker.reset = 0.01
+        for _ in range(breaker.threshold):
+            breaker.failure()
+        time.sleep(0.02)
+        throttled = mock.Mock(status_code=429, headers={"Retry-After": "0"})
+        answers = [throttled, mock.Mock(status_code=200, headers={})]
+        with mock.patch.object(http_client.session, "get", side_effect=answers):
+            # the retry after the 429 is the new trial request and closes the breaker
+            self.assertEqual(http_client.get(url).status_code, 200)
+        self.assertFalse(breaker.isopen())
+        self.assertFalse(breaker.trial)
+        with mock.patch.object(http_client.session, "get", return_value=mock.Mock(status_code=200, headers={})):
+            http_client.get(url)
+
+    def test_throttled_until_retries_run_out(self):
+        url = "https://throttled.example/app/2"
+        throttled = mock.Mock(status_code=429, headers={"Retry-After": "0"})
+        with mock.patch.object(http_client.session, "get", return_value=throttled) as get, \
+                mock.patch.object(http_client.rate_limit, "pause") as pause:
+            with self.assertRaises(retry.HostUnavailable):
+                http_client.get(url)
+        self.assertEqual(get.call_count, http_client.THROTTLE_RETRIES + 1)
+        # no pause for a retry that is not sent
+        self.assertEqual(pause.call_count, http_client.THROTTLE_RETRIES)
+        self.assertFalse(retry.breaker_for(url).isopen())
+
+
+if __name__ == '__main__':
+    unittest.main()
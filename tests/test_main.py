@@ -0,0 +1,123 @@
+# Tests the handlers shared by the watcher threads and the asyncio entry point
+
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import main
+import work_pool
+
+BODY = "**Giveaway details**\n\n* Available keys: 5\n* Total keys: 10\n\n*Updating available keys every minute*\n\n***\nFooter"
+
+
+def giveawaycomment(age):
+    submission = SimpleNamespace(url="https://igames.gg/promotions/123", created_utc=time.time() - age, mod=mock.Mock())
+    return SimpleNamespace(body=BODY, submission=submission, edit=mock.Mock(), banned_by=None, created_utc=time.time() - age)
+
+
+class GiveawayRefreshValidate(unittest.TestCase):
+
+    def test_expired_longlasting(self):
+        comment = giveawaycomment(7200)
+        keys = SimpleNamespace(key_amount="0", key_claimed="10", key_total="10", gg_app=False)
+        with mock.patch.object(main, "iGames", return_value=keys):
+            self.assertTrue(main.refreshgiveawaycomment(comment, "30 minutes"))
+        comment.submission.mod.flair.assert_called_once()
+        body = comment.edit.call_args[1]["body"]
+        self.assertIn("* Available keys: 0\n* Keys already claimed: 10\n* Total keys: 10", body)
+        self.assertIn("*Giveaway lasted for 2 hours*", body)
+        self.assertNotIn("Updating available keys", body)
+
+    def test_unchanged(self):
+        comment = giveawaycomment(60)
+        keys = SimpleNamespace(key_amount="5", key_claimed="0", key_total="10", gg_app=False)
+        with mock.patch.object(main, "iGames", return_value=keys):
+            self.assertTrue(main.refreshgiveawaycomment(comment, "minute"))
+        comment.edit.assert_not_called()
+
+    def test_other_website_skipped(self):
+        comment = giveawaycomment(60)
+        comment.submission.url = "https://example.com/giveaway"
+        self.assertFalse(main.refreshgiveawaycomment(comment, "minute"))
+
+    def test_selection(self):
+        self.assertTrue(main.isgiveawaycomment(giveawaycomment(60), False))
+        self.assertFalse(main.isgiveawaycomment(giveawaycomment(60), True))
+        self.assertTrue(main.isgiveawaycomment(giveawaycomment(20000), True))
+        self.assertEqual(main.giveawaysleeptime(4, False), 15)
+        self.assertEqual(main.giveawaysleeptime(20, True), 180)
+
+
+class SubmissionLaneValidate(unittest.TestCase):
+
+    def test_lanes(self):
+        self.assertEqual(main.submissionlane(SimpleNamespace(url="https://games.crucial.com/promotions/12")), work_pool.LANE_GIVEAWAY)
+        self.assertEqual(main.submissionlane(SimpleNamespace(url="https://eu.alienwarearena.com/ucf/show/123")), work_pool.LANE_GIVEAWAY)
+        self.assertEqual(main.submissionlane(SimpleNamespace(url="https://store.steampowered.com/app/220")), work_pool.LANE_GAME)
+
+
+class SteamTitleValidate(unittest.TestCase):
+
+    def test_empty_store_page_falls_back_to_removed(self):
+        # the app index answered with a delisted app, its store page is gone
+        resolution = mock.Mock(store=SimpleNamespace(appid="111"))
+        resolution.removed.return_value = SimpleNamespace(appid="222")
+        resolution.page.side_effect = lambda cls, appid: cls.__name__ + " " + appid
+        submission = SimpleNamespace(
+            banned_by=None, title="[Steam] (Game) Gone Game", url="https://example.com/gone",
+            link_flair_text=None, mod=mock.Mock(), over_18=False)
+
+        def buildcommenttext(game, removed, source):
+            return "*Removed from Steam*\n\n" if game == "SteamRemovedGame 222" else ""
+
+        with mock.patch.object(main, "Resolution", return_value=resolution), \
+                mock.patch.object(main, "fitscriteria", return_value=True), \
+                mock.patch.object(main.game_store, "get", side_effect=lambda cls, appid: cls.__name__ + " " + appid), \
+                mock.patch.object(main, "buildcommenttext", side_effect=buildcommenttext), \
+                mock.patch.object(main, "buildfootertext", return_value="Footer"), \
+                mock.patch.object(main, "replyto") as replyto:
+            main.handlesubmission(submission)
+        replyto.assert_called_once_with(submission, "*Removed from Steam*\n\nFooter")
+
+
+class BudgetValidate(unittest.TestCase):
+
+    def test_starts_after_criteria(self):
+        # checking the replies on Reddit does not use up the time for the game pages
+        remaining = []
+        criteria = mock.Mock(side_effect=lambda s: remaining.append(("fitscriteria", main.budget.remaining())) or fits)
+        submission = SimpleNamespace(
+            banned_by=None, title="Free game", url="https://store.steampowered.com/app/220", link_flair_text=None)
+
+        def get(cls, appid):
+            remaining.append(("get", main.budget.remaining()))
+
+        with mock.patch.object(main, "fitscriteria", criteria), \
+                mock.patch.object(main.game_store, "get", side_effect=get), \
+                mock.patch.object(main, "buildcommenttext", return_value=""):
+            fits = False
+            main.handlesubmission(submission)
+            fits = True
+            main.handlesubmission(submission)
+        self.assertEqual([name for name, _ in remaining], ["fitscriteria", "fitscriteria", "get"])
+        self.assertEqual([seconds for _, seconds in remaining[:2]], [None, None])
+        self.assertGreater(remaining[2][1], 0)
+        # the worker thread keeps no deadline for its next item
+        self.assertIsNone(main.budget.remaining())
+
+
+class EnrichCommentValidate(unittest.TestCase):
+
+    def test_failure_printed(self):
+        # the enrich pool would drop the exception with its future
+        reply = mock.Mock()
+        with mock.patch.object(main.game_store, "get", side_effect=ValueError("page")), \
+                mock.patch.object(main.traceback, "print_exc") as print_exc:
+            main.enrichcomment(reply, mock.Mock(), "111", "Steam")
+        print_exc.assert_called_once_with()
+        reply.edit.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+# Tests the store page index used by the SteamGame fields
+
+import unittest
+
+import html_parser
+from page_index import PageIndex
+
+STORE_PAGE = """<html><body>
+<div class="game_area_purchase_game"><h1>Buy Game</h1><p class="game_purchase_discount_countdown">Ends</p></div>
+<div class="game_area_purchase_game bundle"><h1>Buy Bundle</h1></div>
+<div id="achievement_block"><span></span><div>Includes 12 Steam Achievements</div></div>
+<div class="block user_reviews"><span class="game_review_summary">Positive</span></div>
+<span class="popular_tags">not a div</span>
+</body></html>"""
+
+
+class PageIndexValidate(unittest.TestCase):
+    index = PageIndex(html_parser.parse(STORE_PAGE))
+
+    def test_first_node(self):
+        self.assertEqual(self.index.find("purchase_game").h1.text, "Buy Game")
+        self.assertEqual(self.index.find("user_reviews").span.string, "Positive")
+
+    def test_all_nodes(self):
+        self.assertEqual([node.h1.text for node in self.index.find_all("purchase_game")], ["Buy Game", "Buy Bundle"])
+
+    def test_by_id(self):
+        self.assertEqual(self.index.find("achievement_block").contents[1].string, "Includes 12 Steam Achievements")
+
+    def test_missing(self):
+        self.assertIsNone(self.index.find("popular_tags"))
+        self.assertIsNone(self.index.find("learning_about"))
+        self.assertEqual(self.index.find_all("comingsoon"), [])
+
+    def test_outermost(self):
+        nodes = self.index.outermost()
+        self.assertEqual([node.name for node in nodes], ["div", "div", "div", "div"])
+        # the countdown is inside the first purchase block
+        self.assertIs(self.index.find("discount_countdown").parent, nodes[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
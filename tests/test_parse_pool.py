@@ -0,0 +1,80 @@
+# Tests the page extraction steps that can run in a parse worker process
+
+import pickle
+import unittest
+from unittest import mock
+
+import parse_pool
+from SteamGame import SteamGame
+from SteamRemovedGame import SteamRemovedGame
+from SteamSearchGame import SteamSearchGame
+
+STORE_PAGE = """<html><head><title>Test Game on Steam</title></head><body>
+<div class="page_header"><p>Header</p></div>
+<div class="game_area_purchase_game"><h1>Buy Test Game</h1><p class="game_purchase_discount_countdown">Ends</p></div>
+<div id="achievement_block"><span></span><div>Includes 12 Steam Achievements</div></div>
+<div class="user_reviews"><div itemprop="aggregateRating"><span class="game_review_summary">Very Positive</span>
+<span class="nonresponsive_hidden responsive_reviewdesc">- 90% of the 500 user reviews for this game are positive.</span>
+<meta itemprop="reviewCount" content="500"></div></div>
+<div class="game_area_description"><p>About this game</p></div>
+</body></html>"""
+
+ARCHIVED_PAGE = """<html><head><title>Test Game on Steam</title></head><body>
+<div class="game_description_snippet"> An old test game. </div>
+<div class="release_date"><div class="date">1 Jan, 2015</div></div>
+<div class="details_block"><a href="https://store.steampowered.com/genre/Indie/">Indie</a></div>
+<div id="developers_list"><a>Dev</a></div>
+<div class="game_purchase_price">$4.99</div>
+<div id="category_block">Steam Trading Cards</div>
+</body></html>"""
+
+SEARCH_PAGE = """<div id="search_result_container">
+<a class="search_result_row" data-ds-appid="220"><span class="title">Half-Life 2</span></a>
+<a class="search_result_row" data-ds-appid="400"><span class="title">Portal</span></a>
+</div>"""
+
+
+class ParsePoolValidate(unittest.TestCase):
+
+    def test_compact_store_page(self):
+        compact = SteamGame.compactstorepage(STORE_PAGE)
+        self.assertNotIn("page_header", compact)
+        self.assertNotIn("About this game", compact)
+        with mock.patch.object(SteamGame, "fetchstoretext", classmethod(lambda cls, url: STORE_PAGE)), \
+                mock.patch.object(parse_pool, "PARSE_WORKERS", 1), \
+                mock.patch.object(parse_pool, "run", lambda fn, *args: fn(*args)):
+            game = SteamGame.__new__(SteamGame)
+            game.gamePage = SteamGame.fetchstorepage("https://store.steampowered.com/app/1")
+        self.assertEqual(game.gamePage.title.string, "Test Game on Steam")
+        self.assertEqual(game.getachev(), "12")
+        self.assertEqual(game.reviewdetailspage(), (" (90% of the 500 user reviews are positive)", 500))
+        self.assertEqual(SteamGame.page(game).find("discount_countdown").text, "Ends")
+
+    def test_archived_page_fields(self):
+        fields = SteamRemovedGame.extract("10", ARCHIVED_PAGE)
+        self.assertEqual(fields["title"], "Test Game")
+        self.assertEqual(fields["gettype"], "game")
+        self.assertEqual(fields["blurb"], "An old test game.")
+        self.assertEqual(fields["releasedate"], "January 1, 2015")
+        self.assertEqual(fields["genres"], "Indie")
+        self.assertEqual((fields["developers"], fields["developers_num"]), ("Dev", 1))
+        self.assertTrue(fields["cards_tag"])
+        self.assertIsNone(fields["review_details"])
+        self.assertNotIn("gamePage", fields)
+        self.assertEqual(pickle.loads(pickle.dumps(fields)), fields)
+
+    def test_search_results_in_worker(self):
+        with mock.patch.object(parse_pool, "PARSE_WORKERS", 1):
+            try:
+                results = parse_pool.run(SteamSearchGame.searchresults, SEARCH_PAGE)
+            finally:
+                parse_pool.shutdown()
+        self.assertEqual(results, [("Half-Life 2", "220"), ("Portal", "400")])
+        search = SteamSearchGame.__new__(SteamSearchGame)
+        search.game_name = "Half Life II"
+        search.results = results
+        self.assertEqual(search.appid("Steam"), "220")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+# Tests the per-host token buckets
+
+import threading
+import time
+import unittest
+
+from requests.models import Response
+
+import rate_limit
+from rate_limit import TokenBucket, PRIORITY_NEW, PRIORITY_BACKGROUND
+
+
+class RateLimitValidate(unittest.TestCase):
+
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(rate=20, burst=2)
+        start = time.monotonic()
+        for i in range(4):
+            bucket.acquire()
+        # two tokens from the burst, two refilled at 20 per second
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_pause(self):
+        bucket = TokenBucket(rate=100, burst=5)
+        bucket.pause(0.1)
+        start = time.monotonic()
+        bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_priority_lane_goes_first(self):
+        bucket = TokenBucket(rate=10, burst=1)
+        bucket.acquire()
+        order = []
+
+        def take(lane, name):
+            bucket.acquire(lane)
+            order.append(name)
+
+        background = threading.Thread(target=take, args=(PRIORITY_BACKGROUND, "refresh"))
+        background.start()
+        time.sleep(0.02)
+        new = threading.Thread(target=take, args=(PRIORITY_NEW, "new post"))
+        new.start()
+        background.join()
+        new.join()
+        self.assertEqual(order, ["new post", "refresh"])
+
+    def test_retry_after(self):
+        response = Response()
+        response.status_code = 429
+        response.headers["Retry-After"] = "7"
+        self.assertEqual(rate_limit.retry_after(response), 7)
+
+    def test_retry_after_capped(self):
+        response = Response()
+        response.status_code = 429
+        response.headers["Retry-After"] = "3600"
+        self.assertEqual(rate_limit.retry_after(response), rate_limit.MAX_RETRY_AFTER)
+
+    def test_pause_without_bucket(self):
+        response = Response()
+        response.status_code = 429
+        response.headers["Retry-After"] = "1"
+        url = "https://www.pcgamingwiki.com/api/appid.php?appid=1"
+        start = time.monotonic()
+        rate_limit.pause(url, response)
+        # recorded, not slept
+        self.assertLess(time.monotonic() - start, 0.5)
+        rate_limit.acquire("https://example.com/")
+        self.assertLess(time.monotonic() - start, 0.5)
+        rate_limit.acquire(url)
+        self.assertGreaterEqual(time.monotonic() - start, 0.9)
+
+    def test_subdomain_shares_bucket(self):
+        self.assertIs(rate_limit.bucket_for("https://eu.alienwarearena.com/ucf/show/1"),
+                      rate_limit.bucket_for("https://www.alienwarearena.com/ucf/show/2"))
+        self.assertIsNone(rate_limit.bucket_for("https://example.com/"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+# Tests the local index of steam-tracker's banned and delisted lists
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import http_client
+import removed_index
+from removed_index import RemovedIndex
+from SteamSearchGame import SteamSearchGame
+
+BANNED_URL = "https://steam-tracker.com/apps/banned"
+DELISTED_URL = "https://steam-tracker.com/apps/delisted"
+BACKUP_URL = "https://backup.example/banned"
+
+
+def trackerpage(apps):
+    links = "".join('<tr><td><a href="/app/' + appid + '/">' + name + '</a></td></tr>' for appid, name in apps)
+    return '<html><a href="/apps/banned">Banned</a><table>' + links + '</table></html>'
+
+
+def tablepage(apps):
+    rows = "".join('<tr data-type="app" data-id="' + appid + '"><td><a>' + name + '</a></td></tr>'
+                   for appid, name in apps)
+    return '<table>' + rows + '</table>'
+
+
+class FakeSite:
+    # answers like a site with ETags, and records the request headers
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requests = []
+
+    def get(self, url, timeout=30, headers=None, **kwargs):
+        self.requests.append((url, headers or {}))
+        etag = '"' + str(hash(self.pages[url])) + '"'
+        if (headers or {}).get("If-None-Match") == etag:
+            return mock.Mock(status_code=304)
+        return mock.Mock(status_code=200, text=self.pages[url], headers={"ETag": etag})
+
+
+class RemovedIndexValidate(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "removedapps.db")
+        self.sources = [
+            ("banned", BANNED_URL, removed_index.trackerrows),
+            ("delisted", DELISTED_URL, removed_index.trackerrows),
+            ("banned", BACKUP_URL, removed_index.tablerows),
+        ]
+        self.site = FakeSite({
+            BANNED_URL: trackerpage([("100", "Ghost Game"), ("101", "Hlaf Life"), ("102", "Ghost Game Deluxe")]),
+            DELISTED_URL: trackerpage([("200", "Trials of the Illuminati: Animal Kingdom"), ("201", "Old Game II"),
+                                       ("202", "Swarm Simulator"), ("203", "Tank War")]),
+            BACKUP_URL: tablepage([("300", "Backup Only Game")]),
+        })
+        self.index = RemovedIndex(self.path, self.sources)
+        with mock.patch.object(http_client, "get", self.site.get):
+            self.assertTrue(removed_index.refresh(self.index))
+
+    def tearDown(self):
+        self.index.connection.close()
+        self.directory.cleanup()
+
+    def test_lookup(self):
+        self.assertEqual(self.index.lookup("Ghost Game"), "100")
+        # typo on the list
+        self.assertEqual(self.index.lookup("Half Life"), "101")
+        # numeral variant, delisted when not banned
+        self.assertEqual(self.index.lookup("Old Game 2"), "201")
+        # substring of a listed name, first one in page order
+        self.assertEqual(self.index.lookup("Animal Kingdom"), "200")
+        # whole words only, not the first name with the letters inside a word
+        self.assertEqual(self.index.lookup("War"), "203")
+        self.assertIsNone(self.index.lookup("Simul"))
+        # second source
+        self.assertEqual(self.index.lookup("Backup Only Game"), "300")
+        self.assertIsNone(self.index.lookup("Unknown Game"))
+
+    def test_conditional_refresh(self):
+        with mock.patch.object(http_client, "get", self.site.get):
+            self.assertEqual(self.index.refresh(self.sources[0]), 0)
+        url, headers = self.site.requests[-1]
+        self.assertEqual(url, BANNED_URL)
+        self.assertIn("If-None-Match", headers)
+        self.assertEqual(self.index.lookup("Ghost Game"), "100")
+
+    def test_incremental_refresh(self):
+        self.site.pages[BANNED_URL] = trackerpage([("103", "New Game"), ("100", "Ghost Game"), ("102", "Ghost Game Deluxe")])
+        with mock.patch.object(http_client, "get", self.site.get):
+            # one added, one gone, the others only moved down
+            self.assertEqual(self.index.refresh(self.sources[0]), 2)
+        self.assertEqual(self.index.lookup("New Game"), "103")
+        self.assertIsNone(self.index.lookup("Half Life"))
+        # kept on disk for the next start
+        self.assertEqual(RemovedIndex(self.path, self.sources).lookup("New Game"), "103")
+
+    def test_unavailable_keeps_index(self):
+        self.site.pages[BANNED_URL] = "<html>Service unavailable</html>"
+        with mock.patch.object(http_client, "get", self.site.get):
+            self.assertFalse(removed_index.refresh(self.index, self.sources[:1]))
+        self.assertEqual(self.index.lookup("Ghost Game"), "100")
+
+    def test_search_answered_from_index(self):
+        with mock.patch.object(removed_index, "shared", return_value=self.index), \
+                mock.patch.object(http_client, "get", side_effect=AssertionError("list download")):
+            self.assertEqual(SteamSearchGame("TOTI: Animal Kingdom", True).appid, "200")
+            self.assertEqual(SteamSearchGame("Unknown Game", True).appid, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
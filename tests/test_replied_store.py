@@ -0,0 +1,65 @@
+# Tests the store of things the bot already replied to
+
+import os
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import main
+import replied_store
+from replied_store import BloomFilter, RepliedStore
+
+
+class Submission(SimpleNamespace):
+    # named like praw's, hasbotalreadyreplied tells the kinds apart by type name
+    pass
+
+
+class RepliedStoreValidate(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "replied.db")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_bloom_filter(self):
+        bloom = BloomFilter(1000)
+        for number in range(1000):
+            bloom.add("t3_" + str(number))
+        self.assertTrue(all("t3_" + str(number) in bloom for number in range(1000)))
+        false_positives = sum("t1_" + str(number) in bloom for number in range(1000))
+        self.assertLess(false_positives, 50)
+
+    def test_persisted(self):
+        store = RepliedStore(self.path)
+        store.add("t3_abc")
+        store.add("t1_def", "skipped")
+        self.assertFalse(store.contains("t3_other"))
+        reopened = RepliedStore(self.path)
+        self.assertTrue(reopened.contains("t3_abc") and reopened.contains("t1_def"))
+        self.assertEqual(reopened.created, store.created)
+
+    def test_no_scan_when_covered(self):
+        store = RepliedStore(self.path)
+        submission = Submission(fullname="t3_new", created_utc=time.time())
+        with mock.patch.object(replied_store, "store", store):
+            # no comments attribute, reading it would fail the test
+            self.assertFalse(main.hasbotalreadyreplied(submission))
+            main.replyto(SimpleNamespace(fullname="t3_new", reply=lambda body: "reply"), "text")
+            self.assertTrue(main.hasbotalreadyreplied(submission))
+
+    def test_scan_before_store(self):
+        store = RepliedStore(self.path)
+        bot_reply = SimpleNamespace(author=main.BOT_USERNAME)
+        submission = Submission(fullname="t3_old", created_utc=store.created - 60, comments=[bot_reply])
+        with mock.patch.object(replied_store, "store", store):
+            self.assertTrue(main.hasbotalreadyreplied(submission))
+        self.assertTrue(store.contains("t3_old"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+# Tests the retry policy and the per-host circuit breakers
+
+import time
+import unittest
+
+from retry import RetryPolicy, CircuitBreaker, HostUnavailable
+
+
+class RetryValidate(unittest.TestCase):
+
+    def test_backoff_is_capped(self):
+        policy = RetryPolicy(attempts=10, base=2, cap=5)
+        for attempt in range(1, 10):
+            self.assertLessEqual(policy.backoff(attempt), 5)
+        self.assertLessEqual(policy.backoff(1), 2)
+
+    def test_breaker_opens(self):
+        breaker = CircuitBreaker("web.archive.org", threshold=3, reset=60)
+        for i in range(3):
+            breaker.check()
+            breaker.failure()
+        self.assertTrue(breaker.isopen())
+        with self.assertRaises(HostUnavailable):
+            breaker.check()
+
+    def test_breaker_trial_request(self):
+        breaker = CircuitBreaker("web.archive.org", threshold=1, reset=0.05)
+        breaker.failure()
+        time.sleep(0.06)
+        # one request is let through, others still fail fast
+        breaker.check()
+        with self.assertRaises(HostUnavailable):
+            breaker.check()
+        breaker.success()
+        self.assertFalse(breaker.isopen())
+        breaker.check()
+
+    def test_breaker_trial_released(self):
+        breaker = CircuitBreaker("steamcommunity.com", threshold=1, reset=0.05)
+        breaker.failure()
+        time.sleep(0.06)
+        breaker.check()
+        # throttled trial, the next request may try again
+        breaker.release()
+        breaker.check()
+        with self.assertRaises(HostUnavailable):
+            breaker.check()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+# Tests coalescing of concurrent lookups for the same key
+
+import threading
+import time
+import unittest
+
+from single_flight import SingleFlight
+
+
+class SingleFlightValidate(unittest.TestCase):
+
+    def test_concurrent_calls_share_result(self):
+        flights = SingleFlight()
+        calls = []
+
+        def fetch(appid):
+            calls.append(appid)
+            time.sleep(0.1)
+            return "game " + appid
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(flights.do("72850", fetch, "72850"))) for i in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(calls, ["72850"])
+        self.assertEqual(results, ["game 72850"] * 5)
+        self.assertEqual(flights.inflight(), 0)
+
+    def test_error_is_shared(self):
+        flights = SingleFlight()
+        calls = []
+        started = threading.Event()
+        release = threading.Event()
+
+        def fail():
+            calls.append("72850")
+            started.set()
+            release.wait(5)
+            raise ValueError("store down")
+
+        errors = {}
+
+        def lookup(name):
+            try:
+                flights.do("72850", fail)
+            except ValueError as error:
+                errors[name] = error
+
+        leader = threading.Thread(target=lookup, args=("leader",))
+        leader.start()
+        started.wait(5)
+        follower = threading.Thread(target=lookup, args=("follower",))
+        follower.start()
+        # the follower is waiting on the leader's flight
+        time.sleep(0.1)
+        release.set()
+        leader.join()
+        follower.join()
+        self.assertEqual(calls, ["72850"])
+        self.assertIs(errors["leader"], errors["follower"])
+        # not remembered, the next lookup tries again
+        self.assertEqual(flights.do("72850", lambda: "retry"), "retry")
+
+
+if __name__ == '__main__':
+    unittest.main()
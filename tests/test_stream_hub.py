@@ -0,0 +1,73 @@
+# Tests the StreamHub that polls each Reddit listing once for all its watchers
+
+import unittest
+from types import SimpleNamespace
+
+import stream_hub
+from stream_hub import Stream, Subscriber
+
+
+class Listing:
+    # newest first, like subreddit.new
+
+    def __init__(self):
+        self.items = []
+        self.calls = 0
+
+    def add(self, *names):
+        self.items[:0] = [SimpleNamespace(fullname=name) for name in reversed(names)]
+
+    def __call__(self, limit):
+        self.calls += 1
+        return self.items[:limit]
+
+
+class StreamHubValidate(unittest.TestCase):
+
+    def test_new_items_once(self):
+        listing = Listing()
+        listing.add("t3_1", "t3_2")
+        stream = Stream("submissions", listing)
+        self.assertEqual(stream.poll(), [])
+        listing.add("t3_3", "t3_4")
+        self.assertEqual([item.fullname for item in stream.poll()], ["t3_3", "t3_4"])
+        self.assertEqual(stream.poll(), [])
+        self.assertEqual(listing.calls, 3)
+
+    def test_adaptive_pause(self):
+        stream = Stream("comments", Listing())
+        for _ in range(10):
+            stream.adapt([])
+        self.assertEqual(stream.pause, stream_hub.MAX_PAUSE)
+        stream.adapt(["item"])
+        self.assertEqual(stream.pause, stream_hub.MIN_PAUSE)
+
+    def test_fan_out(self):
+        hub = stream_hub.StreamHub()
+        hub.listing("submissions", Listing())
+        subwatch = hub.subscribe("submissions", lambda item: None, "subwatch")
+        repostwatch = hub.subscribe("submissions", lambda item: None, "repostwatch")
+        self.assertEqual(hub.streams["submissions"].subscribers, [subwatch, repostwatch])
+        for subscriber in (subwatch, repostwatch):
+            subscriber.put("t3_1")
+        self.assertEqual((subwatch.depth(), repostwatch.depth()), (1, 1))
+
+    def test_handler_error(self):
+        handled = []
+
+        def handler(item):
+            if item == "bad":
+                raise ValueError(item)
+            handled.append(item)
+
+        subscriber = Subscriber("test", handler)
+        subscriber.daemon = True
+        for item in ["bad", "good"]:
+            subscriber.put(item)
+        subscriber.start()
+        subscriber.queue.join()
+        self.assertEqual(handled, ["good"])
+
+
+if __name__ == '__main__':
+    unittest.main()
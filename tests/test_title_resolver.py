@@ -0,0 +1,92 @@
+# Tests the Resolution that searches the store and the removed lists at the same time
+
+import threading
+import unittest
+from concurrent.futures import Future
+from types import SimpleNamespace
+from unittest import mock
+
+import game_store
+from SteamGame import SteamGame
+from SteamRemovedGame import SteamRemovedGame
+from SteamSearchGame import SteamSearchGame
+from title_resolver import Resolution
+
+
+class FakeSearch:
+    # store and removed list answers by title, the store search waits for the removed lookup to start
+
+    def __init__(self, store, removed):
+        self.store = store
+        self.removed = removed
+        self.removed_started = threading.Event()
+
+    def search(self, game_name, removed, source="Steam"):
+        if removed:
+            self.removed_started.set()
+            return SimpleNamespace(appid=self.removed.get(game_name, 0))
+        # only returns in time when both run at once
+        self.removed_started.wait(5)
+        return SimpleNamespace(appid=self.store.get(game_name, 0), parallel=self.removed_started.is_set())
+
+
+class ResolutionValidate(unittest.TestCase):
+
+    def setUp(self):
+        self.fake = FakeSearch({"Portal": "400"}, {"Portal": "9400", "Gone Game": "500"})
+        self.pages = []
+        self.threads = []
+        self.lock = threading.Lock()
+        patches = [
+            mock.patch.object(SteamSearchGame, "search", self.fake.search),
+            mock.patch.object(game_store, "get", self.get),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def get(self, cls, appid):
+        with self.lock:
+            self.pages.append((cls, appid))
+            self.threads.append(threading.current_thread().name)
+        return cls.__name__ + " " + appid
+
+    def test_store_wins(self):
+        resolution = Resolution("Portal")
+        self.assertTrue(resolution.store.parallel)
+        self.assertEqual(resolution.store.appid, "400")
+        self.assertEqual(resolution.page(SteamGame, "400"), "SteamGame 400")
+        # still there when the store page turns out to be gone
+        self.assertEqual(resolution.removed().appid, "9400")
+        # dropped before it started
+        resolution.removed_lookup = Future()
+        resolution.removed_lookup.cancel()
+        self.assertEqual(resolution.removed().appid, "9400")
+
+    def test_removed_when_store_misses(self):
+        resolution = Resolution("Gone Game")
+        self.assertTrue(resolution.store.parallel)
+        self.assertEqual(resolution.store.appid, 0)
+        self.assertEqual(resolution.removed().appid, "500")
+        self.assertEqual(resolution.page(SteamGame, "500"), "SteamGame 500")
+        self.assertEqual(resolution.page(SteamRemovedGame, "500"), "SteamRemovedGame 500")
+        # both were prefetched, each once
+        self.assertCountEqual(self.pages, [(SteamGame, "500"), (SteamRemovedGame, "500")])
+        # game builds wait for their own pages on the fetch pool, so they run on the resolver's pool
+        self.assertTrue(all(name.startswith("resolve") for name in self.threads))
+
+    def test_no_archived_page_for_other_stores(self):
+        resolution = Resolution("Gone Game", "non-Steam")
+        self.assertEqual(resolution.removed().appid, "500")
+        self.assertEqual(resolution.page(SteamGame, "500"), "SteamGame 500")
+        self.assertEqual(self.pages, [(SteamGame, "500")])
+
+    def test_not_found(self):
+        resolution = Resolution("Unknown Game")
+        self.assertEqual(resolution.store.appid, 0)
+        self.assertEqual(resolution.removed().appid, 0)
+        self.assertEqual(self.pages, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+# Tests the WorkPool that hands stream items to worker threads by lane
+
+import threading
+import unittest
+
+from work_pool import LANE_GAME, LANE_GIVEAWAY, WorkPool
+
+
+class WorkPoolValidate(unittest.TestCase):
+
+    def blockedpool(self, maxsize=10):
+        # one worker, busy with the first item until release is set
+        self.handled = []
+        self.release = threading.Event()
+        started = threading.Event()
+
+        def handler(item):
+            if item == "first":
+                started.set()
+                self.release.wait(5)
+            self.handled.append(item)
+
+        pool = WorkPool(handler, 1, maxsize, "test")
+        pool.put("first")
+        started.wait(5)
+        return pool
+
+    def test_giveaway_lane_first(self):
+        pool = self.blockedpool()
+        pool.put("game 1", LANE_GAME)
+        pool.put("game 2", LANE_GAME)
+        pool.put("giveaway", LANE_GIVEAWAY)
+        self.assertEqual((pool.depth(), pool.depth(LANE_GIVEAWAY)), (3, 1))
+        self.release.set()
+        pool.shutdown()
+        self.assertEqual(self.handled, ["first", "giveaway", "game 1", "game 2"])
+        self.assertEqual(pool.depth(), 0)
+
+    def test_backpressure(self):
+        pool = self.blockedpool(maxsize=1)
+        pool.put("queued")
+        putter = threading.Thread(target=pool.put, args=("waiting",))
+        putter.start()
+        putter.join(0.2)
+        self.assertTrue(putter.is_alive())
+        self.release.set()
+        putter.join(5)
+        self.assertFalse(putter.is_alive())
+        pool.shutdown()
+        self.assertEqual(self.handled, ["first", "queued", "waiting"])
+
+    def test_shutdown_finishes_queued(self):
+        pool = self.blockedpool()
+        pool.put("queued")
+        stopper = threading.Thread(target=pool.shutdown)
+        stopper.start()
+        stopper.join(0.2)
+        self.assertFalse(pool.put("late"))
+        self.release.set()
+        stopper.join(5)
+        self.assertEqual(self.handled, ["first", "queued"])
+
+    def test_failed_item(self):
+        handled = []
+
+        def handler(item):
+            if item == "bad":
+                raise ValueError(item)
+            handled.append(item)
+
+        pool = WorkPool(handler, 1, 10, "test")
+        pool.put("bad")
+        pool.put("good")
+        pool.shutdown()
+        self.assertEqual(handled, ["good"])
+
+
+if __name__ == '__main__':
+    unittest.main()
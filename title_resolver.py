@@ -0,0 +1,53 @@
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import game_store
+from fetch_planner import FetchPlanner
+from SteamGame import SteamGame
+from SteamRemovedGame import SteamRemovedGame
+from SteamSearchGame import SteamSearchGame
+
+RESOLVE_WORKERS = int(os.getenv("RSGIB_RESOLVE_WORKERS", "4"))
+
+# own pool, the lookups and game builds wait for page fetches that run on the fetch pool
+executor = ThreadPoolExecutor(max_workers=RESOLVE_WORKERS, thread_name_prefix="resolve")
+
+
+class Resolution:
+    # store search and removed lists for one title, looked up at the same time
+
+    def __init__(self, game_name, source="Steam"):
+        self.game_name = game_name
+        self.source = source
+        # a game build queues its own pages on the fetch pool and waits for them, so not on that pool
+        self.planner = FetchPlanner(executor)
+        # run with the caller's context so the lookup keeps the submission's priority lane
+        self.removed_lookup = executor.submit(contextvars.copy_context().run, self.lookupremoved)
+        self.store = SteamSearchGame.search(game_name, False, source)
+        if self.store.appid != 0:
+            # the store search wins like before, the removed lookup is dropped when it has not started
+            self.removed_lookup.cancel()
+
+    def lookupremoved(self):
+        game = SteamSearchGame.search(self.game_name, True, self.source)
+        if game.appid != 0:
+            # the store page of the removed game loads while the store search runs
+            self.planner.submit((SteamGame, game.appid), game_store.get, SteamGame, game.appid)
+        return game
+
+    def removed(self):
+        # answer of the removed lists, for when the store search found nothing or an empty store page
+        if self.removed_lookup.cancelled():
+            # the store search matched but the store page is gone, e.g. a delisted app
+            game = self.lookupremoved()
+        else:
+            game = self.removed_lookup.result()
+        if game.appid != 0 and self.source == "Steam":
+            # the archived page loads while the store page is checked, most removed games have none
+            self.planner.submit((SteamRemovedGame, game.appid), game_store.get, SteamRemovedGame, game.appid)
+        return game
+
+    def page(self, cls, appid):
+        # the prefetched game when there is one
+        return self.planner.result((cls, appid), game_store.get, cls, appid)
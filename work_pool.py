@@ -0,0 +1,66 @@
+import itertools
+import queue
+import threading
+import traceback
+from collections import Counter
+
+# lanes, lower goes first
+LANE_GIVEAWAY = 0
+LANE_GAME = 1
+
+# after the queued items, tells a worker to stop
+STOP_LANE = 2
+
+
+class WorkPool:
+
+    def __init__(self, handler, workers, maxsize, name="work"):
+        self.handler = handler
+        # full queue blocks put, the stream then waits for the workers
+        self.queue = queue.PriorityQueue(maxsize)
+        # same lane keeps stream order
+        self.order = itertools.count()
+        self.lock = threading.Lock()
+        self.queued = Counter()
+        self.closed = False
+        self.threads = [
+            threading.Thread(target=self.work, name=name + "-" + str(number)) for number in range(workers)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def put(self, item, lane=LANE_GAME):
+        with self.lock:
+            if self.closed:
+                return False
+            self.queued[lane] += 1
+        self.queue.put((lane, next(self.order), item))
+        return True
+
+    def depth(self, lane=None):
+        with self.lock:
+            if lane is None:
+                return sum(self.queued.values())
+            return self.queued[lane]
+
+    def work(self):
+        while True:
+            lane, _, item = self.queue.get()
+            if lane == STOP_LANE:
+                return
+            with self.lock:
+                self.queued[lane] -= 1
+            try:
+                self.handler(item)
+            except Exception:
+                # a failed item does not stop the worker
+                traceback.print_exc()
+
+    def shutdown(self):
+        # no new items, the queued and running ones are finished first
+        with self.lock:
+            self.closed = True
+        for _ in self.threads:
+            self.queue.put((STOP_LANE, next(self.order), None))
+        for thread in self.threads:
+            thread.join()